@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 from typing_extensions import Literal
 
 from pydantic import BaseModel, Field
@@ -17,25 +17,149 @@ class KnowledgeNodeResponse(BaseModel):
     tags: List[str] = Field(default_factory=list)
 
 
+class ConceptImportanceResponse(BaseModel):
+    pagerank: float = Field(..., description="Share of importance flowing in from dependents; sums to 1.")
+    in_centrality: float = Field(..., description="Direct prerequisites as a fraction of the other concepts.")
+    out_centrality: float = Field(..., description="Direct dependents as a fraction of the other concepts.")
+
+
 class KnowledgeNodeDetailResponse(KnowledgeNodeResponse):
     prerequisites: List[KnowledgeNodeResponse] = Field(
         default_factory=list,
         description="Other concepts that should be understood beforehand.",
     )
+    importance: Optional[ConceptImportanceResponse] = Field(
+        None, description="Last computed importance scores; absent until first computed."
+    )
+
+
+class SearchResultResponse(KnowledgeNodeResponse):
+    score: float = Field(..., description="BM25 relevance of the concept to the query.")
+
+
+class ConceptCompletionResponse(BaseModel):
+    name: str
+    in_degree: int = Field(..., description="Number of direct prerequisites recorded for the concept.")
+
+
+class TagCountResponse(BaseModel):
+    tag: str
+    count: int = Field(..., description="Number of concepts carrying the tag.")
 
 
 class RelationshipCreate(BaseModel):
     source: str = Field(..., description="Name of the prerequisite concept.")
     target: str = Field(..., description="Name of the concept that depends on the source.")
+    effort: Optional[float] = Field(
+        None, gt=0, description="Relative effort or difficulty of this step (defaults to 1)."
+    )
+
+
+class KnowledgeNodeBulkCreate(BaseModel):
+    nodes: List[KnowledgeNodeCreate] = Field(..., description="Concepts to create or update.")
+    atomic: bool = Field(True, description="Reject the whole batch if any item is invalid.")
+
+
+class RelationshipBulkCreate(BaseModel):
+    relationships: List[RelationshipCreate] = Field(..., description="Dependencies to add.")
+    atomic: bool = Field(True, description="Reject the whole batch if any item is invalid.")
+
+
+class BulkItemError(BaseModel):
+    index: int = Field(..., description="Position of the rejected item in the request.")
+    detail: str
+
+
+class BulkResultResponse(BaseModel):
+    created: int = 0
+    updated: int = 0
+    errors: List[BulkItemError] = Field(default_factory=list)
+
+
+class ImportLineError(BaseModel):
+    line: int = Field(..., description="1-based line number of the rejected record.")
+    detail: str
+
+
+class ImportProgressResponse(BaseModel):
+    lines: int = 0
+    nodes_created: int = 0
+    nodes_updated: int = 0
+    edges_created: int = 0
+    edges_updated: int = 0
+    edges_deferred: int = Field(0, description="Edges held back until their concepts arrived.")
+    records_restored: int = Field(0, description="Sessions, curricula and shares restored from an export.")
+    error_count: int = 0
+    errors: List[ImportLineError] = Field(default_factory=list, description="The first rejected records.")
+    done: bool = False
 
 
 class RelationshipResponse(BaseModel):
     source: str
     target: str
+    effort: float = 1.0
+
+
+class NeighborhoodNodeResponse(KnowledgeNodeResponse):
+    distance: int = Field(..., description="Hops from the center concept.")
+
+
+class NeighborhoodResponse(BaseModel):
+    center: str
+    depth: int
+    direction: str
+    nodes: List[NeighborhoodNodeResponse]
+    edges: List[RelationshipResponse]
+    node_limit_reached: bool = Field(False, description="The search stopped at max_nodes.")
+    depth_limit_reached: bool = Field(False, description="Concepts on the outer layer have further neighbours.")
 
 
 class LearningPathResponse(BaseModel):
     path: List[KnowledgeNodeResponse]
+    mode: Literal["hops", "weighted"] = "hops"
+    total_cost: float = Field(0.0, description="Sum of relationship efforts along the path.")
+    explored: Optional[int] = Field(
+        None, description="Number of concepts visited while searching (diagnostics)."
+    )
+
+
+class LearningPathsRequest(BaseModel):
+    start: str = Field(..., description="Concept the learner starts from.")
+    goals: List[str] = Field(
+        ..., min_length=1, max_length=500, description="Concepts to compute paths to."
+    )
+    mode: Literal["hops", "weighted"] = Field(
+        default="hops", description="Minimise hop count or total relationship effort."
+    )
+
+
+class LearningPathEntry(BaseModel):
+    goal: str
+    reachable: bool
+    path: List[KnowledgeNodeResponse] = Field(default_factory=list)
+    total_cost: Optional[float] = None
+
+
+class LearningPathsResponse(BaseModel):
+    start: str
+    mode: Literal["hops", "weighted"]
+    paths: List[LearningPathEntry]
+
+
+class StudyPlanResponse(BaseModel):
+    targets: List[str]
+    plan: List[KnowledgeNodeResponse] = Field(
+        default_factory=list,
+        description="Targets and their prerequisites, each listed after everything it depends on.",
+    )
+
+
+class ReachabilityResponse(BaseModel):
+    source: str
+    target: str
+    reachable: bool = Field(
+        ..., description="True when the source is a direct or transitive prerequisite of the target."
+    )
 
 
 class LearningSessionCreate(BaseModel):
@@ -186,3 +310,64 @@ class HandleComparisonResponse(BaseModel):
     handle_b: str
     shared_tags: List[str]
     divergent_tags: List[str]
+
+
+class WorkspaceCreate(BaseModel):
+    name: str = Field(..., description="1-64 letters, digits, '-' or '_', starting with a letter or digit.")
+    allow_cycles: bool = Field(False, description="Accept relationships that close a prerequisite loop.")
+
+
+class WorkspaceResponse(BaseModel):
+    name: str
+    allow_cycles: bool
+
+
+class WorkspaceStatsResponse(BaseModel):
+    hits: int
+    misses: int
+    evictions: int
+    saves: int = Field(..., description="Evictions that had to write a changed workspace out.")
+    resident: int
+    resident_bytes: int = Field(..., description="Estimated memory held by resident workspaces.")
+    memory_budget: int
+
+
+class GraphStatsResponse(BaseModel):
+    nodes: int
+    edges: int
+    roots: int = Field(..., description="Concepts without prerequisites.")
+    leaves: int = Field(..., description="Concepts nothing depends on.")
+    isolated: int = Field(..., description="Concepts with no relationships at all.")
+    in_degrees: Dict[int, int] = Field(..., description="Number of concepts per prerequisite count.")
+    out_degrees: Dict[int, int] = Field(..., description="Number of concepts per dependent count.")
+    tags: Dict[str, int] = Field(..., description="Number of concepts carrying each tag.")
+
+
+class NodePlacementResponse(BaseModel):
+    name: str
+    level: int = Field(..., description="Ring index: the longest prerequisite chain leading to the concept.")
+    radius: float
+    angle: float = Field(..., description="Angle in radians, counter-clockwise from the positive x axis.")
+    x: float
+    y: float
+
+
+class GraphLayoutResponse(BaseModel):
+    version: int = Field(..., description="Graph version the layout was computed for.")
+    rings: int
+    base_radius: float
+    ring_step: float
+    nodes: List[NodePlacementResponse]
+
+
+class CyclicComponentResponse(BaseModel):
+    size: int
+    edges: int = Field(..., description="Relationships inside the component; removing the right ones breaks it.")
+    nodes: List[KnowledgeNodeResponse] = Field(..., description="Members in name order, up to max_members.")
+    cycle: List[str] = Field(..., description="One shortest loop through the first member, ending where it starts.")
+
+
+class CycleReportResponse(BaseModel):
+    total_components: int
+    total_concepts: int
+    components: List[CyclicComponentResponse]
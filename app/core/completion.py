@@ -0,0 +1,75 @@
+from bisect import bisect_left, insort
+from heapq import nsmallest
+from typing import Callable, Dict, Iterable, List, Optional
+
+# Prefix ranges at most this wide are ranked by scanning them directly.
+SCAN_LIMIT = 256
+# Wider ranges keep this many ranked completions cached per prefix.
+CACHE_DEPTH = 50
+
+
+class PrefixIndex:
+    """Ranked prefix completion over a sorted array of node keys.
+
+    The sorted array is materialised on the first query (so bulk loads do not
+    pay for it) and then maintained with ``insort``; a prefix maps to a
+    contiguous slice found with two bisections. Narrow slices are ranked on
+    the fly. Wide ones (short prefixes) cache their best ``CACHE_DEPTH`` keys;
+    when a key is added, removed or re-ranked only the cache entries for its
+    own prefixes are dropped.
+    """
+
+    def __init__(self, keys: Callable[[], Iterable[str]], rank: Callable[[str], int]) -> None:
+        self._source = keys
+        self._rank = rank
+        self._keys: Optional[List[str]] = None
+        self._top: Dict[str, List[str]] = {}
+
+    def add(self, key: str) -> None:
+        if self._keys is not None:
+            insort(self._keys, key)
+        self.touch(key)
+
+    def add_many(self, keys: Iterable[str]) -> None:
+        if self._keys is not None:
+            self._keys.extend(keys)
+            self._keys.sort()
+        self.invalidate()
+
+    def remove(self, key: str) -> None:
+        if self._keys is not None:
+            index = bisect_left(self._keys, key)
+            if index < len(self._keys) and self._keys[index] == key:
+                del self._keys[index]
+        self.touch(key)
+
+    def touch(self, key: str) -> None:
+        """Forget cached rankings that ``key`` may appear in."""
+
+        if self._top:
+            for length in range(len(key) + 1):
+                self._top.pop(key[:length], None)
+
+    def invalidate(self) -> None:
+        """Forget every cached ranking, e.g. after a batch changed many ranks."""
+
+        self._top.clear()
+
+    def complete(self, prefix: str, limit: int = 10) -> List[str]:
+        """Return up to ``limit`` keys starting with ``prefix``, best ranked first."""
+
+        if self._keys is None:
+            self._keys = sorted(self._source())
+        keys = self._keys
+        low = bisect_left(keys, prefix)
+        high = bisect_left(keys, prefix + "\U0010ffff", low)
+        if high - low <= SCAN_LIMIT or limit > CACHE_DEPTH:
+            return self._best(keys[low:high], limit)
+        cached = self._top.get(prefix)
+        if cached is None:
+            cached = self._top[prefix] = self._best(keys[low:high], CACHE_DEPTH)
+        return cached[:limit]
+
+    def _best(self, keys: List[str], limit: int) -> List[str]:
+        rank = self._rank
+        return nsmallest(limit, keys, key=lambda key: (-rank(key), key))
@@ -0,0 +1,115 @@
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+
+def strongly_connected_components(
+    keys: Iterable[str],
+    successors: Callable[[str], Iterable[str]],
+) -> List[List[str]]:
+    """Tarjan's algorithm with an explicit stack, so deep chains cannot overflow recursion.
+
+    Components are returned in reverse topological order: no component has an
+    edge into one listed after it.
+    """
+
+    index: Dict[str, int] = {}
+    low: Dict[str, int] = {}
+    on_stack: Set[str] = set()
+    stack: List[str] = []
+    components: List[List[str]] = []
+    for root in keys:
+        if root in index:
+            continue
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(successors(root)))]
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if child not in index:
+                    index[child] = low[child] = len(index)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(successors(child))))
+                    break
+                if child in on_stack and index[child] < low[node]:
+                    low[node] = index[child]
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if low[node] < low[parent]:
+                        low[parent] = low[node]
+                if low[node] == index[node]:
+                    component: List[str] = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+    return components
+
+
+class Condensation:
+    """The DAG left after collapsing each strongly connected component to one vertex.
+
+    Components are numbered in topological order. ``cyclic[c]`` says whether
+    component ``c`` contains a cycle: more than one member, or a self-loop.
+    """
+
+    def __init__(self, keys: Iterable[str], successors: Callable[[str], Iterable[str]]) -> None:
+        self.members = strongly_connected_components(keys, successors)
+        self.members.reverse()
+        self.component: Dict[str, int] = {}
+        for component, members in enumerate(self.members):
+            for key in members:
+                self.component[key] = component
+        self.cyclic = [len(members) > 1 for members in self.members]
+        self._successors: List[List[int]] = []
+        for component, members in enumerate(self.members):
+            targets: Dict[int, None] = {}
+            for key in members:
+                for child in successors(key):
+                    target = self.component[child]
+                    if target == component:
+                        self.cyclic[component] = True
+                    else:
+                        targets[target] = None
+            self._successors.append(list(targets))
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    def successors(self, component: int) -> List[int]:
+        return self._successors[component]
+
+    def cyclic_components(self) -> List[int]:
+        """Components that contain a cycle, largest first."""
+
+        found = [component for component, cyclic in enumerate(self.cyclic) if cyclic]
+        found.sort(key=lambda component: -len(self.members[component]))
+        return found
+
+
+def shortest_cycle(start: str, members: Set[str], successors: Callable[[str], Iterable[str]]) -> Optional[List[str]]:
+    """Fewest-hop cycle through ``start`` that stays within ``members``, as ``[start, ..., start]``."""
+
+    parents: Dict[str, str] = {}
+    queue = deque([start])
+    while queue:
+        current = queue.popleft()
+        for child in successors(current):
+            if child == start:
+                path = [current]
+                while path[-1] != start:
+                    path.append(parents[path[-1]])
+                path.reverse()
+                path.append(start)
+                return path
+            if child in members and child not in parents:
+                parents[child] = current
+                queue.append(child)
+    return None
@@ -0,0 +1,149 @@
+import csv
+import io
+import json
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence
+
+from app.core.graph import Curriculum, IdeaShare, KnowledgeGraph, KnowledgeNode, LearningSession, timestamp_to_datetime
+
+EXPORT_SECTIONS = ("nodes", "edges", "sessions", "curricula", "shares")
+# Rows are encoded into chunks of roughly this many characters per write.
+CHUNK_CHARS = 64 * 1024
+# Columns per section; a CSV export uses the union in this order.
+EXPORT_COLUMNS: Dict[str, Sequence[str]] = {
+    "nodes": ("name", "description", "tags"),
+    "edges": ("source", "target", "effort"),
+    "sessions": (
+        "id", "name", "description", "focus_tags", "linked_concepts", "status", "current_focus", "created_at",
+    ),
+    "curricula": ("id", "title", "description", "tags", "source_url", "linked_concepts", "uploaded_at"),
+    "shares": (
+        "id", "author", "title", "summary", "tags", "linked_concepts", "visibility", "authorized_handles",
+        "created_at",
+    ),
+}
+
+Row = Dict[str, object]
+
+
+def _node_row(node: KnowledgeNode) -> Row:
+    return {"type": "node", "name": node.name, "description": node.description, "tags": list(node.tags)}
+
+
+def _edge_row(edge) -> Row:
+    source, target, effort = edge
+    return {"type": "edge", "source": source, "target": target, "effort": float(effort)}
+
+
+def _session_row(session: LearningSession) -> Row:
+    return {
+        "type": "session",
+        "id": session.id,
+        "name": session.name,
+        "description": session.description,
+        "focus_tags": list(session.focus_tags),
+        "linked_concepts": list(session.linked_concepts),
+        "status": session.status,
+        "current_focus": session.current_focus,
+        "created_at": timestamp_to_datetime(session.created_at).isoformat(),
+    }
+
+
+def _curriculum_row(curriculum: Curriculum) -> Row:
+    return {
+        "type": "curriculum",
+        "id": curriculum.id,
+        "title": curriculum.title,
+        "description": curriculum.description,
+        "tags": list(curriculum.tags),
+        "source_url": curriculum.source_url,
+        "linked_concepts": list(curriculum.linked_concepts),
+        "uploaded_at": timestamp_to_datetime(curriculum.uploaded_at).isoformat(),
+    }
+
+
+def _share_row(share: IdeaShare) -> Row:
+    return {
+        "type": "share",
+        "id": share.id,
+        "author": share.author,
+        "title": share.title,
+        "summary": share.summary,
+        "tags": list(share.tags),
+        "linked_concepts": list(share.linked_concepts),
+        "visibility": share.visibility,
+        "authorized_handles": list(share.authorized_handles),
+        "created_at": timestamp_to_datetime(share.created_at).isoformat(),
+    }
+
+
+ROW_BUILDERS: Dict[str, Callable[[object], Row]] = {
+    "nodes": _node_row,
+    "edges": _edge_row,
+    "sessions": _session_row,
+    "curricula": _curriculum_row,
+    "shares": _share_row,
+}
+
+
+class ExportCursor:
+    """Iterate export rows as of the moment iteration started.
+
+    Iteration pins the graph's latest published snapshot and streams rows
+    from it one at a time. The snapshot is immutable and shares its storage
+    with later versions, so the output stays consistent while writes carry
+    on, no lock is held between rows, and memory stays constant however
+    long the download takes.
+    """
+
+    def __init__(self, graph: KnowledgeGraph, sections: Iterable[str] = EXPORT_SECTIONS) -> None:
+        self.sections = [section for section in EXPORT_SECTIONS if section in set(sections)]
+        self._graph = graph
+
+    def __iter__(self) -> Iterator[Row]:
+        view = self._graph.snapshot()
+        for section in self.sections:
+            yield from map(ROW_BUILDERS[section], view.export_records(section))
+
+
+def ndjson_chunks(rows: Iterable[Row]) -> Iterator[str]:
+    """Encode rows as newline-delimited JSON, one record per line."""
+
+    buffer: List[str] = []
+    size = 0
+    for row in rows:
+        line = json.dumps(row) + "\n"
+        buffer.append(line)
+        size += len(line)
+        if size >= CHUNK_CHARS:
+            yield "".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def csv_chunks(rows: Iterable[Row], sections: Sequence[str]) -> Iterator[str]:
+    """Encode rows as one CSV table whose columns cover every exported section.
+
+    The first column holds the record type; list values are joined with ``;``.
+    """
+
+    columns = ["type"]
+    for section in sections:
+        columns.extend(column for column in EXPORT_COLUMNS[section] if column not in columns)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow([_csv_value(row.get(column)) for column in columns])
+        if buffer.tell() >= CHUNK_CHARS:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _csv_value(value: object) -> object:
+    if isinstance(value, list):
+        return ";".join(value)
+    return "" if value is None else value
@@ -0,0 +1,68 @@
+import math
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+
+# Candidates below this Dice similarity are never suggested.
+MIN_SIMILARITY = 0.4
+
+
+def trigrams(text: str) -> FrozenSet[str]:
+    padded = f"  {text.lower()} "
+    return frozenset(padded[index:index + 3] for index in range(len(padded) - 2))
+
+
+class TrigramIndex:
+    """Character-trigram index over node keys for "did you mean" lookups.
+
+    Similarity is the Dice coefficient of the two trigram sets. A candidate
+    reaching ``MIN_SIMILARITY`` must share a minimum number of trigrams with
+    the query, so only the postings of the query's rarest trigrams are needed
+    to find it (prefix filtering); candidates are then verified exactly.
+    """
+
+    def __init__(self) -> None:
+        self._postings: Dict[str, Set[str]] = {}
+        self._grams: Dict[str, FrozenSet[str]] = {}
+
+    def add(self, key: str) -> None:
+        if key in self._grams:
+            return
+        grams = trigrams(key)
+        self._grams[key] = grams
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(key)
+
+    def add_many(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self.add(key)
+
+    def remove(self, key: str) -> None:
+        grams = self._grams.pop(key, None)
+        if grams is None:
+            return
+        for gram in grams:
+            keys = self._postings[gram]
+            keys.discard(key)
+            if not keys:
+                del self._postings[gram]
+
+    def suggest(self, text: str, limit: int = 5) -> List[Tuple[str, float]]:
+        """Return up to ``limit`` ``(key, similarity)`` pairs, most similar first."""
+
+        query = trigrams(text)
+        if not query:
+            return []
+        # Dice >= s needs an overlap of at least s * |query| / 2 trigrams, so any
+        # match appears in one of the |query| - overlap + 1 rarest postings.
+        needed = max(1, math.ceil(MIN_SIMILARITY * len(query) / 2))
+        ordered = sorted(query, key=lambda gram: len(self._postings.get(gram, ())))
+        candidates: Set[str] = set()
+        for gram in ordered[: len(query) - needed + 1]:
+            candidates.update(self._postings.get(gram, ()))
+        scored = []
+        for key in candidates:
+            grams = self._grams[key]
+            similarity = 2 * len(query & grams) / (len(query) + len(grams))
+            if similarity >= MIN_SIMILARITY:
+                scored.append((key, similarity))
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[:limit]
@@ -1,48 +1,162 @@
-from collections import deque
-from dataclasses import dataclass, field
-from datetime import datetime, timezone
+from bisect import bisect_left, insort
+from collections import OrderedDict, deque
+from contextlib import nullcontext
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+from heapq import heappop, heappush
 import random
-from typing import Dict, Iterable, List, Optional, Set, Tuple
+import sys
+import threading
+import time
+from typing import Any, Callable, ContextManager, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
 from uuid import uuid4
 
+from app.core.completion import PrefixIndex
+from app.core.components import Condensation, shortest_cycle
+from app.core.fuzzy import TrigramIndex
+from app.core.importance import COPY_CHUNK, ConceptImportance, PageRank
+from app.core.layout import GraphLayout, RadialLayout
+from app.core.locking import LockStats, ReadWriteLock
+from app.core.ordering import IncrementalTopologicalOrder
+from app.core.reachability import ReachabilityIndex, reaches_by_search
+from app.core.search import TextIndex
+from app.core.stats import DegreeCounter, GraphStats
+from app.core.storage import DEFAULT_WEIGHT, Adjacency, create_adjacency
 
-@dataclass
+STUDY_PLAN_CACHE_SIZE = 256
+# Queries answered by search against a stale reachability index before it is rebuilt.
+REACHABILITY_REBUILD_AFTER = 16
+# resolve=fuzzy only picks a suggestion this similar and this far ahead of the runner-up.
+FUZZY_RESOLVE_SIMILARITY = 0.6
+FUZZY_RESOLVE_MARGIN = 0.15
+# Snapshot entries are spread over this many shards, so publishing a version
+# copies only the shards holding the nodes written since the last one.
+SNAPSHOT_SHARDS = 1024
+# Each snapshot memoises at most this many prerequisite closures.
+SNAPSHOT_CLOSURES = 4096
+# Approximate resident bytes per graph part, measured with tracemalloc on
+# CPython 3.11; a node's share includes its text, spelling and prefix indexes.
+GRAPH_BASE_BYTES = 5_000
+NODE_BYTES = 7_500
+EDGE_BYTES = 200
+RECORD_BYTES = 1_000
+SNAPSHOT_BASE_BYTES = 80_000
+SNAPSHOT_NODE_BYTES = 1_000
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def intern_tags(tags: Iterable[str]) -> Tuple[str, ...]:
+    """Return the tags as a tuple of interned strings.
+
+    Only the strings are interned: the interpreter frees an interned string
+    once nothing refers to it, so the shared vocabulary cannot outgrow the
+    records that use it.
+    """
+
+    return tuple(map(sys.intern, tags))
+
+
+def now_timestamp() -> int:
+    """Current UTC time as integer microseconds since the epoch."""
+
+    return time.time_ns() // 1_000
+
+
+def timestamp_to_datetime(timestamp: int) -> datetime:
+    """Convert an integer microsecond timestamp back to an aware datetime."""
+
+    return _EPOCH + timedelta(microseconds=timestamp)
+
+
+def datetime_to_timestamp(value: datetime) -> int:
+    """Convert a datetime (naive values are taken as UTC) to integer microseconds."""
+
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - _EPOCH) // timedelta(microseconds=1)
+
+
+def _reads(method: Callable[..., Any]) -> Callable[..., Any]:
+    """Run ``method`` under the instance's read lock, if it has one."""
+
+    @wraps(method)
+    def locked(self, *args: Any, **kwargs: Any) -> Any:
+        lock = self._lock
+        if lock is None:
+            return method(self, *args, **kwargs)
+        lock.acquire_read()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            lock.release_read()
+
+    return locked
+
+
+def _writes(method: Callable[..., Any]) -> Callable[..., Any]:
+    """Run ``method`` under the instance's write lock, if it has one."""
+
+    @wraps(method)
+    def locked(self, *args: Any, **kwargs: Any) -> Any:
+        lock = self._lock
+        if lock is None:
+            return method(self, *args, **kwargs)
+        lock.acquire_write()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            lock.release_write()
+
+    return locked
+
+
+@dataclass(slots=True)
 class KnowledgeNode:
     """Represents a concept within the knowledge graph."""
 
     name: str
     description: str = ""
-    tags: List[str] = field(default_factory=list)
+    tags: Tuple[str, ...] = ()
+
+    def __post_init__(self) -> None:
+        self.tags = intern_tags(self.tags)
 
 
-@dataclass
+@dataclass(slots=True)
 class LearningSession:
     """Tracks a focussed learning journey over a subset of the graph."""
 
     id: str
     name: str
     description: str
-    focus_tags: List[str]
+    focus_tags: Tuple[str, ...]
     linked_concepts: List[str]
     status: str = "active"
     current_focus: Optional[str] = None
-    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: int = field(default_factory=now_timestamp)
+
+    def __post_init__(self) -> None:
+        self.focus_tags = intern_tags(self.focus_tags)
 
 
-@dataclass
+@dataclass(slots=True)
 class Curriculum:
     """Represents an uploaded curriculum or study outline."""
 
     id: str
     title: str
     description: str
-    tags: List[str]
+    tags: Tuple[str, ...]
     source_url: Optional[str]
     linked_concepts: List[str]
-    uploaded_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    uploaded_at: int = field(default_factory=now_timestamp)
 
+    def __post_init__(self) -> None:
+        self.tags = intern_tags(self.tags)
 
-@dataclass
+
+@dataclass(slots=True)
 class QuizQuestion:
     """Generated quiz item tied to a concept."""
 
@@ -51,10 +165,10 @@ class QuizQuestion:
     prompt: str
     choices: List[str]
     correct_index: int
-    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: int = field(default_factory=now_timestamp)
 
 
-@dataclass
+@dataclass(slots=True)
 class IdeaShare:
     """Captures a shareable snapshot of someone's knowledge focus."""
 
@@ -62,188 +176,1675 @@ class IdeaShare:
     author: str
     title: str
     summary: str
-    tags: List[str]
+    tags: Tuple[str, ...]
     linked_concepts: List[str]
     visibility: str = "public"
     authorized_handles: List[str] = field(default_factory=list)
-    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: int = field(default_factory=now_timestamp)
+
+    def __post_init__(self) -> None:
+        self.tags = intern_tags(self.tags)
 
 
-@dataclass
+@dataclass(slots=True)
 class IdeaMatch:
     """Represents an affinity score between the viewer and a shared idea."""
 
     share: IdeaShare
     affinity: float
-    shared_tags: List[str]
-    complementary_tags: List[str]
+    shared_tags: Tuple[str, ...]
+    complementary_tags: Tuple[str, ...]
+
+
+class CycleError(ValueError):
+    """Raised when a relationship would make a concept its own prerequisite."""
+
+    def __init__(self, message: str, cycle: List[str]) -> None:
+        super().__init__(message)
+        self.cycle = cycle
+
+
+class UnknownConceptError(ValueError):
+    """Raised when a concept name matches no node; carries "did you mean" candidates."""
+
+    def __init__(self, message: str, suggestions: Dict[str, List[str]]) -> None:
+        super().__init__(message)
+        self.suggestions = suggestions
+
+
+@dataclass(slots=True)
+class BulkResult:
+    """Outcome of a bulk ingestion call; errors are ``(item index, message)`` pairs."""
+
+    created: int = 0
+    updated: int = 0
+    errors: List[Tuple[int, str]] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class PathResult:
+    """A learning path together with search diagnostics."""
+
+    path: List[KnowledgeNode]
+    explored: int
+    cost: float = 0.0
+
+
+@dataclass(slots=True)
+class Neighborhood:
+    """Induced subgraph around a concept, in breadth-first order.
+
+    ``distances[i]`` is the hop count of ``nodes[i]`` from the center and
+    ``edges`` are ``(source name, target name, effort)`` triples between the
+    returned nodes. ``node_limit_reached`` means the search stopped at
+    ``max_nodes``; ``depth_limit_reached`` that nodes on the outer layer have
+    further neighbours in the searched direction.
+    """
+
+    nodes: List[KnowledgeNode]
+    distances: List[int]
+    edges: List[Tuple[str, str, float]]
+    node_limit_reached: bool = False
+    depth_limit_reached: bool = False
 
 
-class KnowledgeGraph:
-    """In-memory representation of a directed knowledge graph."""
+@dataclass(slots=True)
+class CyclicComponent:
+    """Concepts that all transitively require one another.
 
-    def __init__(self) -> None:
+    ``nodes`` lists up to the requested number of members in name order and
+    ``cycle`` is one shortest loop through the first of them, as names ending
+    where it starts. ``edges`` counts the relationships inside the component,
+    any of which may be the one to remove.
+    """
+
+    size: int
+    edges: int
+    nodes: List[KnowledgeNode]
+    cycle: List[str]
+
+
+@dataclass(slots=True)
+class CycleReport:
+    """Cyclic components of a graph, largest first, with totals over all of them."""
+
+    total_components: int = 0
+    total_concepts: int = 0
+    components: List[CyclicComponent] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class CacheStats:
+    """Hit/miss counters reported by the graph's memoised lookups."""
+
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+    size: int = 0
+
+
+class _RecordQueries:
+    """Read-only queries over sessions, curricula and shares.
+
+    Shared by the live graph and its snapshots; both keep ``_sessions``,
+    ``_curricula`` and ``_shares`` mappings keyed by record id.
+    """
+
+    _sessions: Mapping[str, LearningSession]
+    _curricula: Mapping[str, Curriculum]
+    _shares: Mapping[str, IdeaShare]
+    # Snapshots never change, so only a thread-safe live graph sets a lock.
+    _lock: Optional[ReadWriteLock] = None
+
+    @_reads
+    def list_sessions(self) -> List[LearningSession]:
+        return sorted(self._sessions.values(), key=lambda item: item.created_at, reverse=True)
+
+    @_reads
+    def list_curricula(self) -> List[Curriculum]:
+        return sorted(self._curricula.values(), key=lambda item: item.uploaded_at, reverse=True)
+
+    @_reads
+    def list_shares(self, viewer: Optional[str] = None) -> List[IdeaShare]:
+        """Return shares the viewer is allowed to see ordered by recency."""
+
+        normalized_viewer = (viewer or "").strip().lower()
+        visible: List[IdeaShare] = []
+        for share in self._shares.values():
+            if share.visibility == "public":
+                visible.append(share)
+                continue
+            if normalized_viewer and share.author.lower() == normalized_viewer:
+                visible.append(share)
+                continue
+            if (
+                normalized_viewer
+                and share.visibility == "connections"
+                and normalized_viewer in share.authorized_handles
+            ):
+                visible.append(share)
+        visible.sort(key=lambda item: item.created_at, reverse=True)
+        return visible
+
+    @_reads
+    def affinity_for_viewer(self, viewer: str, limit: int = 5) -> List[IdeaMatch]:
+        """Surface the most relevant shares for a viewer based on overlapping tags."""
+
+        normalized_viewer = viewer.strip().lower()
+        if not normalized_viewer:
+            raise ValueError("Viewer handle required for affinity lookup")
+
+        seen_tags: Set[str] = set()
+        for share in self._shares.values():
+            if share.author.lower() == normalized_viewer:
+                seen_tags.update(share.tags)
+
+        if not seen_tags:
+            for share in self._shares.values():
+                if share.visibility == "public":
+                    seen_tags.update(share.tags)
+
+        candidates: List[IdeaMatch] = []
+        for share in self.list_shares(viewer=viewer):
+            if share.author.lower() == normalized_viewer:
+                continue
+            shared_tags = sorted(set(share.tags).intersection(seen_tags))
+            complementary = sorted(set(share.tags) - seen_tags)
+            if not shared_tags and not complementary:
+                continue
+            overlap = len(shared_tags)
+            breadth = len(shared_tags) + len(complementary)
+            affinity = overlap / breadth if breadth else 0.0
+            candidates.append(
+                IdeaMatch(
+                    share=share,
+                    affinity=round(affinity, 3),
+                    shared_tags=tuple(shared_tags),
+                    complementary_tags=tuple(complementary),
+                )
+            )
+
+        candidates.sort(key=lambda match: (match.affinity, match.share.created_at), reverse=True)
+        return candidates[:limit]
+
+    @_reads
+    def compare_handles(self, primary: str, collaborator: str) -> Tuple[List[str], List[str]]:
+        """Highlight shared and complementary interests between two handles."""
+
+        primary_tags: Set[str] = set()
+        collaborator_tags: Set[str] = set()
+
+        for share in self._shares.values():
+            author_handle = share.author.lower()
+            if author_handle == primary.strip().lower():
+                primary_tags.update(share.tags)
+            if author_handle == collaborator.strip().lower():
+                collaborator_tags.update(share.tags)
+
+        return sorted(primary_tags & collaborator_tags), sorted(primary_tags ^ collaborator_tags)
+
+
+@dataclass(frozen=True, slots=True)
+class SnapshotEntry:
+    """A node as one snapshot sees it: its record and frozen adjacency rows."""
+
+    node: KnowledgeNode
+    successors: Tuple[str, ...]
+    efforts: Tuple[float, ...]
+    predecessors: Tuple[str, ...]
+
+
+class GraphSnapshot(_RecordQueries):
+    """Immutable view of one published version of a ``KnowledgeGraph``.
+
+    Readers pin a version just by holding on to it; nothing reachable from it
+    is ever modified, so it can be read without locks while writers carry on.
+    Each version shares every untouched shard and record with its
+    predecessor, and a version is reclaimed as soon as the last reader lets go
+    of it.
+    """
+
+    def __init__(
+        self,
+        version: int,
+        shards: Tuple[Dict[str, SnapshotEntry], ...],
+        sessions: Mapping[str, LearningSession],
+        curricula: Mapping[str, Curriculum],
+        shares: Mapping[str, IdeaShare],
+        closures: Optional[Dict[str, Tuple[str, ...]]] = None,
+    ) -> None:
+        self.version = version
+        self._shards = shards
+        self._sessions = sessions
+        self._curricula = curricula
+        self._shares = shares
+        # Prerequisite closures valid for this version. Versions whose edges
+        # are the same share one dict, so a closure computed by any of them
+        # serves all of them.
+        self._closures: Dict[str, Tuple[str, ...]] = {} if closures is None else closures
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+    def _entry(self, key: str) -> Optional[SnapshotEntry]:
+        return self._shards[hash(key) % SNAPSHOT_SHARDS].get(key)
+
+    def get_node(self, name: str) -> Optional[KnowledgeNode]:
+        entry = self._entry(name.lower())
+        return None if entry is None else entry.node
+
+    def list_nodes(self) -> List[KnowledgeNode]:
+        nodes = [entry.node for shard in self._shards for entry in shard.values()]
+        nodes.sort(key=lambda node: node.name.lower())
+        return nodes
+
+    def relationships(self) -> List[Tuple[KnowledgeNode, KnowledgeNode, float]]:
+        """Return every edge as ``(source, target, effort)``, ordered by name."""
+
+        triples: List[Tuple[KnowledgeNode, KnowledgeNode, float]] = []
+        for shard in self._shards:
+            for entry in shard.values():
+                for target_key, effort in zip(entry.successors, entry.efforts):
+                    triples.append((entry.node, self._entry(target_key).node, effort))
+        triples.sort(key=lambda triple: (triple[0].name.lower(), triple[1].name.lower()))
+        return triples
+
+    def export_records(self, section: str) -> Iterator[object]:
+        """Lazily iterate the records of one export section.
+
+        Nodes and sessions, curricula and shares come back as stored; edges as
+        ``(source name, target name, effort)`` tuples. Nodes and edges follow
+        shard order, the record sections the order they were created in.
+        """
+
+        if section == "nodes":
+            return (entry.node for shard in self._shards for entry in shard.values())
+        if section == "edges":
+            return self._export_edges()
+        if section == "sessions":
+            return iter(self._sessions.values())
+        if section == "curricula":
+            return iter(self._curricula.values())
+        if section == "shares":
+            return iter(self._shares.values())
+        raise ValueError(f"Unknown export section: {section}")
+
+    def _export_edges(self) -> Iterator[Tuple[str, str, float]]:
+        for shard in self._shards:
+            for entry in shard.values():
+                for target_key, effort in zip(entry.successors, entry.efforts):
+                    yield entry.node.name, self._entry(target_key).node.name, effort
+
+    def prerequisites(self, name: str) -> List[KnowledgeNode]:
+        key = name.lower()
+        if self._entry(key) is None:
+            raise ValueError(f"Unknown node: {name}")
+        closure = self._closures.get(key)
+        if closure is None:
+            if len(self._closures) >= SNAPSHOT_CLOSURES:
+                self._closures.clear()
+            closure = self._closures[key] = self._closure(key)
+        return [self._entry(item).node for item in closure]
+
+    def _closure(self, key: str) -> Tuple[str, ...]:
+        # Same breadth-first, name-ordered walk as KnowledgeGraph._prerequisite_closure.
+        visited: Set[str] = set()
+        order: List[str] = []
+        frontier = deque(sorted(self._entry(key).predecessors))
+        while frontier:
+            current = frontier.popleft()
+            if current in visited:
+                continue
+            visited.add(current)
+            order.append(current)
+            for parent in sorted(self._entry(current).predecessors):
+                if parent not in visited:
+                    frontier.append(parent)
+        return tuple(order)
+
+
+class KnowledgeGraph(_RecordQueries):
+    """In-memory representation of a directed knowledge graph.
+
+    Edges are held by a pluggable adjacency engine: ``storage="sets"`` keeps
+    dicts of sets, while ``storage="csr"`` interns node keys to integer ids and
+    packs adjacency into compact CSR arrays for very large graphs.
+
+    Relationships that would close a cycle are rejected with ``CycleError``
+    unless the graph is created with ``allow_cycles=True``.
+
+    With ``thread_safe=True`` every public method runs under a fair
+    reader–writer lock, so queries proceed in parallel while writes are
+    applied one at a time; ``lock_stats()`` reports how long callers waited.
+    """
+
+    def __init__(
+        self,
+        *,
+        storage: str = "sets",
+        allow_cycles: bool = False,
+        prerequisite_cache_size: int = 100_000,
+        thread_safe: bool = False,
+    ) -> None:
+        self._lock = ReadWriteLock() if thread_safe else None
+        # Serialises readers filling the lazy caches below; readers otherwise
+        # share the read lock.
+        self._cache_guard: ContextManager[Any] = threading.RLock() if thread_safe else nullcontext()
         self._nodes: Dict[str, KnowledgeNode] = {}
-        self._edges: Dict[str, Set[str]] = {}
-        self._reverse_edges: Dict[str, Set[str]] = {}
+        self._adjacency: Adjacency = create_adjacency(storage)
+        self.allow_cycles = allow_cycles
+        self._topological_order: Optional[IncrementalTopologicalOrder] = (
+            None if allow_cycles else IncrementalTopologicalOrder(self._adjacency)
+        )
+        # Successor keys in name order, materialised on first use and then
+        # maintained by every edge mutation.
+        self._sorted_successors: Dict[str, List[str]] = {}
+        # Transitive prerequisite closures in BFS order, invalidated only for
+        # the descendants of whatever an edit touches.
+        self._prerequisite_cache: Dict[str, Tuple[str, ...]] = {}
+        self._prerequisite_cache_size = prerequisite_cache_size
+        self._prerequisite_stats = CacheStats()
+        # Bumped on every structural change; derived structures record the
+        # version they were computed for.
+        self._version = 0
+        # Lower bound on every edge effort, used to scale the A* heuristic.
+        self._min_effort = DEFAULT_WEIGHT
+        self._hop_levels: Dict[str, int] = {}
+        self._hop_levels_version = -1
+        self._study_plans: "OrderedDict[Tuple[str, ...], Tuple[str, ...]]" = OrderedDict()
+        self._study_plan_version = -1
+        self._reachability: Optional[ReachabilityIndex] = None
+        # Set when the index above covers the condensation of a cyclic graph.
+        self._reachability_components: Optional[Condensation] = None
+        self._condensation: Optional[Condensation] = None
+        self._condensation_version = -1
+        self._reachability_version = -1
+        # Queries answered by search since the last write; counted for that version only.
+        self._reachability_stale_queries = 0
+        self._reachability_stale_version = -1
+        # Degree histograms and isolated-node count, updated by every edit.
+        self._degrees = DegreeCounter(self._adjacency)
+        # Ring per node for the radial explorer view, built on first request.
+        self._layout = RadialLayout(
+            self._adjacency,
+            self._layout_levels,
+            lambda key: self._nodes[key].name,
+            None if self._topological_order is None else self._topological_order.position,
+        )
+        self._layout_result: Optional[GraphLayout] = None
+        # Importance scores per key and the version they were computed for;
+        # recomputed on request (the API does so once writes settle).
+        self._importance: Dict[str, ConceptImportance] = {}
+        self._importance_version = -1
+        # Inverted index from lowercased tag to the keys of the nodes that carry it.
+        self._tag_index: Dict[str, Set[str]] = {}
+        self._text_index = TextIndex()
+        # Name completions ranked by in-degree (how many prerequisites lead in).
+        self._completions = PrefixIndex(self._nodes.keys, self._adjacency.in_degree)
+        self._trigrams = TrigramIndex()
+        # Keys added or edited since the text and spelling indexes last caught
+        # up; both are brought up to date in one batch by the next lookup.
+        self._unindexed: Set[str] = set()
         self._sessions: Dict[str, LearningSession] = {}
         self._curricula: Dict[str, Curriculum] = {}
         self._quiz_bank: Dict[str, QuizQuestion] = {}
         self._shares: Dict[str, IdeaShare] = {}
-
+        # Latest published snapshot; None until a reader first asks for one.
+        self._root: Optional[GraphSnapshot] = None
+        # Node keys and record sections written since the root was published;
+        # the next snapshot() folds all of them into one new version.
+        self._stale_keys: Set[str] = set()
+        self._stale_records: Set[str] = set()
+        # Snapshot closures still valid after the write in progress changed
+        # some edges; handed to the next published version.
+        self._next_closures: Optional[Dict[str, Tuple[str, ...]]] = None
+        # Number of writes applied so far.
+        self._revision = 0
+
+    def lock_stats(self) -> Optional[LockStats]:
+        """Report lock acquisitions and wait times; ``None`` unless thread-safe."""
+
+        return None if self._lock is None else self._lock.stats()
+
+    def revision(self) -> int:
+        """Count the writes applied so far; unchanged means nothing exportable changed."""
+
+        return self._revision
+
+    @_reads
+    def estimated_bytes(self) -> int:
+        """Approximate the memory held by this graph from its entity counts."""
+
+        nodes = len(self._nodes)
+        records = len(self._sessions) + len(self._curricula) + len(self._shares) + len(self._quiz_bank)
+        total = GRAPH_BASE_BYTES + nodes * NODE_BYTES + self._adjacency.edge_count() * EDGE_BYTES
+        total += records * RECORD_BYTES
+        if self._root is not None:
+            total += SNAPSHOT_BASE_BYTES + nodes * SNAPSHOT_NODE_BYTES
+        return total
+
+    def reading(self) -> ContextManager[Any]:
+        """Hold the read lock across several calls (a no-op unless thread-safe)."""
+
+        return nullcontext() if self._lock is None else self._lock.read()
+
+    @_writes
     def add_node(self, node: KnowledgeNode) -> None:
+        self._before_write()
         key = node.name.lower()
-        if key not in self._nodes:
-            self._nodes[key] = node
-            self._edges.setdefault(key, set())
-            self._reverse_edges.setdefault(key, set())
+        existing = self._nodes.get(key)
+        if existing is None:
+            self._insert_node(key, node)
+            self._completions.add(key)
+            self._version += 1
         else:
-            # Merge metadata if the node already exists.
-            existing = self._nodes[key]
-            if node.description:
-                existing.description = node.description
-            if node.tags:
-                existing.tags = sorted(set(existing.tags).union(node.tags))
-
-    def add_relationship(self, source: str, target: str) -> None:
-        source_key, target_key = source.lower(), target.lower()
-        if source_key not in self._nodes:
-            raise ValueError(f"Unknown source node: {source}")
-        if target_key not in self._nodes:
-            raise ValueError(f"Unknown target node: {target}")
-        self._edges.setdefault(source_key, set()).add(target_key)
-        self._reverse_edges.setdefault(target_key, set()).add(source_key)
+            self._merge_node(key, existing, node)
+        self._publish((key,))
+
+    @_writes
+    def add_nodes_bulk(self, nodes: Iterable[KnowledgeNode], *, atomic: bool = True) -> BulkResult:
+        """Insert or merge many nodes after validating the whole batch in one pass.
+
+        With ``atomic=True`` a single invalid item rejects the batch and nothing
+        is applied; otherwise valid items are applied and the rest reported.
+        """
+
+        result = BulkResult()
+        valid: List[Tuple[str, KnowledgeNode]] = []
+        for index, node in enumerate(nodes):
+            if not node.name.strip():
+                result.errors.append((index, "Name cannot be empty"))
+                continue
+            valid.append((node.name.lower(), node))
+        if result.errors and atomic:
+            return result
+
+        self._before_write()
+        created: List[str] = []
+        for key, node in valid:
+            existing = self._nodes.get(key)
+            if existing is None:
+                self._insert_node(key, node)
+                created.append(key)
+            else:
+                self._merge_node(key, existing, node)
+                result.updated += 1
+        if created:
+            self._completions.add_many(created)
+            self._version += 1
+        result.created = len(created)
+        self._publish(key for key, _ in valid)
+        return result
+
+    def _insert_node(self, key: str, node: KnowledgeNode) -> None:
+        self._nodes[key] = node
+        self._adjacency.add_node(key)
+        self._degrees.nodes_added(1)
+        if self._topological_order is not None:
+            self._topological_order.add_node(key)
+        self._layout.node_added(key)
+        self._index_tags(key, node.tags)
+        self._unindexed.add(key)
+
+    def _merge_node(self, key: str, existing: KnowledgeNode, node: KnowledgeNode) -> None:
+        # Merge metadata if the node already exists. Records are replaced rather
+        # than edited because published snapshots may still hold the old one.
+        if not node.description and not node.tags:
+            return
+        self._nodes[key] = KnowledgeNode(
+            name=existing.name,
+            description=node.description or existing.description,
+            tags=sorted(set(existing.tags).union(node.tags)),
+        )
+        if node.tags:
+            self._index_tags(key, node.tags)
+        self._unindexed.add(key)
+
+    @_writes
+    def add_relationship(self, source: str, target: str, effort: Optional[float] = None) -> None:
+        source_key = self._require(source, "Unknown source node")
+        target_key = self._require(target, "Unknown target node")
+        if effort is not None and not effort > 0:
+            raise ValueError("Relationship effort must be a positive number")
+        if self._topological_order is not None and not self._adjacency.has_edge(source_key, target_key):
+            cycle = self._topological_order.insert_edge(source_key, target_key)
+            if cycle is not None:
+                names = [self._nodes[key].name for key in cycle]
+                raise CycleError(
+                    f"Relationship {source} -> {target} would create a cycle: " + " -> ".join(names),
+                    names,
+                )
+        self._before_write()
+        if effort is not None:
+            self._min_effort = min(self._min_effort, effort)
+        self._version += 1
+        if self._adjacency.add_edge(source_key, target_key, effort):
+            self._degrees.edges_changed([(source_key, target_key)])
+            self._layout.relevel((target_key,))
+            ordered = self._sorted_successors.get(source_key)
+            if ordered is not None:
+                insort(ordered, target_key)
+            self._invalidate_prerequisites(target_key)
+            self._completions.touch(target_key)
+        self._publish((source_key, target_key))
+
+    @_writes
+    def add_relationships_bulk(
+        self,
+        relationships: Iterable[Tuple[str, str, Optional[float]]],
+        *,
+        atomic: bool = True,
+    ) -> BulkResult:
+        """Add many ``(source, target, effort)`` relationships in one pass.
+
+        Existence and effort are validated for the whole batch up front. Cycles
+        are checked after storing the batch, with one full topological sort
+        unless every new edge already agrees with the current order. When the
+        batch would close one it is rolled back, and in non-atomic mode
+        replayed edge by edge so only the offending items fail.
+        """
+
+        result = BulkResult()
+        pending: List[Tuple[int, str, str, Optional[float]]] = []
+        nodes = self._nodes
+        for index, (source, target, effort) in enumerate(relationships):
+            source_key, target_key = source.lower(), target.lower()
+            if source_key not in nodes:
+                result.errors.append((index, f"Unknown source node: {source}"))
+            elif target_key not in nodes:
+                result.errors.append((index, f"Unknown target node: {target}"))
+            elif effort is not None and not effort > 0:
+                result.errors.append((index, "Relationship effort must be a positive number"))
+            elif source_key == target_key and self._topological_order is not None:
+                result.errors.append((index, f"Relationship {source} -> {target} would create a cycle"))
+            else:
+                pending.append((index, source_key, target_key, effort))
+        if result.errors and atomic:
+            return result
+
+        self._before_write()
+        adjacency = self._adjacency
+        # Weights of edges that existed before the batch, so a rejected batch can be undone.
+        replaced = [
+            (source_key, target_key, adjacency.weight(source_key, target_key))
+            for _, source_key, target_key, effort in pending
+            if effort is not None and adjacency.has_edge(source_key, target_key)
+        ]
+        flags = adjacency.add_edges((source_key, target_key, effort) for _, source_key, target_key, effort in pending)
+        created: List[Tuple[str, str]] = []
+        for (_, source_key, target_key, effort), was_created in zip(pending, flags):
+            if was_created:
+                created.append((source_key, target_key))
+            elif effort is not None:
+                result.updated += 1
+
+        if self._topological_order is not None and created:
+            cycle = self._order_batch(created)
+            if cycle is not None:
+                for source_key, target_key in created:
+                    adjacency.remove_edge(source_key, target_key)
+                for source_key, target_key, previous in replaced:
+                    adjacency.add_edge(source_key, target_key, previous)
+                if not atomic:
+                    return self._replay_relationships(pending, result)
+                edges = set(zip(cycle, cycle[1:]))
+                index, source_key, target_key, _ = next(item for item in pending if item[1:3] in edges)
+                names = [nodes[key].name for key in cycle]
+                return BulkResult(
+                    errors=[
+                        (
+                            index,
+                            f"Relationship {nodes[source_key].name} -> {nodes[target_key].name} "
+                            "would create a cycle: " + " -> ".join(names),
+                        )
+                    ]
+                )
 
+        for _, _, _, effort in pending:
+            if effort is not None and effort < self._min_effort:
+                self._min_effort = effort
+        result.created = len(created)
+        self._degrees.edges_changed(created)
+        self._layout.relevel(target_key for _, target_key in created)
+        if created or replaced:
+            self._relationships_changed_in_bulk()
+            self._publish(key for _, source_key, target_key, _ in pending for key in (source_key, target_key))
+        return result
+
+    def _order_batch(self, created: List[Tuple[str, str]]) -> Optional[List[str]]:
+        """Fit stored batch edges into the topological order; return a cycle if one closed."""
+
+        order = self._topological_order
+        if order.agrees(created):
+            # The order already accommodates the batch, so no cycle can have formed.
+            return None
+        keys = self._kahn_order()
+        if len(keys) == len(self._nodes):
+            order.reset(keys)
+            return None
+        return self._find_cycle(set(self._nodes).difference(keys))
+
+    def _replay_relationships(
+        self,
+        pending: List[Tuple[int, str, str, Optional[float]]],
+        result: BulkResult,
+    ) -> BulkResult:
+        """Slow path for a non-atomic batch that closes a cycle: insert edge by edge."""
+
+        result.updated = 0
+        for index, source_key, target_key, effort in pending:
+            existed = self._adjacency.has_edge(source_key, target_key)
+            try:
+                self.add_relationship(self._nodes[source_key].name, self._nodes[target_key].name, effort)
+            except CycleError as error:
+                result.errors.append((index, str(error)))
+                continue
+            if not existed:
+                result.created += 1
+            elif effort is not None:
+                result.updated += 1
+        result.errors.sort()
+        return result
+
+    def _relationships_changed_in_bulk(self) -> None:
+        # Cheaper than walking the descendants of every touched target.
+        self._version += 1
+        self._prerequisite_stats.invalidations += len(self._prerequisite_cache)
+        self._prerequisite_cache.clear()
+        if self._root is not None:
+            self._next_closures = {}
+        self._sorted_successors.clear()
+        self._completions.invalidate()
+
+    def _kahn_order(self) -> List[str]:
+        """Topological order of the whole graph; shorter than the graph if it has a cycle."""
+
+        adjacency = self._adjacency
+        pending = {key: adjacency.in_degree(key) for key in self._nodes}
+        order = [key for key, count in pending.items() if count == 0]
+        for current in order:
+            for child in adjacency.successors(current):
+                pending[child] -= 1
+                if pending[child] == 0:
+                    order.append(child)
+        return order
+
+    @_reads
     def get_node(self, name: str) -> Optional[KnowledgeNode]:
         return self._nodes.get(name.lower())
 
+    @_reads
+    def relationship_effort(self, source: str, target: str) -> float:
+        effort = self._adjacency.weight(source.lower(), target.lower())
+        if effort is None:
+            raise ValueError(f"Relationship {source} -> {target} does not exist")
+        return effort
+
+    @_reads
     def list_nodes(self) -> List[KnowledgeNode]:
         return sorted(self._nodes.values(), key=lambda node: node.name.lower())
 
+    @_reads
+    def nodes_with_tags(self, tags: Iterable[str], match: str = "all") -> List[KnowledgeNode]:
+        """Return nodes carrying all (or any) of the given tags, ordered by name."""
+
+        wanted = {tag.strip().lower() for tag in tags if tag.strip()}
+        if match not in {"all", "any"}:
+            raise ValueError("Tag match must be 'all' or 'any'")
+        if not wanted:
+            return self.list_nodes()
+        postings = [self._tag_index.get(tag, set()) for tag in wanted]
+        if match == "all":
+            postings.sort(key=len)
+            keys = set(postings[0])
+            for posting in postings[1:]:
+                if not keys:
+                    break
+                keys.intersection_update(posting)
+        else:
+            keys = set().union(*postings)
+        return sorted((self._nodes[key] for key in keys), key=lambda node: node.name.lower())
+
+    @_reads
+    def search(self, query: str, limit: int = 10) -> List[Tuple[KnowledgeNode, float]]:
+        """Rank concepts by BM25 relevance of their name, tags and description."""
+
+        self._catch_up_text_indexes()
+        return [(self._nodes[key], score) for key, score in self._text_index.search(query, limit)]
+
+    @_reads
+    def complete(self, prefix: str, limit: int = 10) -> List[KnowledgeNode]:
+        """Return concepts whose name starts with ``prefix``, most depended-upon first."""
+
+        with self._cache_guard:
+            keys = self._completions.complete(prefix.lower(), limit)
+        return [self._nodes[key] for key in keys]
+
+    @_reads
+    def in_degree(self, name: str) -> int:
+        return self._adjacency.in_degree(name.lower())
+
+    @_reads
+    def suggest(self, name: str, limit: int = 5) -> List[KnowledgeNode]:
+        """Return existing concepts whose names are spelled most like ``name``."""
+
+        self._catch_up_text_indexes()
+        return [self._nodes[key] for key, _ in self._trigrams.suggest(name.strip(), limit)]
+
+    @_reads
+    def stats(self) -> GraphStats:
+        """Report sizes, degree histograms and tag use, all maintained as the graph changes."""
+
+        degrees = self._degrees
+        return GraphStats(
+            nodes=len(self._nodes),
+            edges=self._adjacency.edge_count(),
+            roots=degrees.in_degrees.get(0, 0),
+            leaves=degrees.out_degrees.get(0, 0),
+            isolated=degrees.isolated,
+            in_degrees=dict(sorted(degrees.in_degrees.items())),
+            out_degrees=dict(sorted(degrees.out_degrees.items())),
+            tags={tag: len(keys) for tag, keys in self._tag_index.items()},
+        )
+
+    @_reads
+    def tag_counts(self) -> List[Tuple[str, int]]:
+        """Return each tag with the number of concepts carrying it, most used first."""
+
+        return sorted(
+            ((tag, len(keys)) for tag, keys in self._tag_index.items()),
+            key=lambda item: (-item[1], item[0]),
+        )
+
+    @_reads
     def list_relationships(self) -> List[Tuple[KnowledgeNode, KnowledgeNode]]:
         pairs: List[Tuple[KnowledgeNode, KnowledgeNode]] = []
-        for source_key, targets in self._edges.items():
-            for target_key in targets:
-                source_node = self._nodes[source_key]
-                target_node = self._nodes[target_key]
-                pairs.append((source_node, target_node))
+        for source_key, target_key in self._adjacency.edges():
+            pairs.append((self._nodes[source_key], self._nodes[target_key]))
         pairs.sort(key=lambda pair: (pair[0].name.lower(), pair[1].name.lower()))
         return pairs
 
+    def snapshot(self) -> GraphSnapshot:
+        """Return the latest published version for lock-free reading.
+
+        Writes only note what they touched, and the next call publishes all of
+        them as one version, so back-to-back writes with no reader in between
+        are merged and readers never observe a write half done.
+        """
+
+        root = self._root
+        if root is None or self._stale_keys or self._stale_records:
+            return self._catch_up()
+        return root
+
+    @_reads
+    def _catch_up(self) -> GraphSnapshot:
+        # The read lock keeps writers out (and may already be held by the
+        # caller); the guard stops concurrent readers publishing twice.
+        with self._cache_guard:
+            root = self._root
+            if root is None:
+                shards: Tuple[Dict[str, SnapshotEntry], ...] = tuple({} for _ in range(SNAPSHOT_SHARDS))
+                for key in self._nodes:
+                    shards[hash(key) % SNAPSHOT_SHARDS][key] = self._snapshot_entry(key)
+                root = GraphSnapshot(0, shards, dict(self._sessions), dict(self._curricula), dict(self._shares))
+            elif self._stale_keys or self._stale_records:
+                root = self._next_root(root)
+            # Swapping the root is a single reference assignment, so lock-free
+            # readers see either the old version or the new one.
+            self._root = root
+            return root
+
+    def _snapshot_entry(self, key: str) -> SnapshotEntry:
+        weighted = self._adjacency.weighted_successors(key)
+        return SnapshotEntry(
+            node=self._nodes[key],
+            successors=tuple(target for target, _ in weighted),
+            efforts=tuple(effort for _, effort in weighted),
+            predecessors=tuple(self._adjacency.predecessors(key)),
+        )
+
+    def _publish(self, keys: Iterable[str] = (), records: str = "") -> None:
+        """Note a finished write to ``keys`` or ``records`` for the next snapshot."""
+
+        if self._root is None:
+            return
+        self._stale_keys.update(keys)
+        if records:
+            self._stale_records.add(records)
+
+    def _next_root(self, root: GraphSnapshot) -> GraphSnapshot:
+        keys, self._stale_keys = self._stale_keys, set()
+        records, self._stale_records = self._stale_records, set()
+        shards = list(root._shards)
+        copied: Set[int] = set()
+        for key in keys:
+            index = hash(key) % SNAPSHOT_SHARDS
+            if index not in copied:
+                # Copy-on-write: the previous version keeps the original shard.
+                shards[index] = dict(shards[index])
+                copied.add(index)
+            if key in self._nodes:
+                shards[index][key] = self._snapshot_entry(key)
+            else:
+                shards[index].pop(key, None)
+        closures, self._next_closures = self._next_closures, None
+        return GraphSnapshot(
+            root.version + 1,
+            tuple(shards),
+            dict(self._sessions) if "sessions" in records else root._sessions,
+            dict(self._curricula) if "curricula" in records else root._curricula,
+            dict(self._shares) if "shares" in records else root._shares,
+            root._closures if closures is None else closures,
+        )
+
+    def _before_write(self) -> None:
+        self._revision += 1
+
+    @_writes
     def remove_relationship(self, source: str, target: str) -> None:
-        source_key, target_key = source.lower(), target.lower()
-        if source_key not in self._nodes:
-            raise ValueError(f"Unknown source node: {source}")
-        if target_key not in self._nodes:
-            raise ValueError(f"Unknown target node: {target}")
-        if target_key not in self._edges.get(source_key, set()):
+        source_key = self._require(source, "Unknown source node")
+        target_key = self._require(target, "Unknown target node")
+        if not self._adjacency.has_edge(source_key, target_key):
             raise ValueError(f"Relationship {source} -> {target} does not exist")
-        self._edges[source_key].remove(target_key)
-        if not self._edges[source_key]:
-            self._edges[source_key] = set()
-        if target_key in self._reverse_edges:
-            self._reverse_edges[target_key].discard(source_key)
-
+        self._before_write()
+        self._adjacency.remove_edge(source_key, target_key)
+        self._degrees.edges_changed([(source_key, target_key)], removed=True)
+        self._layout.relevel((target_key,))
+        self._version += 1
+        self._discard_sorted_successor(source_key, target_key)
+        self._invalidate_prerequisites(target_key)
+        self._completions.touch(target_key)
+        self._publish((source_key, target_key))
+
+    @_writes
     def remove_node(self, name: str) -> None:
-        key = name.lower()
-        if key not in self._nodes:
-            raise ValueError(f"Unknown node: {name}")
-        for predecessor in list(self._reverse_edges.get(key, set())):
-            self._edges[predecessor].discard(key)
-        for successor in list(self._edges.get(key, set())):
-            self._reverse_edges[successor].discard(key)
-        self._edges.pop(key, None)
-        self._reverse_edges.pop(key, None)
-        self._nodes.pop(key)
-
-    def shortest_path(self, start: str, goal: str) -> List[KnowledgeNode]:
-        start_key, goal_key = start.lower(), goal.lower()
-        if start_key not in self._nodes:
-            raise ValueError(f"Unknown start node: {start}")
-        if goal_key not in self._nodes:
-            raise ValueError(f"Unknown goal node: {goal}")
-
-        queue: deque[str] = deque([start_key])
-        parents: Dict[str, Optional[str]] = {start_key: None}
+        key = self._require(name, "Unknown node")
+        self._before_write()
+        self._invalidate_prerequisites(key)
+        self._version += 1
+        predecessors, successors = self._adjacency.remove_node(key)
+        self._degrees.node_removed(key, predecessors, successors)
+        for successor in successors:
+            self._completions.touch(successor)
+        if self._topological_order is not None:
+            self._topological_order.remove_node(key)
+        self._layout.node_removed(key, successors)
+        for predecessor in predecessors:
+            self._discard_sorted_successor(predecessor, key)
+        self._sorted_successors.pop(key, None)
+        node = self._nodes.pop(key)
+        self._importance.pop(key, None)
+        self._unindexed.discard(key)
+        self._text_index.remove(key)
+        self._completions.remove(key)
+        self._trigrams.remove(key)
+        for tag in {tag.lower() for tag in node.tags}:
+            keys = self._tag_index[tag]
+            keys.discard(key)
+            if not keys:
+                del self._tag_index[tag]
+        self._publish([key, *predecessors, *successors])
+
+    @_reads
+    def shortest_path(self, start: str, goal: str, *, fuzzy: bool = False) -> List[KnowledgeNode]:
+        return self.find_path(start, goal, fuzzy=fuzzy).path
+
+    @_reads
+    def find_path(self, start: str, goal: str, *, fuzzy: bool = False) -> PathResult:
+        """Bidirectional BFS returning the path plus how many nodes were explored."""
+
+        start_key = self._require(start, "Unknown start node", fuzzy)
+        goal_key = self._require(goal, "Unknown goal node", fuzzy)
+        if start_key == goal_key:
+            return PathResult(path=[self._nodes[start_key]], explored=1)
+
+        forward_parents: Dict[str, Optional[str]] = {start_key: None}
+        backward_parents: Dict[str, Optional[str]] = {goal_key: None}
+        forward_depth: Dict[str, int] = {start_key: 0}
+        backward_depth: Dict[str, int] = {goal_key: 0}
+        forward_frontier: List[str] = [start_key]
+        backward_frontier: List[str] = [goal_key]
+        meeting: Optional[str] = None
+
+        # Expand whole layers from the cheaper side (by total degree); the best
+        # meeting point found while finishing the first layer that touches the
+        # other side is optimal.
+        out_degree, in_degree = self._adjacency.out_degree, self._adjacency.in_degree
+        while forward_frontier and backward_frontier and meeting is None:
+            forward_cost = sum(out_degree(key) for key in forward_frontier)
+            backward_cost = sum(in_degree(key) for key in backward_frontier)
+            if forward_cost <= backward_cost:
+                forward_frontier, meeting = self._expand_layer(
+                    forward_frontier,
+                    forward_parents,
+                    forward_depth,
+                    backward_depth,
+                    self._adjacency.successors,
+                )
+            else:
+                backward_frontier, meeting = self._expand_layer(
+                    backward_frontier,
+                    backward_parents,
+                    backward_depth,
+                    forward_depth,
+                    self._adjacency.predecessors,
+                )
 
-        while queue:
-            current = queue.popleft()
+        explored = len(forward_parents) + len(backward_parents)
+        if meeting is None:
+            raise ValueError(
+                f"No learning path between '{self._nodes[start_key].name}' and "
+                f"'{self._nodes[goal_key].name}'."
+            )
+
+        path: List[str] = []
+        current: Optional[str] = meeting
+        while current is not None:
+            path.append(current)
+            current = forward_parents[current]
+        path.reverse()
+        current = backward_parents[meeting]
+        while current is not None:
+            path.append(current)
+            current = backward_parents[current]
+
+        return PathResult(
+            path=[self._nodes[key] for key in path],
+            explored=explored,
+            cost=self._path_cost(path),
+        )
+
+    @_reads
+    def find_weighted_path(self, start: str, goal: str, *, fuzzy: bool = False) -> PathResult:
+        """Cheapest path by total effort using A* over hop levels (Dijkstra fallback)."""
+
+        start_key = self._require(start, "Unknown start node", fuzzy)
+        goal_key = self._require(goal, "Unknown goal node", fuzzy)
+
+        # Hop levels (fewest edges from any root) never grow by more than one
+        # along an edge, so min_effort * (level[goal] - level[n]) never
+        # overestimates the remaining cost. Without a goal level it is zero and
+        # the search is plain Dijkstra.
+        levels = self._levels()
+        goal_level = levels.get(goal_key)
+        min_effort = self._min_effort
+
+        def heuristic(key: str) -> float:
+            if goal_level is None:
+                return 0.0
+            level = levels.get(key)
+            if level is None or level >= goal_level:
+                return 0.0
+            return min_effort * (goal_level - level)
+
+        costs: Dict[str, float] = {start_key: 0.0}
+        parents: Dict[str, Optional[str]] = {start_key: None}
+        settled: Set[str] = set()
+        heap: List[Tuple[float, float, str]] = [(heuristic(start_key), 0.0, start_key)]
+        while heap:
+            _, cost, current = heappop(heap)
+            if current in settled:
+                continue
+            settled.add(current)
             if current == goal_key:
                 break
-            for neighbor in self._edges.get(current, set()):
-                if neighbor not in parents:
+            for neighbor, effort in self._adjacency.weighted_successors(current):
+                candidate = cost + effort
+                if neighbor not in settled and candidate < costs.get(neighbor, float("inf")):
+                    costs[neighbor] = candidate
                     parents[neighbor] = current
-                    queue.append(neighbor)
+                    heappush(heap, (candidate + heuristic(neighbor), candidate, neighbor))
 
-        if goal_key not in parents:
+        if goal_key not in settled:
             raise ValueError(
                 f"No learning path between '{self._nodes[start_key].name}' and "
                 f"'{self._nodes[goal_key].name}'."
             )
 
+        return PathResult(
+            path=[self._nodes[key] for key in self._trace(parents, goal_key)],
+            explored=len(settled),
+            cost=costs[goal_key],
+        )
+
+    @_reads
+    def shortest_paths_from(
+        self,
+        start: str,
+        goals: Iterable[str],
+        *,
+        weighted: bool = False,
+        fuzzy: bool = False,
+    ) -> Dict[str, Optional[PathResult]]:
+        """Paths from one start to many goals using a single traversal.
+
+        The search stops as soon as every goal is settled. Goals that cannot be
+        reached map to ``None``.
+        """
+
+        start_key = self._require(start, "Unknown start node", fuzzy)
+        goal_keys = {goal: self._require(goal, "Unknown goal node", fuzzy) for goal in goals}
+
+        remaining = set(goal_keys.values())
+        parents: Dict[str, Optional[str]] = {start_key: None}
+        costs: Dict[str, float] = {start_key: 0.0}
+        remaining.discard(start_key)
+        if weighted:
+            settled: Set[str] = set()
+            heap: List[Tuple[float, str]] = [(0.0, start_key)]
+            while heap and remaining:
+                cost, current = heappop(heap)
+                if current in settled:
+                    continue
+                settled.add(current)
+                remaining.discard(current)
+                for neighbor, effort in self._adjacency.weighted_successors(current):
+                    candidate = cost + effort
+                    if neighbor not in settled and candidate < costs.get(neighbor, float("inf")):
+                        costs[neighbor] = candidate
+                        parents[neighbor] = current
+                        heappush(heap, (candidate, neighbor))
+            reached = settled | {start_key}
+        else:
+            frontier = deque([start_key])
+            while frontier and remaining:
+                current = frontier.popleft()
+                for neighbor, effort in self._adjacency.weighted_successors(current):
+                    if neighbor not in parents:
+                        parents[neighbor] = current
+                        costs[neighbor] = costs[current] + effort
+                        remaining.discard(neighbor)
+                        frontier.append(neighbor)
+            reached = set(parents)
+
+        explored = len(parents)
+        results: Dict[str, Optional[PathResult]] = {}
+        for goal, goal_key in goal_keys.items():
+            if goal_key not in reached:
+                results[goal] = None
+                continue
+            results[goal] = PathResult(
+                path=[self._nodes[key] for key in self._trace(parents, goal_key)],
+                explored=explored,
+                cost=costs[goal_key],
+            )
+        return results
+
+    @staticmethod
+    def _trace(parents: Dict[str, Optional[str]], goal_key: str) -> List[str]:
         path: List[str] = []
         current: Optional[str] = goal_key
         while current is not None:
             path.append(current)
             current = parents[current]
         path.reverse()
+        return path
+
+    def _path_cost(self, path: List[str]) -> float:
+        return sum(
+            self._adjacency.weight(source, target) or DEFAULT_WEIGHT
+            for source, target in zip(path, path[1:])
+        )
 
-        return [self._nodes[key] for key in path]
+    def _levels(self) -> Dict[str, int]:
+        """Fewest hops from any root to each node, cached per graph version."""
 
+        if self._hop_levels_version != self._version:
+            levels: Dict[str, int] = {}
+            frontier = [key for key in self._nodes if self._adjacency.in_degree(key) == 0]
+            for key in frontier:
+                levels[key] = 0
+            while frontier:
+                next_frontier: List[str] = []
+                for current in frontier:
+                    for child in self._adjacency.successors(current):
+                        if child not in levels:
+                            levels[child] = levels[current] + 1
+                            next_frontier.append(child)
+                frontier = next_frontier
+            self._hop_levels = levels
+            self._hop_levels_version = self._version
+        return self._hop_levels
+
+    @staticmethod
+    def _expand_layer(
+        frontier: List[str],
+        parents: Dict[str, Optional[str]],
+        depth: Dict[str, int],
+        other_depth: Dict[str, int],
+        neighbours: Callable[[str], Iterable[str]],
+    ) -> Tuple[List[str], Optional[str]]:
+        next_frontier: List[str] = []
+        meeting: Optional[str] = None
+        best = 0
+        for current in frontier:
+            for neighbor in neighbours(current):
+                if neighbor in parents:
+                    continue
+                parents[neighbor] = current
+                depth[neighbor] = depth[current] + 1
+                next_frontier.append(neighbor)
+                if neighbor in other_depth:
+                    total = depth[neighbor] + other_depth[neighbor]
+                    if meeting is None or total < best:
+                        meeting, best = neighbor, total
+        return next_frontier, meeting
+
+    @_reads
     def prerequisites(self, name: str) -> List[KnowledgeNode]:
-        key = name.lower()
-        if key not in self._nodes:
-            raise ValueError(f"Unknown node: {name}")
+        key = self._require(name, "Unknown node")
+        return [self._nodes[node_key] for node_key in self._closure(key)]
+
+    @_reads
+    def is_prerequisite(self, prerequisite: str, concept: str) -> bool:
+        """Whether ``prerequisite`` has to be learned, directly or transitively, before ``concept``."""
+
+        source_key = self._require(prerequisite, "Unknown concept")
+        target_key = self._require(concept, "Unknown concept")
+        index = self._reachability_index()
+        if index is not None:
+            condensation = self._reachability_components
+            if condensation is None:
+                return index.reaches(source_key, target_key)
+            source_component = condensation.component[source_key]
+            target_component = condensation.component[target_key]
+            if source_component == target_component:
+                return condensation.cyclic[source_component]
+            return index.reaches(source_component, target_component)
+        position = self._topological_order.position if self._topological_order is not None else None
+        return reaches_by_search(self._adjacency, source_key, target_key, position)
+
+    def _reachability_index(self) -> Optional[ReachabilityIndex]:
+        """Return the index if it matches the current version, rebuilding it lazily.
+
+        While writes keep arriving, queries are answered by a pruned search; the
+        index is only rebuilt once enough queries have hit the same stale
+        version, so every write restarts the count. A graph that allows cycles
+        is indexed through its condensation.
+        """
+
+        with self._cache_guard:
+            if self._reachability_version == self._version:
+                return self._reachability
+            if self._reachability_stale_version != self._version:
+                self._reachability_stale_version = self._version
+                self._reachability_stale_queries = 0
+            self._reachability_stale_queries += 1
+            if self._reachability_stale_queries < REACHABILITY_REBUILD_AFTER:
+                return None
+            if self._topological_order is None:
+                condensation = self._condensed()
+                self._reachability = ReachabilityIndex.build(condensation.successors, range(len(condensation)))
+                self._reachability_components = condensation
+            else:
+                self._reachability = ReachabilityIndex.build(self._adjacency.successors, self._nodes)
+            self._reachability_version = self._version
+            return self._reachability
+
+    @_reads
+    def condensation(self) -> Condensation:
+        """Strongly connected components and the DAG between them, cached per graph version.
+
+        Shared between callers, so treat it as read-only.
+        """
+
+        return self._condensed()
+
+    def _condensed(self) -> Condensation:
+        with self._cache_guard:
+            if self._condensation is None or self._condensation_version != self._version:
+                self._condensation = Condensation(self._nodes, self._adjacency.successors)
+                self._condensation_version = self._version
+            return self._condensation
+
+    @_reads
+    def cycles(self, limit: int = 20, max_members: int = 100) -> CycleReport:
+        """Report the ``limit`` largest groups of mutually dependent concepts.
+
+        Only graphs created with ``allow_cycles=True`` can have any. Each group
+        lists at most ``max_members`` concepts and one shortest loop to break.
+        """
+
+        if limit < 1 or max_members < 1:
+            raise ValueError("Limit and max_members must be positive")
+        if self._topological_order is not None:
+            return CycleReport()
+        condensation = self._condensed()
+        found = condensation.cyclic_components()
+        report = CycleReport(
+            total_components=len(found),
+            total_concepts=sum(len(condensation.members[component]) for component in found),
+        )
+        successors = self._adjacency.successors
+        for component in found[:limit]:
+            members = sorted(condensation.members[component])
+            inside = set(members)
+            cycle = shortest_cycle(members[0], inside, successors) or []
+            report.components.append(
+                CyclicComponent(
+                    size=len(members),
+                    edges=sum(1 for key in members for child in successors(key) if child in inside),
+                    nodes=[self._nodes[key] for key in members[:max_members]],
+                    cycle=[self._nodes[key].name for key in cycle],
+                )
+            )
+        return report
+
+    @_reads
+    def study_plan(self, targets: Iterable[str]) -> List[KnowledgeNode]:
+        """Order the targets and all of their prerequisites so each follows its parents."""
+
+        target_keys: List[str] = []
+        for target in targets:
+            target_keys.append(self._require(target, "Unknown concept"))
+        if not target_keys:
+            return []
+
+        cache_key = tuple(sorted(set(target_keys)))
+        with self._cache_guard:
+            if self._study_plan_version != self._version:
+                self._study_plans.clear()
+                self._study_plan_version = self._version
+            plan = self._study_plans.get(cache_key)
+            if plan is not None:
+                self._study_plans.move_to_end(cache_key)
+        if plan is None:
+            plan = self._topological_plan(cache_key)
+            with self._cache_guard:
+                if len(self._study_plans) >= STUDY_PLAN_CACHE_SIZE:
+                    self._study_plans.popitem(last=False)
+                self._study_plans[cache_key] = plan
+        return [self._nodes[key] for key in plan]
+
+    def _topological_plan(self, target_keys: Tuple[str, ...]) -> Tuple[str, ...]:
+        members: Set[str] = set(target_keys)
+        for key in target_keys:
+            members.update(self._closure(key))
+
+        # Kahn's algorithm restricted to the plan's members, breaking ties by name.
+        pending: Dict[str, int] = {}
+        for key in members:
+            pending[key] = sum(1 for parent in self._adjacency.predecessors(key) if parent in members)
+        ready = [key for key, count in pending.items() if count == 0]
+        ready.sort()
+        order: List[str] = []
+        while ready:
+            current = heappop(ready)
+            order.append(current)
+            for child in self._adjacency.successors(current):
+                if child in pending:
+                    pending[child] -= 1
+                    if pending[child] == 0:
+                        heappush(ready, child)
+
+        if len(order) < len(members):
+            cycle = self._find_cycle(members.difference(order))
+            raise ValueError(
+                "Prerequisite cycle detected: "
+                + " -> ".join(self._nodes[key].name for key in cycle)
+            )
+        return tuple(order)
+
+    def _find_cycle(self, stuck: Set[str]) -> List[str]:
+        """Walk parents inside ``stuck`` (every member has one) until a node repeats."""
+
+        current = min(stuck)
+        seen: Dict[str, int] = {}
+        walk: List[str] = []
+        while current not in seen:
+            seen[current] = len(walk)
+            walk.append(current)
+            current = min(parent for parent in self._adjacency.predecessors(current) if parent in stuck)
+        cycle = walk[seen[current]:]
+        cycle.reverse()
+        first = cycle.index(min(cycle))
+        cycle = cycle[first:] + cycle[:first]
+        return cycle + [cycle[0]]
+
+    def _closure(self, key: str) -> Tuple[str, ...]:
+        with self._cache_guard:
+            closure = self._prerequisite_cache.get(key)
+            if closure is not None:
+                self._prerequisite_stats.hits += 1
+                return closure
+            self._prerequisite_stats.misses += 1
+        closure = self._prerequisite_closure(key)
+        with self._cache_guard:
+            if key not in self._prerequisite_cache and len(self._prerequisite_cache) >= self._prerequisite_cache_size:
+                # Evict the oldest entry; dicts preserve insertion order.
+                del self._prerequisite_cache[next(iter(self._prerequisite_cache))]
+            self._prerequisite_cache[key] = closure
+        return closure
+
+    @_reads
+    def prerequisite_cache_stats(self) -> CacheStats:
+        """Report hit/miss counters for the prerequisite closure cache."""
+
+        stats = self._prerequisite_stats
+        return CacheStats(
+            hits=stats.hits,
+            misses=stats.misses,
+            invalidations=stats.invalidations,
+            size=len(self._prerequisite_cache),
+        )
 
+    def _prerequisite_closure(self, key: str) -> Tuple[str, ...]:
         visited: Set[str] = set()
         order: List[str] = []
+        frontier = deque(sorted(self._adjacency.predecessors(key)))
+        while frontier:
+            current = frontier.popleft()
+            if current in visited:
+                continue
+            visited.add(current)
+            order.append(current)
+            for parent in sorted(self._adjacency.predecessors(current)):
+                if parent not in visited:
+                    frontier.append(parent)
+        return tuple(order)
+
+    def _invalidate_prerequisites(self, key: str) -> None:
+        """Drop cached closures of ``key`` and every concept that builds on it."""
+
+        cache = self._prerequisite_cache
+        published = self._unpublished_closures()
+        if not cache and not published:
+            return
+        seen: Set[str] = {key}
+        frontier = deque([key])
+        while frontier:
+            current = frontier.popleft()
+            if cache.pop(current, None) is not None:
+                self._prerequisite_stats.invalidations += 1
+            if published:
+                published.pop(current, None)
+            for child in self._adjacency.successors(current):
+                if child not in seen:
+                    seen.add(child)
+                    frontier.append(child)
+
+    def _unpublished_closures(self) -> Optional[Dict[str, Tuple[str, ...]]]:
+        # The published dict may still be read and filled by older versions,
+        # so edge changes prune a private copy that the next version adopts.
+        root = self._root
+        if root is None:
+            return None
+        if self._next_closures is None:
+            self._next_closures = dict(root._closures)
+        return self._next_closures
+
+    @_reads
+    def dependents(self, name: str) -> List[KnowledgeNode]:
+        key = self._require(name, "Unknown node")
+        return [self._nodes[target_key] for target_key in self._successors_in_order(key)]
 
-        def walk(stack: Iterable[str]) -> None:
-            frontier = deque(stack)
-            while frontier:
-                current = frontier.popleft()
-                if current in visited:
-                    continue
-                visited.add(current)
-                order.append(current)
-                for parent in sorted(self._reverse_edges.get(current, set())):
-                    if parent not in visited:
-                        frontier.append(parent)
+    @_reads
+    def neighborhood(
+        self,
+        center: str,
+        depth: int = 2,
+        direction: str = "both",
+        max_nodes: int = 200,
+        *,
+        fuzzy: bool = False,
+    ) -> Neighborhood:
+        """Collect concepts within ``depth`` hops of ``center`` and the edges among them.
+
+        ``direction`` follows prerequisites (``"up"``), dependents (``"down"``)
+        or both. Neighbours are visited in name order, so a truncated result is
+        deterministic; the work done is bounded by ``max_nodes`` and the degrees
+        of the nodes returned, not by the size of the graph.
+        """
+
+        if direction not in {"up", "down", "both"}:
+            raise ValueError("Direction must be 'up', 'down' or 'both'")
+        if depth < 0 or max_nodes < 1:
+            raise ValueError("Depth must be non-negative and max_nodes positive")
+        center_key = self._require(center, "Unknown concept", fuzzy)
+        up, down = direction in {"up", "both"}, direction in {"down", "both"}
+
+        def neighbours(key: str) -> Iterator[str]:
+            if up:
+                yield from sorted(self._adjacency.predecessors(key))
+            if down:
+                yield from self._successors_in_order(key)
+
+        distance: Dict[str, int] = {center_key: 0}
+        frontier = [center_key]
+        limited = False
+        for hops in range(1, depth + 1):
+            next_frontier: List[str] = []
+            for current in frontier:
+                for neighbor in neighbours(current):
+                    if neighbor in distance:
+                        continue
+                    if len(distance) >= max_nodes:
+                        limited = True
+                        break
+                    distance[neighbor] = hops
+                    next_frontier.append(neighbor)
+                if limited:
+                    break
+            if limited or not next_frontier:
+                break
+            frontier = next_frontier
 
-        walk(self._reverse_edges.get(key, set()))
-        return [self._nodes[node_key] for node_key in order]
+        deeper = not limited and any(
+            neighbor not in distance
+            for key, hops in distance.items()
+            if hops == depth
+            for neighbor in neighbours(key)
+        )
+        edges: List[Tuple[str, str, float]] = []
+        for key in distance:
+            name = self._nodes[key].name
+            if self._adjacency.out_degree(key) <= len(distance):
+                for target_key, effort in self._adjacency.weighted_successors(key):
+                    if target_key in distance:
+                        edges.append((name, self._nodes[target_key].name, effort))
+            else:
+                # A hub: probing the few returned nodes beats scanning its row.
+                for target_key in distance:
+                    effort = self._adjacency.weight(key, target_key)
+                    if effort is not None:
+                        edges.append((name, self._nodes[target_key].name, effort))
+        edges.sort(key=lambda edge: (edge[0].lower(), edge[1].lower()))
+        return Neighborhood(
+            nodes=[self._nodes[key] for key in distance],
+            distances=list(distance.values()),
+            edges=edges,
+            node_limit_reached=limited,
+            depth_limit_reached=deeper,
+        )
 
-    def dependents(self, name: str) -> List[KnowledgeNode]:
-        key = name.lower()
-        if key not in self._nodes:
-            raise ValueError(f"Unknown node: {name}")
-        dependents = [
-            self._nodes[target_key]
-            for target_key, parents in self._reverse_edges.items()
-            if key in parents
-        ]
-        dependents.sort(key=lambda node: node.name.lower())
-        return dependents
+    @_reads
+    def importance_job(self) -> PageRank:
+        """Copy the edges into a PageRank run; step it to convergence, then ``apply_importance``."""
+
+        keys = list(self._nodes)
+        index = {key: position for position, key in enumerate(keys)}
+        successors, position = self._adjacency.successors, index.__getitem__
+        return PageRank(keys, [list(map(position, successors(key))) for key in keys], self._version)
+
+    def importance_job_steps(self, chunk: int = COPY_CHUNK) -> Iterator[Optional[PageRank]]:
+        """``importance_job`` copied ``chunk`` concepts at a time, for callers that must stay responsive.
+
+        Yields ``None`` before each chunk, then the job. Each chunk is read
+        under the read lock; if the structure changed since the copy began,
+        iteration stops without producing a job.
+        """
+
+        with self.reading():
+            version = self._version
+            keys = list(self._nodes)
+        position = dict(zip(keys, range(len(keys)))).__getitem__
+        successors: List[List[int]] = []
+        for start in range(0, len(keys), chunk):
+            yield None
+            with self.reading():
+                if self._version != version:
+                    return
+                adjacent = self._adjacency.successors
+                successors.extend([list(map(position, adjacent(key))) for key in keys[start:start + chunk]])
+        yield PageRank(keys, successors, version)
+
+    @_reads
+    def apply_importance(self, job: PageRank) -> bool:
+        """Store a finished run's scores; False (and nothing stored) if the graph changed since it began."""
+
+        with self._cache_guard:
+            if job.version != self._version:
+                return False
+            self._importance = job.scores()
+            self._importance_version = job.version
+        return True
+
+    def refresh_importance(self) -> None:
+        """Recompute importance scores now, unless they are already current."""
+
+        if self.importance_stale():
+            self.apply_importance(self.importance_job().run())
+
+    @_reads
+    def importance_stale(self) -> bool:
+        return self._importance_version != self._version
+
+    @_reads
+    def importance(self, name: str) -> Optional[ConceptImportance]:
+        """Last computed scores of ``name``; None if they predate the concept."""
+
+        return self._importance.get(name.lower())
+
+    @_reads
+    def sort_by_importance(self, nodes: Iterable[KnowledgeNode]) -> List[KnowledgeNode]:
+        """Order ``nodes`` most foundational first by their last computed PageRank, then by name."""
+
+        scores = self._importance
+        unscored = ConceptImportance()
+        return sorted(
+            nodes,
+            key=lambda node: (-scores.get(node.name.lower(), unscored).pagerank, node.name.lower()),
+        )
 
+    @_reads
+    def layout(self) -> GraphLayout:
+        """Place every concept on a ring given by its depth, for clients that only draw.
+
+        In an acyclic graph a concept's depth is the length of the longest
+        prerequisite chain leading to it, so it always sits outside everything
+        it depends on. Graphs that allow cycles use the fewest hops from a
+        root instead, with concepts no root reaches on one extra outer ring.
+        Levels and ring positions are kept up to date across edits rather than
+        rebuilt; the result is cached per graph version and shared between
+        callers, so treat it as read-only.
+        """
+
+        with self._cache_guard:
+            result = self._layout_result
+            if result is None or result.version != self._version:
+                result = self._layout_result = GraphLayout(
+                    version=self._version,
+                    rings=self._layout.ring_count(),
+                    nodes=list(self._layout.placements()),
+                )
+        return result
+
+    def _layout_levels(self) -> Dict[str, int]:
+        if self._topological_order is None:
+            levels = dict(self._levels())
+            outer = max(levels.values(), default=-1) + 1
+            for key in self._nodes:
+                levels.setdefault(key, outer)
+            return levels
+        # Kahn's algorithm, pushing each node's depth on to its successors.
+        adjacency = self._adjacency
+        pending = {key: adjacency.in_degree(key) for key in self._nodes}
+        levels = dict.fromkeys(pending, 0)
+        order = [key for key, count in pending.items() if count == 0]
+        for current in order:
+            depth = levels[current] + 1
+            for child in adjacency.successors(current):
+                if levels[child] < depth:
+                    levels[child] = depth
+                pending[child] -= 1
+                if pending[child] == 0:
+                    order.append(child)
+        return levels
+
+    def _successors_in_order(self, key: str) -> List[str]:
+        ordered = self._sorted_successors.get(key)
+        if ordered is None:
+            ordered = sorted(self._adjacency.successors(key))
+            self._sorted_successors[key] = ordered
+        return ordered
+
+    def _resolve(self, name: str, fuzzy: bool = False) -> Optional[str]:
+        key = name.lower()
+        if key in self._nodes:
+            return key
+        if fuzzy:
+            self._catch_up_text_indexes()
+            matches = self._trigrams.suggest(key.strip(), 2)
+            if matches and matches[0][1] >= FUZZY_RESOLVE_SIMILARITY:
+                if len(matches) == 1 or matches[0][1] - matches[1][1] >= FUZZY_RESOLVE_MARGIN:
+                    return matches[0][0]
+        return None
+
+    def _require(self, name: str, message: str, fuzzy: bool = False) -> str:
+        key = self._resolve(name, fuzzy)
+        if key is None:
+            raise self._unknown(f"{message}: {name}", [name])
+        return key
+
+    def _unknown(self, message: str, names: Iterable[str]) -> UnknownConceptError:
+        return UnknownConceptError(message, {name: [node.name for node in self.suggest(name)] for name in names})
+
+    def _catch_up_text_indexes(self) -> None:
+        if not self._unindexed:
+            return
+        with self._cache_guard:
+            nodes = [(key, self._nodes[key]) for key in self._unindexed]
+            self._text_index.add_many((key, node.name, node.description, node.tags) for key, node in nodes)
+            self._trigrams.add_many(key for key, _ in nodes)
+            self._unindexed.clear()
+
+    def _index_tags(self, key: str, tags: Iterable[str]) -> None:
+        # Indexed in lower case to match nodes_with_tags, which lowercases its query.
+        for tag in tags:
+            self._tag_index.setdefault(tag.lower(), set()).add(key)
+
+    def _discard_sorted_successor(self, source_key: str, target_key: str) -> None:
+        ordered = self._sorted_successors.get(source_key)
+        if ordered is None:
+            return
+        index = bisect_left(ordered, target_key)
+        if index < len(ordered) and ordered[index] == target_key:
+            del ordered[index]
+
+    @_writes
     def create_session(
         self,
         name: str,
         description: str,
         focus_tags: Iterable[str],
         linked_concepts: Iterable[str],
+        *,
+        fuzzy: bool = False,
     ) -> LearningSession:
         concept_keys: List[str] = []
         missing: List[str] = []
         for concept in linked_concepts:
-            key = concept.lower()
-            if key not in self._nodes:
+            key = self._resolve(concept, fuzzy)
+            if key is None:
                 missing.append(concept)
             else:
                 concept_keys.append(key)
         if missing:
-            raise ValueError(
+            raise self._unknown(
                 "Unknown concepts in session: "
-                + ", ".join(sorted({item.strip() or "(blank)" for item in missing}))
+                + ", ".join(sorted({item.strip() or "(blank)" for item in missing})),
+                missing,
             )
         session_id = str(uuid4())
         ordered_concepts: List[str] = []
@@ -263,12 +1864,12 @@ class KnowledgeGraph:
         )
         if not session.name:
             raise ValueError("Session name cannot be empty")
+        self._before_write()
         self._sessions[session_id] = session
+        self._publish(records="sessions")
         return session
 
-    def list_sessions(self) -> List[LearningSession]:
-        return sorted(self._sessions.values(), key=lambda item: item.created_at, reverse=True)
-
+    @_writes
     def update_session(
         self,
         session_id: str,
@@ -279,15 +1880,19 @@ class KnowledgeGraph:
         if session_id not in self._sessions:
             raise ValueError(f"Unknown session: {session_id}")
         session = self._sessions[session_id]
+        self._before_write()
         if status is not None:
             status_value = status.strip()
             if status_value:
-                session.status = status_value
+                session = replace(session, status=status_value)
         if current_focus is not None:
             focus_value = current_focus.strip()
-            session.current_focus = focus_value or None
+            session = replace(session, current_focus=focus_value or None)
+        self._sessions[session_id] = session
+        self._publish(records="sessions")
         return session
 
+    @_writes
     def create_curriculum(
         self,
         title: str,
@@ -295,19 +1900,22 @@ class KnowledgeGraph:
         tags: Iterable[str],
         source_url: Optional[str],
         linked_concepts: Iterable[str],
+        *,
+        fuzzy: bool = False,
     ) -> Curriculum:
         concept_keys: List[str] = []
         missing: List[str] = []
         for concept in linked_concepts:
-            key = concept.lower()
-            if key not in self._nodes:
+            key = self._resolve(concept, fuzzy)
+            if key is None:
                 missing.append(concept)
             else:
                 concept_keys.append(key)
         if missing:
-            raise ValueError(
+            raise self._unknown(
                 "Unknown concepts in curriculum: "
-                + ", ".join(sorted({item.strip() or "(blank)" for item in missing}))
+                + ", ".join(sorted({item.strip() or "(blank)" for item in missing})),
+                missing,
             )
         curriculum_id = str(uuid4())
         ordered_concepts: List[str] = []
@@ -328,16 +1936,14 @@ class KnowledgeGraph:
         )
         if not curriculum.title:
             raise ValueError("Curriculum title cannot be empty")
+        self._before_write()
         self._curricula[curriculum_id] = curriculum
+        self._publish(records="curricula")
         return curriculum
 
-    def list_curricula(self) -> List[Curriculum]:
-        return sorted(self._curricula.values(), key=lambda item: item.uploaded_at, reverse=True)
-
-    def generate_quiz(self, concept: str, count: int = 3) -> List[QuizQuestion]:
-        concept_key = concept.lower()
-        if concept_key not in self._nodes:
-            raise ValueError(f"Unknown concept: {concept}")
+    @_writes
+    def generate_quiz(self, concept: str, count: int = 3, *, fuzzy: bool = False) -> List[QuizQuestion]:
+        concept_key = self._require(concept, "Unknown concept", fuzzy)
         target = self._nodes[concept_key]
         questions: List[QuizQuestion] = []
 
@@ -429,6 +2035,7 @@ class KnowledgeGraph:
             self._quiz_bank[question.id] = question
         return selected
 
+    @_reads
     def grade_quiz(self, question_id: str, selected_index: int) -> Tuple[bool, QuizQuestion]:
         question = self._quiz_bank.get(question_id)
         if question is None:
@@ -439,6 +2046,7 @@ class KnowledgeGraph:
 
     # Idea sharing helpers -------------------------------------------------
 
+    @_writes
     def publish_share(
         self,
         *,
@@ -449,6 +2057,7 @@ class KnowledgeGraph:
         linked_concepts: Iterable[str],
         visibility: str = "public",
         authorized_handles: Optional[Iterable[str]] = None,
+        fuzzy: bool = False,
     ) -> IdeaShare:
         """Create a shareable snapshot to help collaborators catch up quickly."""
 
@@ -474,10 +2083,8 @@ class KnowledgeGraph:
         for concept in linked_concepts:
             if not concept:
                 continue
-            node = self.get_node(concept)
-            if node is None:
-                raise ValueError(f"Unknown concept for share: {concept}")
-            normalized_concepts.append(node.name)
+            key = self._require(concept, "Unknown concept for share", fuzzy)
+            normalized_concepts.append(self._nodes[key].name)
 
         share_id = str(uuid4())
         handles = sorted(
@@ -497,30 +2104,12 @@ class KnowledgeGraph:
             visibility=normalized_visibility,
             authorized_handles=handles,
         )
+        self._before_write()
         self._shares[share_id] = share
+        self._publish(records="shares")
         return share
 
-    def list_shares(self, viewer: Optional[str] = None) -> List[IdeaShare]:
-        """Return shares the viewer is allowed to see ordered by recency."""
-
-        normalized_viewer = (viewer or "").strip().lower()
-        visible: List[IdeaShare] = []
-        for share in self._shares.values():
-            if share.visibility == "public":
-                visible.append(share)
-                continue
-            if normalized_viewer and share.author.lower() == normalized_viewer:
-                visible.append(share)
-                continue
-            if (
-                normalized_viewer
-                and share.visibility == "connections"
-                and normalized_viewer in share.authorized_handles
-            ):
-                visible.append(share)
-        visible.sort(key=lambda item: item.created_at, reverse=True)
-        return visible
-
+    @_writes
     def authorize_share(self, share_id: str, handles: Iterable[str]) -> IdeaShare:
         """Grant additional collaborators access to a share."""
 
@@ -533,61 +2122,24 @@ class KnowledgeGraph:
                 *(handle.strip().lower() for handle in handles if handle and handle.strip()),
             }
         )
-        share.authorized_handles = updated
+        self._before_write()
+        share = replace(share, authorized_handles=updated)
         self._shares[share_id] = share
+        self._publish(records="shares")
         return share
 
-    def affinity_for_viewer(self, viewer: str, limit: int = 5) -> List[IdeaMatch]:
-        """Surface the most relevant shares for a viewer based on overlapping tags."""
-
-        normalized_viewer = viewer.strip().lower()
-        if not normalized_viewer:
-            raise ValueError("Viewer handle required for affinity lookup")
+    @_writes
+    def restore_record(self, record: object) -> None:
+        """Store an exported session, curriculum or share as-is, keeping its id and timestamp."""
 
-        seen_tags: Set[str] = set()
-        for share in self._shares.values():
-            if share.author.lower() == normalized_viewer:
-                seen_tags.update(share.tags)
-
-        if not seen_tags:
-            for share in self._shares.values():
-                if share.visibility == "public":
-                    seen_tags.update(share.tags)
-
-        candidates: List[IdeaMatch] = []
-        for share in self.list_shares(viewer=viewer):
-            if share.author.lower() == normalized_viewer:
-                continue
-            shared_tags = sorted(set(share.tags).intersection(seen_tags))
-            complementary = sorted(set(share.tags) - seen_tags)
-            if not shared_tags and not complementary:
-                continue
-            overlap = len(shared_tags)
-            breadth = len(shared_tags) + len(complementary)
-            affinity = overlap / breadth if breadth else 0.0
-            candidates.append(
-                IdeaMatch(
-                    share=share,
-                    affinity=round(affinity, 3),
-                    shared_tags=shared_tags,
-                    complementary_tags=complementary,
-                )
-            )
-
-        candidates.sort(key=lambda match: (match.affinity, match.share.created_at), reverse=True)
-        return candidates[:limit]
-
-    def compare_handles(self, primary: str, collaborator: str) -> Tuple[List[str], List[str]]:
-        """Highlight shared and complementary interests between two handles."""
-
-        primary_tags: Set[str] = set()
-        collaborator_tags: Set[str] = set()
-
-        for share in self._shares.values():
-            author_handle = share.author.lower()
-            if author_handle == primary.strip().lower():
-                primary_tags.update(share.tags)
-            if author_handle == collaborator.strip().lower():
-                collaborator_tags.update(share.tags)
-
-        return sorted(primary_tags & collaborator_tags), sorted(primary_tags ^ collaborator_tags)
+        if isinstance(record, LearningSession):
+            records, section = self._sessions, "sessions"
+        elif isinstance(record, Curriculum):
+            records, section = self._curricula, "curricula"
+        elif isinstance(record, IdeaShare):
+            records, section = self._shares, "shares"
+        else:
+            raise ValueError("Only sessions, curricula and shares can be restored")
+        self._before_write()
+        records[record.id] = record
+        self._publish(records=section)
@@ -0,0 +1,161 @@
+import asyncio
+from dataclasses import dataclass
+from itertools import chain
+from typing import TYPE_CHECKING, Dict, List
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional; the pure-Python iteration gives the same scores.
+    numpy = None
+
+if TYPE_CHECKING:
+    from app.core.graph import KnowledgeGraph
+
+DAMPING = 0.85
+# Iteration stops once the scores (which sum to 1) move less than this in total.
+TOLERANCE = 1e-6
+MAX_ITERATIONS = 100
+# Seconds without further writes before a workspace's scores are recomputed.
+IMPORTANCE_DELAY = 2.0
+# Concepts whose edges are copied between yields to the event loop.
+COPY_CHUNK = 2_000
+
+
+@dataclass(slots=True)
+class ConceptImportance:
+    """How foundational a concept is: PageRank towards prerequisites and normalised degrees."""
+
+    pagerank: float = 0.0
+    in_centrality: float = 0.0
+    out_centrality: float = 0.0
+
+
+class PageRank:
+    """Power iteration over a frozen copy of a graph's edges, one iteration per ``step()``.
+
+    Rank flows from each concept to its prerequisites, split evenly between
+    them, so concepts that much of the graph builds on score highest.
+    Concepts without prerequisites spread their rank over the whole graph.
+    With NumPy installed each iteration is a vectorised sparse product;
+    otherwise it runs in pure Python over the same index lists.
+    """
+
+    def __init__(
+        self,
+        keys: List[str],
+        successors: List[List[int]],
+        version: int,
+        *,
+        damping: float = DAMPING,
+        tolerance: float = TOLERANCE,
+        max_iterations: int = MAX_ITERATIONS,
+    ) -> None:
+        self.keys = keys
+        self.version = version
+        self.iterations = 0
+        self.converged = not keys
+        self._successors = successors
+        self._damping = damping
+        self._tolerance = tolerance
+        self._max_iterations = max_iterations
+        count = len(keys)
+        in_degrees = [0] * count
+        for targets in successors:
+            for target in targets:
+                in_degrees[target] += 1
+        self._in_degrees = in_degrees
+        self._roots = [index for index, degree in enumerate(in_degrees) if not degree]
+        self._shares = [1.0 / degree if degree else 0.0 for degree in in_degrees]
+        if numpy is not None and count:
+            lengths = numpy.fromiter((len(targets) for targets in successors), dtype=numpy.int64, count=count)
+            self._rows = numpy.repeat(numpy.arange(count), lengths)
+            self._columns = numpy.fromiter(
+                chain.from_iterable(successors), dtype=numpy.int64, count=int(lengths.sum())
+            )
+            self._shares = numpy.asarray(self._shares)
+            self._roots = numpy.asarray(self._roots, dtype=numpy.int64)
+            self._rank = numpy.full(count, 1.0 / count)
+        else:
+            self._rank = [1.0 / count] * count if count else []
+
+    def step(self) -> bool:
+        """Run one iteration; True once the scores have converged or the iteration cap is hit."""
+
+        if self.converged:
+            return True
+        count, damping = len(self.keys), self._damping
+        rank = self._rank
+        if numpy is not None:
+            base = (1.0 - damping + damping * rank[self._roots].sum()) / count
+            spread = (rank * self._shares)[self._columns]
+            new = base + damping * numpy.bincount(self._rows, weights=spread, minlength=count)
+            change = float(numpy.abs(new - rank).sum())
+        else:
+            base = (1.0 - damping + damping * sum(map(rank.__getitem__, self._roots))) / count
+            spread = [score * share for score, share in zip(rank, self._shares)]
+            lookup = spread.__getitem__
+            new = [base + damping * sum(map(lookup, targets)) if targets else base for targets in self._successors]
+            change = sum(abs(after - before) for after, before in zip(new, rank))
+        self._rank = new
+        self.iterations += 1
+        self.converged = change < self._tolerance or self.iterations >= self._max_iterations
+        return self.converged
+
+    def run(self) -> "PageRank":
+        while not self.step():
+            pass
+        return self
+
+    def scores(self) -> Dict[str, ConceptImportance]:
+        """Per-key scores; degrees are normalised by the number of other concepts."""
+
+        scale = 1.0 / max(len(self.keys) - 1, 1)
+        rank = self._rank.tolist() if numpy is not None and self.keys else self._rank
+        return {
+            key: ConceptImportance(score, in_degree * scale, len(targets) * scale)
+            for key, score, in_degree, targets in zip(self.keys, rank, self._in_degrees, self._successors)
+        }
+
+
+class ImportanceScheduler:
+    """Recompute each workspace's importance scores once its writes settle.
+
+    Every ``schedule()`` restarts that workspace's countdown, cancelling a run
+    already in progress, so a burst of writes costs one computation. The run
+    happens on the event loop: the edges are copied a chunk at a time and the
+    iteration yields after every step, so requests keep being served. A write
+    landing mid-copy restarts the countdown, as one during it would.
+    """
+
+    def __init__(self, delay: float = IMPORTANCE_DELAY) -> None:
+        self.delay = delay
+        self._pending: Dict[str, "asyncio.Task[None]"] = {}
+
+    def schedule(self, name: str, graph: "KnowledgeGraph") -> None:
+        task = self._pending.pop(name, None)
+        if task is not None:
+            task.cancel()
+        self._pending[name] = asyncio.get_running_loop().create_task(self._refresh(name, graph))
+
+    def pending(self, name: str) -> bool:
+        return name in self._pending
+
+    async def _refresh(self, name: str, graph: "KnowledgeGraph") -> None:
+        try:
+            job = None
+            while job is None:
+                await asyncio.sleep(self.delay)
+                for job in graph.importance_job_steps():
+                    await asyncio.sleep(0)
+            while not job.step():
+                await asyncio.sleep(0)
+            graph.apply_importance(job)
+        finally:
+            if self._pending.get(name) is asyncio.current_task():
+                del self._pending[name]
+
+    def cancel_all(self) -> None:
+        for task in self._pending.values():
+            task.cancel()
+        self._pending.clear()
+
@@ -0,0 +1,272 @@
+from datetime import datetime
+import json
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.core.graph import Curriculum, IdeaShare, KnowledgeGraph, KnowledgeNode, LearningSession, datetime_to_timestamp
+
+# Parsed records are applied to the graph in batches of this many.
+CHUNK_RECORDS = 20_000
+# A line longer than this is rejected instead of being buffered further.
+MAX_LINE_BYTES = 1 << 20
+# Only this many errors are kept verbatim; the rest are only counted.
+MAX_REPORTED_ERRORS = 100
+
+Edge = Tuple[int, str, str, Optional[float]]
+
+
+@dataclass(slots=True)
+class ImportStats:
+    """Progress counters for an NDJSON import; errors are ``(line, message)`` pairs."""
+
+    lines: int = 0
+    nodes_created: int = 0
+    nodes_updated: int = 0
+    edges_created: int = 0
+    edges_updated: int = 0
+    edges_deferred: int = 0
+    records_restored: int = 0
+    error_count: int = 0
+    errors: List[Tuple[int, str]] = field(default_factory=list)
+    done: bool = False
+
+
+class NDJSONImporter:
+    """Apply a stream of newline-delimited node and edge records to a graph.
+
+    Each line is a JSON object, either
+    ``{"type": "node", "name": ..., "description": ..., "tags": [...]}`` or
+    ``{"type": "edge", "source": ..., "target": ..., "effort": ...}``.
+    Session, curriculum and share records in the layout written by
+    ``GET /export`` are restored with their ids and timestamps, so an export
+    loads back into an equivalent graph.
+    Bytes may be fed in pieces of any size; only the trailing partial line and
+    one chunk of parsed records are held at a time, and each chunk goes
+    through the graph's bulk methods. Edges naming a concept that has not
+    arrived yet are held back and retried once the stream ends, so memory
+    grows only with the number of such forward references.
+    """
+
+    def __init__(
+        self,
+        graph: KnowledgeGraph,
+        chunk_records: int = CHUNK_RECORDS,
+        on_progress: Optional[Callable[[ImportStats], None]] = None,
+    ) -> None:
+        self.graph = graph
+        self.stats = ImportStats()
+        self._chunk_records = chunk_records
+        self._on_progress = on_progress
+        self._buffer = b""
+        self._skipping = False
+        self._nodes: List[Tuple[int, KnowledgeNode]] = []
+        self._edges: List[Edge] = []
+        self._deferred: List[Edge] = []
+
+    def feed(self, data: bytes) -> None:
+        """Consume the next piece of the stream."""
+
+        lines = (self._buffer + data).split(b"\n")
+        self._buffer = lines.pop()
+        for line in lines:
+            self.stats.lines += 1
+            if self._skipping:
+                # Tail of an oversized line that was already reported.
+                self._skipping = False
+                continue
+            self._parse(self.stats.lines, line)
+        if len(self._buffer) > MAX_LINE_BYTES:
+            if not self._skipping:
+                self._error(self.stats.lines + 1, f"Line exceeds {MAX_LINE_BYTES} bytes")
+            self._skipping = True
+            self._buffer = b""
+
+    def finish(self) -> ImportStats:
+        """Flush the last line and chunk, then apply the deferred edges."""
+
+        if self._buffer.strip() or self._skipping:
+            self.stats.lines += 1
+            if not self._skipping:
+                self._parse(self.stats.lines, self._buffer)
+        self._buffer = b""
+        self._skipping = False
+        self._flush()
+        deferred, self._deferred = self._deferred, []
+        for start in range(0, len(deferred), self._chunk_records):
+            self._apply_edges(deferred[start:start + self._chunk_records], final=True)
+        self.stats.errors.sort()
+        self.stats.done = True
+        self._report()
+        return self.stats
+
+    def _parse(self, number: int, line: bytes) -> None:
+        if not line.strip():
+            return
+        try:
+            record = json.loads(line)
+        except ValueError as error:
+            self._error(number, f"Invalid JSON: {error}")
+            return
+        if not isinstance(record, dict):
+            self._error(number, "Record must be a JSON object")
+            return
+        kind = record.get("type")
+        try:
+            if kind == "node":
+                self._nodes.append((number, _node_from_record(record)))
+            elif kind == "edge":
+                self._edges.append((number, *_edge_from_record(record)))
+            elif kind in RECORD_READERS:
+                self.graph.restore_record(RECORD_READERS[kind](record))
+                self.stats.records_restored += 1
+                return
+            else:
+                self._error(number, 'Record type must be "node", "edge", "session", "curriculum" or "share"')
+                return
+        except ValueError as error:
+            self._error(number, str(error))
+            return
+        if len(self._nodes) + len(self._edges) >= self._chunk_records:
+            self._flush()
+
+    def _flush(self) -> None:
+        nodes, self._nodes = self._nodes, []
+        edges, self._edges = self._edges, []
+        if nodes:
+            result = self.graph.add_nodes_bulk([node for _, node in nodes], atomic=False)
+            self.stats.nodes_created += result.created
+            self.stats.nodes_updated += result.updated
+            for index, message in result.errors:
+                self._error(nodes[index][0], message)
+        if edges:
+            self._apply_edges(edges, final=False)
+        if nodes or edges:
+            self._report()
+
+    def _apply_edges(self, edges: List[Edge], final: bool) -> None:
+        graph = self.graph
+        ready: List[Edge] = []
+        for edge in edges:
+            if graph.get_node(edge[1]) is None or graph.get_node(edge[2]) is None:
+                if final:
+                    side, name = ("source", edge[1]) if graph.get_node(edge[1]) is None else ("target", edge[2])
+                    self._error(edge[0], f"Unknown {side} node: {name}")
+                else:
+                    self._deferred.append(edge)
+                    self.stats.edges_deferred += 1
+            else:
+                ready.append(edge)
+        if not ready:
+            return
+        result = graph.add_relationships_bulk([edge[1:] for edge in ready], atomic=False)
+        self.stats.edges_created += result.created
+        self.stats.edges_updated += result.updated
+        for index, message in result.errors:
+            self._error(ready[index][0], message)
+
+    def _error(self, number: int, message: str) -> None:
+        self.stats.error_count += 1
+        if len(self.stats.errors) < MAX_REPORTED_ERRORS:
+            self.stats.errors.append((number, message))
+
+    def _report(self) -> None:
+        if self._on_progress is not None:
+            self._on_progress(self.stats)
+
+
+def _node_from_record(record: dict) -> KnowledgeNode:
+    name = record.get("name")
+    description = record.get("description") or ""
+    tags = record.get("tags") or []
+    if not isinstance(name, str) or not name.strip():
+        raise ValueError("Node name must be a non-empty string")
+    if not isinstance(description, str):
+        raise ValueError("Node description must be a string")
+    if not isinstance(tags, list) or not all(isinstance(tag, str) for tag in tags):
+        raise ValueError("Node tags must be a list of strings")
+    return KnowledgeNode(
+        name=name.strip(),
+        description=description.strip(),
+        tags=sorted(set(tag.strip().lower() for tag in tags if tag.strip())),
+    )
+
+
+def _edge_from_record(record: dict) -> Tuple[str, str, Optional[float]]:
+    source, target, effort = record.get("source"), record.get("target"), record.get("effort")
+    if not isinstance(source, str) or not isinstance(target, str):
+        raise ValueError("Edge source and target must be strings")
+    if effort is not None and (isinstance(effort, bool) or not isinstance(effort, (int, float))):
+        raise ValueError("Edge effort must be a number")
+    return source, target, None if effort is None else float(effort)
+
+
+def _text(record: dict, key: str, required: bool = True) -> Optional[str]:
+    value = record.get(key)
+    if value is None and not required:
+        return None
+    if not isinstance(value, str) or (required and not value.strip()):
+        raise ValueError(f"Field {key} must be a non-empty string")
+    return value
+
+
+def _strings(record: dict, key: str) -> List[str]:
+    value = record.get(key) or []
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise ValueError(f"Field {key} must be a list of strings")
+    return value
+
+
+def _timestamp(record: dict, key: str) -> int:
+    try:
+        return datetime_to_timestamp(datetime.fromisoformat(_text(record, key)))
+    except ValueError as error:
+        raise ValueError(f"Field {key} must be an ISO 8601 datetime") from error
+
+
+def _session_from_record(record: dict) -> LearningSession:
+    return LearningSession(
+        id=_text(record, "id"),
+        name=_text(record, "name"),
+        description=_text(record, "description", required=False) or "",
+        focus_tags=tuple(_strings(record, "focus_tags")),
+        linked_concepts=_strings(record, "linked_concepts"),
+        status=_text(record, "status", required=False) or "active",
+        current_focus=_text(record, "current_focus", required=False),
+        created_at=_timestamp(record, "created_at"),
+    )
+
+
+def _curriculum_from_record(record: dict) -> Curriculum:
+    return Curriculum(
+        id=_text(record, "id"),
+        title=_text(record, "title"),
+        description=_text(record, "description", required=False) or "",
+        tags=tuple(_strings(record, "tags")),
+        source_url=_text(record, "source_url", required=False) or None,
+        linked_concepts=_strings(record, "linked_concepts"),
+        uploaded_at=_timestamp(record, "uploaded_at"),
+    )
+
+
+def _share_from_record(record: dict) -> IdeaShare:
+    visibility = _text(record, "visibility", required=False) or "public"
+    if visibility not in {"public", "connections", "private"}:
+        raise ValueError("Visibility must be public, connections, or private")
+    return IdeaShare(
+        id=_text(record, "id"),
+        author=_text(record, "author"),
+        title=_text(record, "title"),
+        summary=_text(record, "summary"),
+        tags=tuple(_strings(record, "tags")),
+        linked_concepts=_strings(record, "linked_concepts"),
+        visibility=visibility,
+        authorized_handles=_strings(record, "authorized_handles"),
+        created_at=_timestamp(record, "created_at"),
+    )
+
+
+RECORD_READERS: Dict[str, Callable[[dict], object]] = {
+    "session": _session_from_record,
+    "curriculum": _curriculum_from_record,
+    "share": _share_from_record,
+}
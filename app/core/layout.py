@@ -0,0 +1,172 @@
+from bisect import bisect_left, insort
+from dataclasses import dataclass, field
+from heapq import heappop, heappush
+import math
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set
+
+from app.core.storage import Adjacency
+
+# Radius of the innermost ring and the gap between rings, matching the
+# constants the explorer UI used for its own layout.
+BASE_RADIUS = 120.0
+RING_STEP = 40.0
+
+
+@dataclass(slots=True)
+class NodePlacement:
+    """Where to draw one concept: its ring, polar position and cartesian point."""
+
+    name: str
+    level: int
+    radius: float
+    angle: float
+    x: float
+    y: float
+
+
+@dataclass(slots=True)
+class GraphLayout:
+    """Radial layout of a whole graph as of ``version``, innermost ring first."""
+
+    version: int
+    rings: int
+    base_radius: float = BASE_RADIUS
+    ring_step: float = RING_STEP
+    nodes: List[NodePlacement] = field(default_factory=list)
+
+
+class RadialLayout:
+    """Concentric-ring layout where each node's ring is its depth level.
+
+    Nodes on one ring are spread evenly by key. The layout is built on first
+    use from ``levels()``. After that, when ``position`` gives a topological
+    position, edits are applied incrementally: ``relevel`` recomputes the
+    level of each touched node from its predecessors, then of any successor
+    whose level changed, walking them in topological order so each is visited
+    once. Only rings whose membership changed get new coordinates. Without
+    ``position`` (a graph that allows cycles) every edit just drops the layout
+    so it is rebuilt on the next read.
+    """
+
+    def __init__(
+        self,
+        adjacency: Adjacency,
+        levels: Callable[[], Dict[str, int]],
+        name: Callable[[str], str],
+        position: Optional[Callable[[str], int]] = None,
+    ) -> None:
+        self._adjacency = adjacency
+        self._levels_source = levels
+        self._name = name
+        self._position = position
+        self._level: Optional[Dict[str, int]] = None
+        # Keys on each ring, sorted.
+        self._rings: Dict[int, List[str]] = {}
+        self._placements: Dict[int, List[NodePlacement]] = {}
+        self._dirty: Set[int] = set()
+
+    def placements(self) -> Iterator[NodePlacement]:
+        """Yield every node's placement, innermost ring first."""
+
+        if self._level is None:
+            self._build()
+        for level in self._dirty:
+            ring = self._rings.get(level)
+            if ring:
+                self._placements[level] = _place_ring(level, ring, self._name)
+            else:
+                self._placements.pop(level, None)
+        self._dirty.clear()
+        for level in sorted(self._placements):
+            yield from self._placements[level]
+
+    def ring_count(self) -> int:
+        if self._level is None:
+            self._build()
+        return len(self._rings)
+
+    def node_added(self, key: str) -> None:
+        if self._level is None:
+            return
+        self._level[key] = 0
+        self._enter(key, 0)
+
+    def node_removed(self, key: str, successors: Iterable[str]) -> None:
+        if self._level is None:
+            return
+        if self._position is None:
+            self.invalidate()
+            return
+        self._leave(key, self._level.pop(key))
+        self.relevel(successors)
+
+    def relevel(self, keys: Iterable[str]) -> None:
+        """Bring levels up to date after edges into ``keys`` were added or removed."""
+
+        if self._level is None:
+            return
+        if self._position is None:
+            self.invalidate()
+            return
+        level, position = self._level, self._position
+        adjacency = self._adjacency
+        heap = [(position(key), key) for key in set(keys)]
+        heap.sort()
+        queued = {key for _, key in heap}
+        while heap:
+            _, key = heappop(heap)
+            queued.discard(key)
+            predecessors = adjacency.predecessors(key)
+            new = 1 + max(level[parent] for parent in predecessors) if predecessors else 0
+            old = level[key]
+            if new == old:
+                continue
+            level[key] = new
+            self._leave(key, old)
+            self._enter(key, new)
+            for child in adjacency.successors(key):
+                if child not in queued:
+                    queued.add(child)
+                    heappush(heap, (position(child), child))
+
+    def invalidate(self) -> None:
+        self._level = None
+        self._rings.clear()
+        self._placements.clear()
+        self._dirty.clear()
+
+    def _build(self) -> None:
+        self._level = dict(self._levels_source())
+        rings: Dict[int, List[str]] = {}
+        for key, level in self._level.items():
+            rings.setdefault(level, []).append(key)
+        for ring in rings.values():
+            ring.sort()
+        self._rings = rings
+        self._placements.clear()
+        self._dirty = set(rings)
+
+    def _enter(self, key: str, level: int) -> None:
+        insort(self._rings.setdefault(level, []), key)
+        self._dirty.add(level)
+
+    def _leave(self, key: str, level: int) -> None:
+        ring = self._rings[level]
+        del ring[bisect_left(ring, key)]
+        if not ring:
+            del self._rings[level]
+        self._dirty.add(level)
+
+
+def _place_ring(level: int, ring: List[str], name: Callable[[str], str]) -> List[NodePlacement]:
+    radius = BASE_RADIUS + level * RING_STEP
+    step = 2 * math.pi / len(ring)
+    # Offset alternate rings by half a slot so spokes do not line up.
+    offset = step / 2 if level % 2 else 0.0
+    placements: List[NodePlacement] = []
+    for index, key in enumerate(ring):
+        angle = offset + index * step
+        placements.append(
+            NodePlacement(name(key), level, radius, angle, radius * math.cos(angle), radius * math.sin(angle))
+        )
+    return placements
@@ -0,0 +1,141 @@
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
+
+@dataclass(slots=True)
+class LockStats:
+    """Acquisition counts and seconds spent waiting, per lock mode."""
+
+    reads: int = 0
+    writes: int = 0
+    read_wait: float = 0.0
+    write_wait: float = 0.0
+    max_read_wait: float = 0.0
+    max_write_wait: float = 0.0
+
+
+class ReadWriteLock:
+    """Phase-fair reader–writer lock.
+
+    Any number of readers may hold the lock together, a writer holds it alone.
+    Readers that arrive while a writer is waiting queue behind it, and all
+    readers queued behind a writer are admitted as soon as it releases, ahead
+    of the next writer, so neither side can starve the other.
+
+    The lock is reentrant per thread because graph methods call one another:
+    the writing thread may nest reads and writes, and a reading thread may
+    nest reads. Upgrading a read to a write would deadlock and is refused.
+    """
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer: Optional[int] = None
+        self._writer_depth = 0
+        self._waiting_writers = 0
+        # Bumped whenever a writer releases; readers wait for it to move on.
+        self._phase = 0
+        # Blocked readers by the phase they arrived in. Once the phase moves
+        # on they are admitted, and writers wait until they have got in.
+        self._blocked_readers: Dict[int, int] = {}
+        self._held = threading.local()
+        self._stats = LockStats()
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+    def acquire_read(self) -> None:
+        held = self._holds()
+        if self._writer == threading.get_ident() or held:
+            # Already inside this thread's own read or write.
+            held.append(False)
+            return
+        with self._condition:
+            phase = self._phase
+            start = time.perf_counter()
+            if self._writer is not None or self._waiting_writers:
+                blocked = self._blocked_readers
+                blocked[phase] = blocked.get(phase, 0) + 1
+                while self._writer is not None or (self._waiting_writers and self._phase == phase):
+                    self._condition.wait()
+                blocked[phase] -= 1
+                if not blocked[phase]:
+                    del blocked[phase]
+                    # The last reader admitted from that phase may be all a writer waits for.
+                    self._condition.notify_all()
+            self._readers += 1
+            waited = time.perf_counter() - start
+            self._stats.reads += 1
+            self._stats.read_wait += waited
+            self._stats.max_read_wait = max(self._stats.max_read_wait, waited)
+        held.append(True)
+
+    def release_read(self) -> None:
+        if not self._holds().pop():
+            return
+        with self._condition:
+            self._readers -= 1
+            if not self._readers:
+                self._condition.notify_all()
+
+    def acquire_write(self) -> None:
+        me = threading.get_ident()
+        if self._writer == me:
+            self._writer_depth += 1
+            return
+        if self._holds():
+            raise RuntimeError("Cannot upgrade a read lock to a write lock")
+        with self._condition:
+            start = time.perf_counter()
+            self._waiting_writers += 1
+            while self._writer is not None or self._readers or self._admitted_readers():
+                self._condition.wait()
+            self._waiting_writers -= 1
+            self._writer = me
+            self._writer_depth = 1
+            waited = time.perf_counter() - start
+            self._stats.writes += 1
+            self._stats.write_wait += waited
+            self._stats.max_write_wait = max(self._stats.max_write_wait, waited)
+
+    def release_write(self) -> None:
+        if self._writer != threading.get_ident():
+            raise RuntimeError("Write lock released by a thread that does not hold it")
+        self._writer_depth -= 1
+        if self._writer_depth:
+            return
+        with self._condition:
+            self._writer = None
+            self._phase += 1
+            self._condition.notify_all()
+
+    def stats(self) -> LockStats:
+        with self._condition:
+            return replace(self._stats)
+
+    def _admitted_readers(self) -> bool:
+        # Readers from an earlier phase have been let in and must not be overtaken.
+        return any(phase != self._phase for phase in self._blocked_readers)
+
+    def _holds(self) -> List[bool]:
+        # Per-thread stack of read acquisitions; False marks a nested no-op.
+        held = getattr(self._held, "stack", None)
+        if held is None:
+            held = self._held.stack = []
+        return held
@@ -0,0 +1,94 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.core.storage import Adjacency
+
+
+class IncrementalTopologicalOrder:
+    """Pearce–Kelly dynamic topological order over an adjacency engine.
+
+    Every node holds a distinct integer position such that each edge points
+    from a lower to a higher position. Inserting an edge that already agrees
+    with the order costs O(1); otherwise only the nodes whose positions lie
+    between the two endpoints are searched and shuffled, so the work is bounded
+    by the affected region rather than the whole graph.
+    """
+
+    def __init__(self, adjacency: Adjacency) -> None:
+        self._adjacency = adjacency
+        self._position: Dict[str, int] = {}
+        self._next_position = 0
+
+    def add_node(self, key: str) -> None:
+        if key not in self._position:
+            self._position[key] = self._next_position
+            self._next_position += 1
+
+    def remove_node(self, key: str) -> None:
+        self._position.pop(key, None)
+
+    def reset(self, order: Iterable[str]) -> None:
+        """Replace every position with a freshly computed topological order."""
+
+        self._position = {key: position for position, key in enumerate(order)}
+        self._next_position = len(self._position)
+
+    def position(self, key: str) -> int:
+        return self._position[key]
+
+    def agrees(self, edges: Iterable[Tuple[str, str]]) -> bool:
+        """Whether every ``(source, target)`` already runs from a lower to a higher position."""
+
+        position = self._position
+        return all(position[source] < position[target] for source, target in edges)
+
+    def sort(self, keys: Iterable[str]) -> List[str]:
+        return sorted(keys, key=self._position.__getitem__)
+
+    def insert_edge(self, source: str, target: str) -> Optional[List[str]]:
+        """Make room for ``source -> target`` before it is stored.
+
+        Returns ``None`` when the edge is acceptable (the order is updated in
+        place) or the offending cycle as ``[source, target, ..., source]``.
+        """
+
+        if source == target:
+            return [source, source]
+        position = self._position
+        lower, upper = position[target], position[source]
+        if upper < lower:
+            return None
+
+        # Forward search from the target, limited to positions below the source.
+        forward: Dict[str, Optional[str]] = {target: None}
+        stack = [target]
+        while stack:
+            current = stack.pop()
+            for child in self._adjacency.successors(current):
+                if child == source:
+                    path = [current]
+                    while forward[path[-1]] is not None:
+                        path.append(forward[path[-1]])
+                    path.reverse()
+                    return [source] + path + [source]
+                if child not in forward and position[child] < upper:
+                    forward[child] = current
+                    stack.append(child)
+
+        # Backward search from the source, limited to positions above the target.
+        backward = {source}
+        stack = [source]
+        while stack:
+            current = stack.pop()
+            for parent in self._adjacency.predecessors(current):
+                if parent not in backward and position[parent] > lower:
+                    backward.add(parent)
+                    stack.append(parent)
+
+        # Reassign the pooled positions: everything that must precede the new
+        # edge keeps its relative order and moves ahead of the forward region.
+        ahead = sorted(backward, key=position.__getitem__)
+        behind = sorted(forward, key=position.__getitem__)
+        pool = sorted(position[key] for key in ahead + behind)
+        for key, slot in zip(ahead + behind, pool):
+            position[key] = slot
+        return None
@@ -0,0 +1,233 @@
+from array import array
+import random
+from typing import Callable, Dict, Hashable, Iterable, List, Optional
+
+from app.core.storage import Adjacency
+
+
+class ReachabilityIndex:
+    """Static reachability labels over a DAG snapshot.
+
+    Each node gets a topological rank, its longest-path depth and height, a
+    DFS tree interval and ``TRAVERSALS`` GRAIL-style interval labels (from DFS
+    passes with different child orders). Most queries are settled in O(1): a
+    lower rank, a depth/height that does not strictly increase/decrease, or a
+    non-nested label rules reachability out, and a nested tree interval proves
+    it. Only the remaining cases fall back to a DFS pruned by the same tests.
+    """
+
+    TRAVERSALS = 3
+
+    def __init__(
+        self,
+        ids: Dict[Hashable, int],
+        offsets: array,
+        targets: array,
+        rank: array,
+        depth: array,
+        height: array,
+        pre: array,
+        labels: List[array],
+    ) -> None:
+        self._ids = ids
+        self._offsets = offsets
+        self._targets = targets
+        self._rank = rank
+        self._depth = depth
+        self._height = height
+        self._pre = pre
+        # labels[2 * t] holds the low bound, labels[2 * t + 1] the post-order number.
+        self._labels = labels
+
+    @classmethod
+    def build(
+        cls,
+        successors: Callable[[Hashable], Iterable[Hashable]],
+        keys: Iterable[Hashable],
+    ) -> Optional["ReachabilityIndex"]:
+        """Index the graph given by ``successors``, or return ``None`` if it contains a cycle.
+
+        Keys are usually concept keys; the condensation of a cyclic graph is
+        indexed by component number instead.
+        """
+
+        ordered_keys = list(keys)
+        ids = {key: node_id for node_id, key in enumerate(ordered_keys)}
+        size = len(ordered_keys)
+        offsets = array("l", [0]) * (size + 1)
+        targets = array("i")
+        for node_id, key in enumerate(ordered_keys):
+            targets.extend(ids[child] for child in successors(key))
+            offsets[node_id + 1] = len(targets)
+
+        # Kahn's algorithm gives the topological ranks and detects cycles.
+        indegree = array("i", [0]) * size
+        for child in targets:
+            indegree[child] += 1
+        roots = [node_id for node_id in range(size) if indegree[node_id] == 0]
+        order = list(roots)
+        remaining = array("i", indegree)
+        for node_id in order:
+            for index in range(offsets[node_id], offsets[node_id + 1]):
+                child = targets[index]
+                remaining[child] -= 1
+                if remaining[child] == 0:
+                    order.append(child)
+        if len(order) < size:
+            return None
+        rank = array("i", [0]) * size
+        depth = array("i", [0]) * size
+        for position, node_id in enumerate(order):
+            rank[node_id] = position
+            next_depth = depth[node_id] + 1
+            for index in range(offsets[node_id], offsets[node_id + 1]):
+                child = targets[index]
+                if depth[child] < next_depth:
+                    depth[child] = next_depth
+        height = array("i", [0]) * size
+        for node_id in reversed(order):
+            for index in range(offsets[node_id], offsets[node_id + 1]):
+                child_height = height[targets[index]] + 1
+                if height[node_id] < child_height:
+                    height[node_id] = child_height
+
+        pre = array("i", [0]) * size
+        labels: List[array] = []
+        for traversal in range(cls.TRAVERSALS):
+            post = cls._post_order(offsets, targets, roots, traversal, pre if traversal == 0 else None)
+            low = array("i", post)
+            for node_id in reversed(order):
+                for index in range(offsets[node_id], offsets[node_id + 1]):
+                    child_low = low[targets[index]]
+                    if child_low < low[node_id]:
+                        low[node_id] = child_low
+            labels.extend((low, post))
+        return cls(ids, offsets, targets, rank, depth, height, pre, labels)
+
+    @staticmethod
+    def _post_order(
+        offsets: array,
+        targets: array,
+        roots: List[int],
+        traversal: int,
+        pre: Optional[array],
+    ) -> array:
+        """Iterative DFS post-order numbering.
+
+        Pass 0 walks roots and children in stored order; later passes shuffle the
+        roots and start each child scan at a pass-dependent rotation so that
+        every pass contributes a different interval label.
+        """
+
+        size = len(offsets) - 1
+        post = array("i", [-1]) * size
+        visited = bytearray(size)
+        counter = 0
+        entered = 0
+        if traversal:
+            roots = list(roots)
+            random.Random(traversal).shuffle(roots)
+        salt = traversal * 40503
+        for root in roots:
+            if visited[root]:
+                continue
+            visited[root] = 1
+            if pre is not None:
+                pre[root] = entered
+            entered += 1
+            # Each frame is [node, children visited so far, rotation].
+            stack = [[root, 0, (root * 2654435761 + salt) if traversal else 0]]
+            while stack:
+                frame = stack[-1]
+                node_id, step, rotation = frame
+                low = offsets[node_id]
+                degree = offsets[node_id + 1] - low
+                if step < degree:
+                    frame[1] = step + 1
+                    child = targets[low + (rotation + step) % degree]
+                    if not visited[child]:
+                        visited[child] = 1
+                        if pre is not None:
+                            pre[child] = entered
+                        entered += 1
+                        stack.append([child, 0, (child * 2654435761 + salt) if traversal else 0])
+                else:
+                    post[node_id] = counter
+                    counter += 1
+                    stack.pop()
+        return post
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._ids
+
+    def reaches(self, source: Hashable, target: Hashable) -> bool:
+        source_id, target_id = self._ids[source], self._ids[target]
+        if source_id == target_id:
+            return False
+        if self._excluded(source_id, target_id):
+            return False
+        if self._tree_ancestor(source_id, target_id):
+            return True
+
+        offsets, targets = self._offsets, self._targets
+        seen = {source_id}
+        stack = [source_id]
+        while stack:
+            node_id = stack.pop()
+            for index in range(offsets[node_id], offsets[node_id + 1]):
+                child = targets[index]
+                if child == target_id:
+                    return True
+                if child in seen or self._excluded(child, target_id):
+                    continue
+                if self._tree_ancestor(child, target_id):
+                    return True
+                seen.add(child)
+                stack.append(child)
+        return False
+
+    def _tree_ancestor(self, source_id: int, target_id: int) -> bool:
+        post = self._labels[1]
+        return self._pre[source_id] < self._pre[target_id] and post[target_id] < post[source_id]
+
+    def _excluded(self, source_id: int, target_id: int) -> bool:
+        if self._rank[source_id] >= self._rank[target_id]:
+            return True
+        if self._depth[source_id] >= self._depth[target_id]:
+            return True
+        if self._height[source_id] <= self._height[target_id]:
+            return True
+        labels = self._labels
+        for index in range(0, len(labels), 2):
+            low, post = labels[index], labels[index + 1]
+            if low[target_id] < low[source_id] or post[target_id] > post[source_id]:
+                return True
+        return False
+
+
+def reaches_by_search(
+    adjacency: Adjacency,
+    source: str,
+    target: str,
+    position: Optional[Callable[[str], int]] = None,
+) -> bool:
+    """DFS fallback, pruned by a topological position when one is available."""
+
+    if source == target and position is not None:
+        # With a valid topological order there are no cycles to close.
+        return False
+    limit = position(target) if position is not None else None
+    seen = {source}
+    stack = [source]
+    while stack:
+        current = stack.pop()
+        for child in adjacency.successors(current):
+            if child == target:
+                return True
+            if child in seen:
+                continue
+            if limit is not None and position(child) > limit:
+                continue
+            seen.add(child)
+            stack.append(child)
+    return False
@@ -0,0 +1,187 @@
+from bisect import bisect_left, insort
+from collections import Counter
+from heapq import heapify, heappop, heappush, heapreplace, nlargest
+import math
+from operator import itemgetter
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+TOKEN_PATTERN = re.compile(r"\w+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from how in into is it its of on or such that the their this to with".split()
+)
+# Posting lists at most this long are scored exhaustively instead of in impact order.
+EXHAUSTIVE_POSTINGS = 4096
+# Occurrences in the name count three times, in tags twice, in the description once.
+FIELD_WEIGHTS = (3, 2, 1)
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+class TextIndex:
+    """Incremental BM25 inverted index over concept text.
+
+    Each term keeps a dict ``{key: weighted frequency}`` for random access and
+    impact-ordered runs: one list per frequency, sorted by document length, so
+    every run is already in descending BM25 order for any corpus statistics.
+    Short lists are scored exhaustively; long ones are merged lazily and
+    abandoned as soon as the k-th best score beats the most any unseen
+    document could still reach (Fagin's threshold algorithm), so a common
+    term costs O(k log runs) rather than a full scan.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75) -> None:
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._runs: Dict[str, Dict[int, List[Tuple[int, str]]]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._terms: Dict[str, Tuple[str, ...]] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def posting_count(self) -> int:
+        return sum(len(posting) for posting in self._postings.values())
+
+    def add(self, key: str, name: str, description: str = "", tags: Iterable[str] = ()) -> None:
+        """Index (or re-index) a document under ``key``."""
+
+        self.add_many([(key, name, description, tags)])
+
+    def add_many(self, documents: Iterable[Tuple[str, str, str, Iterable[str]]]) -> None:
+        """Index ``(key, name, description, tags)`` documents in one batch.
+
+        Runs touched by the batch are extended and re-sorted once each instead
+        of taking one ``insort`` per posting.
+        """
+
+        touched: Dict[Tuple[str, int], List[Tuple[int, str]]] = {}
+        for key, name, description, tags in documents:
+            if key in self._lengths:
+                self.remove(key)
+            counts: Counter = Counter()
+            for text, weight in zip((name, " ".join(tags), description), FIELD_WEIGHTS):
+                for token in tokenize(text):
+                    counts[token] += weight
+            length = sum(counts.values())
+            for term, frequency in counts.items():
+                self._postings.setdefault(term, {})[key] = frequency
+                touched.setdefault((term, frequency), []).append((length, key))
+            self._lengths[key] = length
+            self._terms[key] = tuple(counts)
+            self._total_length += length
+        for (term, frequency), entries in touched.items():
+            run = self._runs.setdefault(term, {}).setdefault(frequency, [])
+            if len(entries) == 1:
+                insort(run, entries[0])
+            else:
+                run.extend(entries)
+                run.sort()
+
+    def remove(self, key: str) -> None:
+        if key not in self._lengths:
+            return
+        length = self._lengths.pop(key)
+        for term in self._terms.pop(key):
+            posting = self._postings[term]
+            frequency = posting.pop(key)
+            runs = self._runs[term]
+            run = runs[frequency]
+            del run[bisect_left(run, (length, key))]
+            if not run:
+                del runs[frequency]
+            if not posting:
+                del self._postings[term]
+                del self._runs[term]
+        self._total_length -= length
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[str, float]]:
+        """Return up to ``limit`` ``(key, score)`` pairs, best first."""
+
+        postings = self._postings
+        terms = sorted({token for token in tokenize(query) if token in postings})
+        if not terms or limit <= 0:
+            return []
+        size = len(self._lengths)
+        k1, b = self.k1, self.b
+        base = k1 * (1 - b)
+        slope = k1 * b * size / self._total_length
+        lengths = self._lengths
+        gains = {
+            term: (k1 + 1) * math.log(1 + (size - len(postings[term]) + 0.5) / (len(postings[term]) + 0.5))
+            for term in terms
+        }
+        short = [term for term in terms if len(postings[term]) <= EXHAUSTIVE_POSTINGS]
+        long = [term for term in terms if len(postings[term]) > EXHAUSTIVE_POSTINGS]
+
+        # Short lists are cheaper to score outright than to walk in impact order.
+        scores: Dict[str, float] = {}
+        for term in short:
+            gain = gains[term]
+            get = scores.get
+            for key, frequency in postings[term].items():
+                scores[key] = get(key, 0.0) + gain * frequency / (frequency + base + slope * lengths[key])
+        for term in long:
+            gain, posting = gains[term], postings[term]
+            for key in scores:
+                frequency = posting.get(key)
+                if frequency:
+                    scores[key] += gain * frequency / (frequency + base + slope * lengths[key])
+        top = [(score, key) for key, score in nlargest(limit, scores.items(), key=itemgetter(1))]
+        heapify(top)
+
+        # Every remaining candidate only occurs in long lists, so the threshold
+        # algorithm can stop once the k-th score beats what they could add.
+        streams: List[Optional[Iterator[Tuple[float, str]]]] = [self._impacts(term, base, slope) for term in long]
+        bounds = [gains[term] for term in long]
+        seen = set(scores)
+        while any(stream is not None for stream in streams):
+            if len(top) >= limit and top[0][0] >= sum(bounds):
+                break
+            for index, stream in enumerate(streams):
+                if stream is None:
+                    continue
+                entry = next(stream, None)
+                if entry is None:
+                    streams[index] = None
+                    bounds[index] = 0.0
+                    continue
+                impact, key = entry
+                bounds[index] = gains[long[index]] * impact
+                if key in seen:
+                    continue
+                seen.add(key)
+                length = lengths[key]
+                score = 0.0
+                for term in long:
+                    frequency = postings[term].get(key)
+                    if frequency:
+                        score += gains[term] * frequency / (frequency + base + slope * length)
+                if len(top) < limit:
+                    heappush(top, (score, key))
+                elif score > top[0][0]:
+                    heapreplace(top, (score, key))
+        return [(key, score) for score, key in sorted(top, key=lambda item: (-item[0], item[1]))]
+
+    def _impacts(self, term: str, base: float, slope: float) -> Iterator[Tuple[float, str]]:
+        """Yield ``(tf / (tf + norm), key)`` for ``term`` in descending order."""
+
+        runs = list(self._runs[term].items())
+        heap = []
+        for run_index, (frequency, run) in enumerate(runs):
+            length, _ = run[0]
+            heap.append((-frequency / (frequency + base + slope * length), run_index, 0))
+        heapify(heap)
+        while heap:
+            negative, run_index, position = heappop(heap)
+            frequency, run = runs[run_index]
+            yield -negative, run[position][1]
+            position += 1
+            if position < len(run):
+                length = run[position][0]
+                heappush(heap, (-frequency / (frequency + base + slope * length), run_index, position))
+
@@ -0,0 +1,95 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.core.storage import Adjacency
+
+
+@dataclass(slots=True)
+class GraphStats:
+    """Shape of a graph: sizes, degree histograms (degree -> node count) and tag use."""
+
+    nodes: int = 0
+    edges: int = 0
+    roots: int = 0
+    leaves: int = 0
+    isolated: int = 0
+    in_degrees: Dict[int, int] = field(default_factory=dict)
+    out_degrees: Dict[int, int] = field(default_factory=dict)
+    tags: Dict[str, int] = field(default_factory=dict)
+
+
+def _drop(histogram: Dict[int, int], degree: int) -> None:
+    count = histogram[degree] - 1
+    if count:
+        histogram[degree] = count
+    else:
+        del histogram[degree]
+
+
+def _shift(histogram: Dict[int, int], old: int, new: int) -> None:
+    _drop(histogram, old)
+    histogram[new] = histogram.get(new, 0) + 1
+
+
+class DegreeCounter:
+    """In/out-degree histograms and the isolated-node count, kept up to date per change.
+
+    The graph reports each committed change after applying it to the
+    adjacency engine; degrees are then read back from the engine, so only
+    the nodes an edit touched are looked at. Roots and leaves are the
+    histogram buckets for degree zero.
+    """
+
+    def __init__(self, adjacency: Adjacency) -> None:
+        self._adjacency = adjacency
+        self.in_degrees: Dict[int, int] = {}
+        self.out_degrees: Dict[int, int] = {}
+        self.isolated = 0
+
+    def nodes_added(self, count: int) -> None:
+        if count:
+            self.in_degrees[0] = self.in_degrees.get(0, 0) + count
+            self.out_degrees[0] = self.out_degrees.get(0, 0) + count
+            self.isolated += count
+
+    def edges_changed(
+        self,
+        edges: Iterable[Tuple[str, str]],
+        removed: bool = False,
+        skip: Optional[str] = None,
+    ) -> None:
+        """Account for edges just created (or removed); ``skip`` names a node already gone."""
+
+        edges = list(edges)
+        added_in = Counter(target for _, target in edges)
+        added_out = Counter(source for source, _ in edges)
+        step = -1 if removed else 1
+        in_degree, out_degree = self._adjacency.in_degree, self._adjacency.out_degree
+        in_degrees, out_degrees = self.in_degrees, self.out_degrees
+        isolated = 0
+        for key in added_in.keys() | added_out.keys():
+            if key == skip:
+                continue
+            in_now, out_now = in_degree(key), out_degree(key)
+            in_before, out_before = in_now - step * added_in.get(key, 0), out_now - step * added_out.get(key, 0)
+            if in_before != in_now:
+                _shift(in_degrees, in_before, in_now)
+            if out_before != out_now:
+                _shift(out_degrees, out_before, out_now)
+            isolated += (in_now == 0 and out_now == 0) - (in_before == 0 and out_before == 0)
+        self.isolated += isolated
+
+    def node_removed(self, key: str, predecessors: List[str], successors: List[str]) -> None:
+        """Account for ``key`` having been removed together with all of its edges."""
+
+        _drop(self.in_degrees, len(predecessors))
+        _drop(self.out_degrees, len(successors))
+        if not predecessors and not successors:
+            self.isolated -= 1
+        self.edges_changed(
+            [(predecessor, key) for predecessor in predecessors if predecessor != key]
+            + [(key, successor) for successor in successors if successor != key],
+            removed=True,
+            skip=key,
+        )
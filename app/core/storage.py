@@ -0,0 +1,516 @@
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, Optional, Protocol, Set, Tuple
+
+DEFAULT_WEIGHT = 1.0
+
+
+class Adjacency(Protocol):
+    """Storage engine holding the forward and reverse edges of a graph."""
+
+    def add_node(self, key: str) -> None: ...
+
+    def remove_node(self, key: str) -> Tuple[List[str], List[str]]: ...
+
+    def add_edge(self, source: str, target: str, weight: Optional[float] = None) -> bool: ...
+
+    def add_edges(self, edges: Iterable[Tuple[str, str, Optional[float]]]) -> List[bool]: ...
+
+    def remove_edge(self, source: str, target: str) -> bool: ...
+
+    def has_edge(self, source: str, target: str) -> bool: ...
+
+    def weight(self, source: str, target: str) -> Optional[float]: ...
+
+    def weighted_successors(self, key: str) -> List[Tuple[str, float]]: ...
+
+    def successors(self, key: str) -> List[str]: ...
+
+    def predecessors(self, key: str) -> List[str]: ...
+
+    def out_degree(self, key: str) -> int: ...
+
+    def in_degree(self, key: str) -> int: ...
+
+    def edges(self) -> Iterator[Tuple[str, str]]: ...
+
+    def edge_count(self) -> int: ...
+
+
+class SetAdjacency:
+    """Default engine: dicts of Python sets keyed by lower-cased node names."""
+
+    def __init__(self) -> None:
+        self._edges: Dict[str, Set[str]] = {}
+        self._reverse_edges: Dict[str, Set[str]] = {}
+        # Only edges whose weight differs from DEFAULT_WEIGHT are recorded.
+        self._weights: Dict[Tuple[str, str], float] = {}
+        self._edge_count = 0
+
+    def add_node(self, key: str) -> None:
+        self._edges.setdefault(key, set())
+        self._reverse_edges.setdefault(key, set())
+
+    def remove_node(self, key: str) -> Tuple[List[str], List[str]]:
+        predecessors = list(self._reverse_edges.get(key, ()))
+        successors = list(self._edges.get(key, ()))
+        for predecessor in predecessors:
+            self._edges[predecessor].discard(key)
+            self._weights.pop((predecessor, key), None)
+        for successor in successors:
+            self._reverse_edges[successor].discard(key)
+            self._weights.pop((key, successor), None)
+        self._edges.pop(key, None)
+        self._reverse_edges.pop(key, None)
+        self._edge_count -= len(predecessors) + len(successors)
+        if key in predecessors:
+            # A self-loop was counted once from each side.
+            self._edge_count += 1
+        return predecessors, successors
+
+    def add_edge(self, source: str, target: str, weight: Optional[float] = None) -> bool:
+        targets = self._edges.setdefault(source, set())
+        created = target not in targets
+        if created:
+            targets.add(target)
+            self._reverse_edges.setdefault(target, set()).add(source)
+            self._edge_count += 1
+        if weight is not None and weight != DEFAULT_WEIGHT:
+            self._weights[(source, target)] = weight
+        elif weight is not None:
+            self._weights.pop((source, target), None)
+        return created
+
+    def add_edges(self, edges: Iterable[Tuple[str, str, Optional[float]]]) -> List[bool]:
+        return [self.add_edge(source, target, weight) for source, target, weight in edges]
+
+    def remove_edge(self, source: str, target: str) -> bool:
+        targets = self._edges.get(source)
+        if not targets or target not in targets:
+            return False
+        targets.remove(target)
+        self._reverse_edges[target].discard(source)
+        self._weights.pop((source, target), None)
+        self._edge_count -= 1
+        return True
+
+    def has_edge(self, source: str, target: str) -> bool:
+        return target in self._edges.get(source, ())
+
+    def weight(self, source: str, target: str) -> Optional[float]:
+        if not self.has_edge(source, target):
+            return None
+        return self._weights.get((source, target), DEFAULT_WEIGHT)
+
+    def weighted_successors(self, key: str) -> List[Tuple[str, float]]:
+        weights = self._weights
+        if not weights:
+            return [(target, DEFAULT_WEIGHT) for target in self._edges.get(key, ())]
+        return [
+            (target, weights.get((key, target), DEFAULT_WEIGHT))
+            for target in self._edges.get(key, ())
+        ]
+
+    def successors(self, key: str) -> List[str]:
+        return list(self._edges.get(key, ()))
+
+    def predecessors(self, key: str) -> List[str]:
+        return list(self._reverse_edges.get(key, ()))
+
+    def out_degree(self, key: str) -> int:
+        return len(self._edges.get(key, ()))
+
+    def in_degree(self, key: str) -> int:
+        return len(self._reverse_edges.get(key, ()))
+
+    def edges(self) -> Iterator[Tuple[str, str]]:
+        for source, targets in self._edges.items():
+            for target in targets:
+                yield source, target
+
+    def edge_count(self) -> int:
+        return self._edge_count
+
+
+class _CSRBuffers:
+    """One direction of compressed sparse row adjacency over dense node ids."""
+
+    __slots__ = ("offsets", "targets", "weights", "extra", "dead", "dead_per_row", "pending")
+
+    def __init__(self) -> None:
+        self.offsets = array("l", [0])
+        self.targets = array("i")
+        # Edge weights, parallel to ``targets``.
+        self.weights = array("d")
+        # Mutable overflow (other id -> weight) for edges added since the last compaction.
+        self.extra: Dict[int, Dict[int, float]] = {}
+        # Tombstones for compacted edges that have since been removed.
+        self.dead: Set[Tuple[int, int]] = set()
+        self.dead_per_row: Dict[int, int] = {}
+        self.pending = 0
+
+    def row_bounds(self, node_id: int) -> Tuple[int, int]:
+        if node_id + 1 >= len(self.offsets):
+            return 0, 0
+        return self.offsets[node_id], self.offsets[node_id + 1]
+
+    def compacted_index(self, node_id: int, other: int) -> int:
+        low, high = self.row_bounds(node_id)
+        index = bisect_left(self.targets, other, low, high)
+        if index < high and self.targets[index] == other:
+            return index
+        return -1
+
+    def contains(self, node_id: int, other: int) -> bool:
+        extra = self.extra.get(node_id)
+        if extra and other in extra:
+            return True
+        return self.compacted_index(node_id, other) >= 0 and (node_id, other) not in self.dead
+
+    def weight(self, node_id: int, other: int) -> Optional[float]:
+        extra = self.extra.get(node_id)
+        if extra and other in extra:
+            return extra[other]
+        index = self.compacted_index(node_id, other)
+        if index < 0 or (node_id, other) in self.dead:
+            return None
+        return self.weights[index]
+
+    def row(self, node_id: int) -> List[int]:
+        low, high = self.row_bounds(node_id)
+        values = self.targets[low:high].tolist()
+        if self.dead_per_row.get(node_id):
+            dead = self.dead
+            values = [other for other in values if (node_id, other) not in dead]
+        extra = self.extra.get(node_id)
+        if extra:
+            values.extend(extra)
+        return values
+
+    def weighted_row(self, node_id: int) -> List[Tuple[int, float]]:
+        low, high = self.row_bounds(node_id)
+        pairs = list(zip(self.targets[low:high].tolist(), self.weights[low:high].tolist()))
+        if self.dead_per_row.get(node_id):
+            dead = self.dead
+            pairs = [pair for pair in pairs if (node_id, pair[0]) not in dead]
+        extra = self.extra.get(node_id)
+        if extra:
+            pairs.extend(extra.items())
+        return pairs
+
+    def degree(self, node_id: int) -> int:
+        # Inlined row_bounds: degree lookups dominate stats upkeep after a bulk load.
+        offsets = self.offsets
+        count = offsets[node_id + 1] - offsets[node_id] if node_id + 1 < len(offsets) else 0
+        if self.dead_per_row:
+            count -= self.dead_per_row.get(node_id, 0)
+        extra = self.extra.get(node_id)
+        return count + len(extra) if extra else count
+
+    def add(self, node_id: int, other: int, weight: float) -> None:
+        if (node_id, other) in self.dead:
+            self.dead.remove((node_id, other))
+            self._count_dead(node_id, -1)
+            self.weights[self.compacted_index(node_id, other)] = weight
+            self.pending -= 1
+        else:
+            self.extra.setdefault(node_id, {})[other] = weight
+            self.pending += 1
+
+    def set_weight(self, node_id: int, other: int, weight: float) -> None:
+        extra = self.extra.get(node_id)
+        if extra and other in extra:
+            extra[other] = weight
+        else:
+            self.weights[self.compacted_index(node_id, other)] = weight
+
+    def discard(self, node_id: int, other: int) -> None:
+        extra = self.extra.get(node_id)
+        if extra and other in extra:
+            del extra[other]
+            if not extra:
+                del self.extra[node_id]
+            self.pending -= 1
+        else:
+            self.dead.add((node_id, other))
+            self._count_dead(node_id, 1)
+            self.pending += 1
+
+    def _count_dead(self, node_id: int, delta: int) -> None:
+        remaining = self.dead_per_row.get(node_id, 0) + delta
+        if remaining:
+            self.dead_per_row[node_id] = remaining
+        else:
+            self.dead_per_row.pop(node_id, None)
+
+
+class CSRAdjacency:
+    """Compact engine that interns node keys to dense integer ids.
+
+    Compacted edges live in sorted ``array`` CSR buffers (one forward, one
+    reverse). Recent inserts go to a small mutable overflow and removals are
+    recorded as tombstones; both are folded back into the arrays once they
+    grow past ``compact_ratio`` of the compacted size.
+    """
+
+    def __init__(self, *, compact_ratio: float = 0.25, min_compact: int = 1024) -> None:
+        self._ids: Dict[str, int] = {}
+        self._keys: List[Optional[str]] = []
+        self._forward = _CSRBuffers()
+        self._reverse = _CSRBuffers()
+        self._edge_count = 0
+        self._compact_ratio = compact_ratio
+        self._min_compact = min_compact
+
+    def add_node(self, key: str) -> None:
+        if key not in self._ids:
+            self._ids[key] = len(self._keys)
+            self._keys.append(key)
+
+    def remove_node(self, key: str) -> Tuple[List[str], List[str]]:
+        if key not in self._ids:
+            return [], []
+        predecessors = self.predecessors(key)
+        successors = self.successors(key)
+        for predecessor in predecessors:
+            self.remove_edge(predecessor, key)
+        for successor in successors:
+            if successor != key:
+                self.remove_edge(key, successor)
+        # Removing edges may have triggered a compaction, so look the id up again.
+        self._keys[self._ids.pop(key)] = None
+        return predecessors, successors
+
+    def add_edge(self, source: str, target: str, weight: Optional[float] = None) -> bool:
+        created = self._insert_edge(source, target, weight)
+        if created:
+            self._maybe_compact()
+        return created
+
+    def add_edges(self, edges: Iterable[Tuple[str, str, Optional[float]]]) -> List[bool]:
+        """Insert a batch into the overflow and compact at most once afterwards.
+
+        Consecutive edges from one source share a single lookup of its row.
+        A repeat within the batch is found in the overflow by a dict lookup,
+        so only edges new to the overflow search the compacted row, and rows
+        without compacted edges (every row of a fresh bulk load) skip that
+        search altogether. Rows holding tombstones take the general path,
+        since a removed edge may be revived in place.
+        """
+
+        ids = self._ids
+        forward, reverse = self._forward, self._reverse
+        forward_rows, reverse_rows, tombstoned = forward.extra, reverse.extra, forward.dead_per_row
+        targets = forward.targets
+        created: List[bool] = []
+        added = 0
+        previous: Optional[int] = None
+        row: Optional[Dict[int, float]] = None
+        low = high = 0
+        for source, target, weight in edges:
+            source_id, target_id = ids[source], ids[target]
+            if source_id != previous:
+                if source_id in tombstoned:
+                    created.append(self._insert_edge(source, target, weight))
+                    previous = None
+                    continue
+                previous = source_id
+                row = forward_rows.get(source_id)
+                low, high = forward.row_bounds(source_id)
+            if row is not None and target_id in row:
+                if weight is not None:
+                    row[target_id] = reverse_rows[target_id][source_id] = weight
+                created.append(False)
+                continue
+            if low < high:
+                index = bisect_left(targets, target_id, low, high)
+                if index < high and targets[index] == target_id:
+                    if weight is not None:
+                        forward.weights[index] = weight
+                        reverse.set_weight(target_id, source_id, weight)
+                    created.append(False)
+                    continue
+            value = DEFAULT_WEIGHT if weight is None else weight
+            if row is None:
+                row = forward_rows[source_id] = {}
+            row[target_id] = value
+            column = reverse_rows.get(target_id)
+            if column is None:
+                reverse_rows[target_id] = {source_id: value}
+            else:
+                column[source_id] = value
+            added += 1
+            created.append(True)
+        forward.pending += added
+        reverse.pending += added
+        self._edge_count += added
+        self._maybe_compact()
+        return created
+
+    def _insert_edge(self, source: str, target: str, weight: Optional[float]) -> bool:
+        source_id, target_id = self._ids[source], self._ids[target]
+        if self._forward.contains(source_id, target_id):
+            if weight is not None:
+                self._forward.set_weight(source_id, target_id, weight)
+                self._reverse.set_weight(target_id, source_id, weight)
+            return False
+        value = DEFAULT_WEIGHT if weight is None else weight
+        self._forward.add(source_id, target_id, value)
+        self._reverse.add(target_id, source_id, value)
+        self._edge_count += 1
+        return True
+
+    def remove_edge(self, source: str, target: str) -> bool:
+        source_id, target_id = self._ids.get(source), self._ids.get(target)
+        if source_id is None or target_id is None:
+            return False
+        if not self._forward.contains(source_id, target_id):
+            return False
+        self._forward.discard(source_id, target_id)
+        self._reverse.discard(target_id, source_id)
+        self._edge_count -= 1
+        self._maybe_compact()
+        return True
+
+    def has_edge(self, source: str, target: str) -> bool:
+        source_id, target_id = self._ids.get(source), self._ids.get(target)
+        if source_id is None or target_id is None:
+            return False
+        return self._forward.contains(source_id, target_id)
+
+    def weight(self, source: str, target: str) -> Optional[float]:
+        source_id, target_id = self._ids.get(source), self._ids.get(target)
+        if source_id is None or target_id is None:
+            return None
+        return self._forward.weight(source_id, target_id)
+
+    def weighted_successors(self, key: str) -> List[Tuple[str, float]]:
+        node_id = self._ids.get(key)
+        if node_id is None:
+            return []
+        keys = self._keys
+        return [(keys[other], weight) for other, weight in self._forward.weighted_row(node_id)]
+
+    def successors(self, key: str) -> List[str]:
+        return self._resolve(self._forward, key)
+
+    def predecessors(self, key: str) -> List[str]:
+        return self._resolve(self._reverse, key)
+
+    def out_degree(self, key: str) -> int:
+        node_id = self._ids.get(key)
+        return 0 if node_id is None else self._forward.degree(node_id)
+
+    def in_degree(self, key: str) -> int:
+        node_id = self._ids.get(key)
+        return 0 if node_id is None else self._reverse.degree(node_id)
+
+    def edges(self) -> Iterator[Tuple[str, str]]:
+        keys = self._keys
+        for source_id, source in enumerate(keys):
+            if source is None:
+                continue
+            for target_id in self._forward.row(source_id):
+                yield source, keys[target_id]
+
+    def edge_count(self) -> int:
+        return self._edge_count
+
+    def compact(self) -> None:
+        """Fold the overflow and tombstones into freshly built CSR arrays."""
+
+        live_ids = [node_id for node_id, key in enumerate(self._keys) if key is not None]
+        remap: Optional[array] = None
+        if len(live_ids) != len(self._keys):
+            # Renumber densely; the mapping is monotonic so sorted rows stay sorted.
+            remap = array("i", [-1]) * len(self._keys)
+            for new_id, old_id in enumerate(live_ids):
+                remap[old_id] = new_id
+        self._forward = self._rebuild(self._forward, live_ids, remap)
+        self._reverse = self._rebuild(self._reverse, live_ids, remap)
+        if remap is not None:
+            self._keys = [self._keys[old_id] for old_id in live_ids]
+            self._ids = {key: new_id for new_id, key in enumerate(self._keys)}
+
+    def memory_bytes(self) -> int:
+        """Approximate bytes held by the integer buffers (excluding key strings)."""
+
+        total = 0
+        for buffers in (self._forward, self._reverse):
+            total += buffers.offsets.itemsize * len(buffers.offsets)
+            total += buffers.targets.itemsize * len(buffers.targets)
+            total += buffers.weights.itemsize * len(buffers.weights)
+            total += 8 * buffers.pending
+        return total
+
+    def _resolve(self, buffers: _CSRBuffers, key: str) -> List[str]:
+        node_id = self._ids.get(key)
+        if node_id is None:
+            return []
+        keys = self._keys
+        return [keys[other] for other in buffers.row(node_id)]
+
+    def _maybe_compact(self) -> None:
+        pending = self._forward.pending
+        # Rebuilding touches every row, so scale the threshold with nodes as well
+        # as edges to keep the amortised cost per mutation constant.
+        footprint = len(self._forward.targets) + len(self._ids)
+        threshold = max(self._min_compact, int(footprint * self._compact_ratio))
+        if pending > threshold:
+            self.compact()
+
+    @staticmethod
+    def _rebuild(buffers: _CSRBuffers, live_ids: List[int], remap: Optional[array]) -> _CSRBuffers:
+        old_targets, old_weights = buffers.targets, buffers.weights
+        extras, dead_per_row = buffers.extra, buffers.dead_per_row
+        offsets = array("l", [0]) * (len(live_ids) + 1)
+        targets = array("i")
+        weights = array("d")
+        for new_id, old_id in enumerate(live_ids):
+            low, high = buffers.row_bounds(old_id)
+            extra = extras.get(old_id)
+            if old_id in dead_per_row or (extra and low < high):
+                pairs = sorted(buffers.weighted_row(old_id))
+                others = [other for other, _ in pairs]
+                values = [weight for _, weight in pairs]
+            elif extra:
+                # Only overflow edges, as for nearly every row after a bulk load.
+                others = sorted(extra)
+                values = list(map(extra.__getitem__, others))
+            else:
+                # Untouched rows are copied wholesale without visiting each edge in Python.
+                segment = old_targets[low:high]
+                if remap is not None:
+                    segment = array("i", map(remap.__getitem__, segment))
+                targets.extend(segment)
+                weights.extend(old_weights[low:high])
+                offsets[new_id + 1] = len(targets)
+                continue
+            if remap is not None:
+                others = list(map(remap.__getitem__, others))
+            targets.extend(others)
+            weights.extend(values)
+            offsets[new_id + 1] = len(targets)
+        rebuilt = _CSRBuffers()
+        rebuilt.offsets = offsets
+        rebuilt.targets = targets
+        rebuilt.weights = weights
+        return rebuilt
+
+
+STORAGE_ENGINES = {
+    "sets": SetAdjacency,
+    "csr": CSRAdjacency,
+}
+
+
+def create_adjacency(storage: str) -> Adjacency:
+    """Instantiate the adjacency engine registered under ``storage``."""
+
+    try:
+        engine = STORAGE_ENGINES[storage]
+    except KeyError:
+        raise ValueError(
+            f"Unknown storage engine: {storage} (expected one of {', '.join(sorted(STORAGE_ENGINES))})"
+        ) from None
+    return engine()
@@ -0,0 +1,256 @@
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+import json
+import os
+from pathlib import Path
+import re
+from typing import Callable, Iterator, Optional
+
+from app.core.export import ExportCursor, ndjson_chunks
+from app.core.graph import KnowledgeGraph
+from app.core.importer import NDJSONImporter
+
+DEFAULT_WORKSPACE = "default"
+# Resident graphs are evicted, least recently used first, beyond this estimate.
+DEFAULT_MEMORY_BUDGET = 512 * 1024 * 1024
+# Saved workspaces are read back in pieces of this many bytes.
+READ_CHUNK_BYTES = 1 << 20
+WORKSPACE_NAME = re.compile(r"[A-Za-z0-9][A-Za-z0-9_-]{0,63}")
+
+
+def validate_workspace(name: str) -> str:
+    """Return ``name`` if it is a usable workspace name, else raise ``ValueError``."""
+
+    if not WORKSPACE_NAME.fullmatch(name):
+        raise ValueError(
+            "Workspace names must be 1-64 letters, digits, '-' or '_', starting with a letter or digit"
+        )
+    return name
+
+
+@dataclass(slots=True)
+class WorkspaceSettings:
+    """Options fixed when a workspace is created and kept alongside its data."""
+
+    allow_cycles: bool = False
+
+
+class WorkspaceStore:
+    """Keeps workspaces that are not resident as NDJSON exports in a directory.
+
+    Settings of workspaces created with non-default options live next to the
+    export in ``<name>.settings.json``.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, name: str) -> Path:
+        return self.directory / f"{validate_workspace(name)}.ndjson"
+
+    def _settings_path(self, name: str) -> Path:
+        return self.directory / f"{validate_workspace(name)}.settings.json"
+
+    def exists(self, name: str) -> bool:
+        return self._path(name).exists() or self._settings_path(name).exists()
+
+    def load_settings(self, name: str) -> WorkspaceSettings:
+        """Settings saved for ``name``, or the defaults if none were."""
+
+        path = self._settings_path(name)
+        if not path.exists():
+            return WorkspaceSettings()
+        return WorkspaceSettings(**json.loads(path.read_text(encoding="utf-8")))
+
+    def save_settings(self, name: str, settings: WorkspaceSettings) -> None:
+        path = self._settings_path(name)
+        partial = path.with_suffix(".partial")
+        partial.write_text(json.dumps(asdict(settings)), encoding="utf-8")
+        os.replace(partial, path)
+
+    def load(self, name: str, graph: KnowledgeGraph) -> bool:
+        """Import the saved copy of ``name`` into ``graph``; False if none exists."""
+
+        path = self._path(name)
+        if not path.exists():
+            return False
+        importer = NDJSONImporter(graph)
+        with path.open("rb") as handle:
+            while piece := handle.read(READ_CHUNK_BYTES):
+                importer.feed(piece)
+        importer.finish()
+        return True
+
+    def save(self, name: str, graph: KnowledgeGraph) -> None:
+        """Write ``graph`` out, replacing the previous copy only once complete."""
+
+        path = self._path(name)
+        partial = path.with_suffix(".partial")
+        with partial.open("w", encoding="utf-8") as handle:
+            for chunk in ndjson_chunks(ExportCursor(graph)):
+                handle.write(chunk)
+        os.replace(partial, path)
+
+
+@dataclass(slots=True)
+class WorkspaceStats:
+    """Registry counters; ``resident_bytes`` and the budget are estimates in bytes."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    saves: int = 0
+    resident: int = 0
+    resident_bytes: int = 0
+    memory_budget: int = 0
+
+
+@dataclass(slots=True)
+class _Resident:
+    graph: KnowledgeGraph
+    saved_revision: int
+    estimated_bytes: int = 0
+    leases: int = 0
+
+
+class WorkspaceRegistry:
+    """Serve one ``KnowledgeGraph`` per workspace, keeping only hot ones in memory.
+
+    A workspace is loaded from the store the first time it is asked for, its
+    graph built by ``factory`` with the saved ``allow_cycles`` setting. One
+    that was never saved starts empty and is handed to ``on_create``, so
+    starter content is added once rather than on every load. Resident graphs
+    are kept in least-recently-used order with an estimate of their size,
+    refreshed on every access; while the estimates add up to more than ``memory_budget``
+    the coldest graphs are saved, if they changed since they were loaded, and
+    dropped. Leased workspaces are never evicted, so a request that awaits
+    mid-write cannot lose its changes. The registry is not thread-safe; the
+    API uses it from the event loop only.
+    """
+
+    def __init__(
+        self,
+        store: WorkspaceStore,
+        *,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+        factory: Callable[..., KnowledgeGraph] = KnowledgeGraph,
+        on_create: Optional[Callable[[str, KnowledgeGraph], None]] = None,
+    ) -> None:
+        if memory_budget <= 0:
+            raise ValueError("Memory budget must be positive")
+        self.store = store
+        self.memory_budget = memory_budget
+        self._factory = factory
+        self._on_create = on_create
+        self._resident: "OrderedDict[str, _Resident]" = OrderedDict()
+        self._resident_bytes = 0
+        self._stats = WorkspaceStats()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._resident
+
+    def get(self, name: str) -> KnowledgeGraph:
+        """Return the graph of workspace ``name``, loading it if it is not resident."""
+
+        return self._touch(name).graph
+
+    @contextmanager
+    def lease(self, name: str) -> Iterator[KnowledgeGraph]:
+        """Keep workspace ``name`` resident until the block exits."""
+
+        entry = self._touch(name)
+        entry.leases += 1
+        try:
+            yield entry.graph
+        finally:
+            entry.leases -= 1
+            if self._resident.get(name) is entry:
+                self._measure(entry)
+                self._evict_over_budget()
+
+    def exists(self, name: str) -> bool:
+        """Whether workspace ``name`` is resident or was created or saved before."""
+
+        return name in self._resident or self.store.exists(name)
+
+    def create(self, name: str, settings: WorkspaceSettings) -> KnowledgeGraph:
+        """Create workspace ``name`` with ``settings``; ``ValueError`` if it already exists."""
+
+        validate_workspace(name)
+        if self.exists(name):
+            raise ValueError(f"Workspace {name} already exists")
+        self.store.save_settings(name, settings)
+        return self._touch(name).graph
+
+    def evict(self, name: str) -> bool:
+        """Save (if changed) and drop a resident, unleased workspace."""
+
+        entry = self._resident.get(name)
+        if entry is None or entry.leases:
+            return False
+        self._save(name, entry)
+        del self._resident[name]
+        self._resident_bytes -= entry.estimated_bytes
+        self._stats.evictions += 1
+        return True
+
+    def flush(self) -> None:
+        """Save every resident workspace that changed since it was last saved."""
+
+        for name, entry in self._resident.items():
+            self._save(name, entry)
+
+    def stats(self) -> WorkspaceStats:
+        return WorkspaceStats(
+            hits=self._stats.hits,
+            misses=self._stats.misses,
+            evictions=self._stats.evictions,
+            saves=self._stats.saves,
+            resident=len(self._resident),
+            resident_bytes=self._resident_bytes,
+            memory_budget=self.memory_budget,
+        )
+
+    def _touch(self, name: str) -> _Resident:
+        entry = self._resident.get(name)
+        if entry is None:
+            validate_workspace(name)
+            self._stats.misses += 1
+            settings = self.store.load_settings(name)
+            graph = self._factory(allow_cycles=settings.allow_cycles)
+            if not self.store.load(name, graph) and self._on_create is not None:
+                self._on_create(name, graph)
+            entry = self._resident[name] = _Resident(graph, graph.revision())
+        else:
+            self._stats.hits += 1
+            self._resident.move_to_end(name)
+        self._measure(entry)
+        # The workspace being handed out is never the one evicted.
+        entry.leases += 1
+        try:
+            self._evict_over_budget()
+        finally:
+            entry.leases -= 1
+        return entry
+
+    def _measure(self, entry: _Resident) -> None:
+        size = entry.graph.estimated_bytes()
+        self._resident_bytes += size - entry.estimated_bytes
+        entry.estimated_bytes = size
+
+    def _evict_over_budget(self) -> None:
+        while self._resident_bytes > self.memory_budget:
+            # Oldest first; leased workspaces are skipped over, not waited for.
+            name = next((name for name, entry in self._resident.items() if not entry.leases), None)
+            if name is None:
+                return
+            self.evict(name)
+
+    def _save(self, name: str, entry: _Resident) -> None:
+        revision = entry.graph.revision()
+        if revision != entry.saved_revision:
+            self.store.save(name, entry.graph)
+            entry.saved_revision = revision
+            self._stats.saves += 1
@@ -19,16 +19,21 @@ const INITIAL_CHAT = [
   },
 ];
 
+// The insight panel lists only this many concepts; totals come from /graph/stats.
+const CONCEPT_PREVIEW = 12;
+
 async function loadGraph() {
-  const [nodes, relationships] = await Promise.all([
-    fetchJson('/knowledge'),
-    fetchJson('/relationships'),
+  const [nodes, tags, layout, stats] = await Promise.all([
+    fetchJson(`/knowledge?limit=${CONCEPT_PREVIEW}`),
+    fetchJson('/knowledge/tags'),
+    fetchJson('/graph/layout'),
+    fetchJson('/graph/stats'),
   ]);
-  return { nodes, relationships };
+  return { nodes, tags, layout, stats };
 }
 
 export default function App() {
-  const [graph, setGraph] = useState({ nodes: [], relationships: [] });
+  const [graph, setGraph] = useState({ nodes: [], tags: [], layout: null, stats: null });
   const [sessions, setSessions] = useState([]);
   const [curricula, setCurricula] = useState([]);
   const [shares, setShares] = useState([]);
@@ -170,11 +175,13 @@ export default function App() {
         onGenerateQuiz={generateQuiz}
       />
       <div className="middle-column">
-        <GraphPanel nodes={graph.nodes} relationships={graph.relationships} />
+        <GraphPanel layout={graph.layout} />
         <ChatPanel messages={chat} onSend={handleChatSend} />
       </div>
       <InsightPanel
+        stats={graph.stats}
         nodes={graph.nodes}
+        tags={graph.tags}
         sessions={sessions}
         curricula={curricula}
         shares={shares}
@@ -9,6 +9,10 @@ export async function fetchJson(path, options = {}) {
     try {
       const body = await response.json();
       message = body.detail || message;
+      const guesses = Object.values(body.suggestions || {}).flat();
+      if (guesses.length) {
+        message = `${message} (did you mean ${guesses.slice(0, 3).join(', ')}?)`;
+      }
     } catch (error) {
       // Ignore JSON parsing failures, fall back to status text.
     }
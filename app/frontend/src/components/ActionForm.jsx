@@ -1,4 +1,11 @@
 import { useState } from 'react';
+import { fetchJson } from '../api.js';
+
+// Concept fields may hold a comma-separated list; only the last entry is completed.
+function splitLastEntry(value) {
+  const index = value.lastIndexOf(',');
+  return index === -1 ? ['', value] : [value.slice(0, index + 1) + ' ', value.slice(index + 1)];
+}
 
 export function ActionForm({
   id,
@@ -16,11 +23,30 @@ export function ActionForm({
   const [status, setStatus] = useState(null);
   const [error, setError] = useState(null);
   const [busy, setBusy] = useState(false);
+  const [suggestions, setSuggestions] = useState({});
+
+  const suggestConcepts = async (name, value) => {
+    const [head, entry] = splitLastEntry(value);
+    const prefix = entry.trim();
+    if (!prefix) {
+      setSuggestions((current) => ({ ...current, [name]: [] }));
+      return;
+    }
+    try {
+      const matches = await fetchJson(`/knowledge/complete?prefix=${encodeURIComponent(prefix)}&limit=8`);
+      setSuggestions((current) => ({ ...current, [name]: matches.map((match) => head + match.name) }));
+    } catch (problem) {
+      // Suggestions are best effort; typing still works without them.
+    }
+  };
 
   const handleChange = (event) => {
     const { name, value, type, checked } = event.target;
     const nextValue = type === 'checkbox' ? checked : value;
     setState((current) => ({ ...current, [name]: nextValue }));
+    if (fields.some((field) => field.name === name && field.complete === 'concept')) {
+      suggestConcepts(name, value);
+    }
   };
 
   const handleSubmit = async (event) => {
@@ -68,6 +94,15 @@ export function ActionForm({
                     </option>
                   ))}
                 </select>
+              ) : field.complete === 'concept' ? (
+                <>
+                  <input {...common} type="text" list={`${common.id}-options`} autoComplete="off" />
+                  <datalist id={`${common.id}-options`}>
+                    {(suggestions[field.name] ?? []).map((option) => (
+                      <option key={option} value={option} />
+                    ))}
+                  </datalist>
+                </>
               ) : (
                 <input {...common} type={field.type ?? 'text'} />
               )}
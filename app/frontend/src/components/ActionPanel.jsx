@@ -46,7 +46,7 @@ export function ActionPanel({
               { name: 'name', label: 'Session name', required: true },
               { name: 'description', label: 'Description', kind: 'textarea', rows: 3 },
               { name: 'focus_tags', label: 'Focus tags', placeholder: 'python, collaboration' },
-              { name: 'linked_concepts', label: 'Linked concepts', placeholder: 'Python, FastAPI' },
+              { name: 'linked_concepts', label: 'Linked concepts', complete: 'concept', placeholder: 'Python, FastAPI' },
             ]}
           />
           <ActionForm
@@ -60,7 +60,7 @@ export function ActionPanel({
               { name: 'description', label: 'Summary', kind: 'textarea', rows: 3 },
               { name: 'tags', label: 'Tags', placeholder: 'fastapi, backend' },
               { name: 'source_url', label: 'Source URL', type: 'url', placeholder: 'https://fastapi.tiangolo.com/' },
-              { name: 'linked_concepts', label: 'Linked concepts', placeholder: 'REST APIs, FastAPI' },
+              { name: 'linked_concepts', label: 'Linked concepts', complete: 'concept', placeholder: 'REST APIs, FastAPI' },
             ]}
           />
           <ActionForm
@@ -74,7 +74,7 @@ export function ActionPanel({
               { name: 'title', label: 'Title', required: true },
               { name: 'summary', label: 'Summary', kind: 'textarea', rows: 3, required: true },
               { name: 'tags', label: 'Tags', placeholder: 'brainstorm, ai' },
-              { name: 'linked_concepts', label: 'Linked concepts', placeholder: 'Python, REST APIs' },
+              { name: 'linked_concepts', label: 'Linked concepts', complete: 'concept', placeholder: 'Python, REST APIs' },
               {
                 name: 'visibility',
                 label: 'Visibility',
@@ -100,7 +100,7 @@ export function ActionPanel({
             successLabel="Generated"
             onSubmit={onGenerateQuiz}
             fields={[
-              { name: 'concept', label: 'Concept', required: true },
+              { name: 'concept', label: 'Concept', required: true, complete: 'concept' },
               {
                 name: 'difficulty',
                 label: 'Difficulty',
@@ -1,43 +1,64 @@
-import { useMemo } from 'react';
+import { useEffect, useMemo, useState } from 'react';
+import { fetchJson } from '../api.js';
 
-const RING_STEP = 40;
-const BASE_RADIUS = 120;
+const NEIGHBORHOOD_DEPTH = 2;
+const NEIGHBORHOOD_MAX_NODES = 150;
 
-function polarToCartesian(index, total, radius) {
-  if (!total) {
-    return { x: 0, y: 0 };
-  }
-  const angle = (2 * Math.PI * index) / total;
-  return {
-    x: radius * Math.cos(angle),
-    y: radius * Math.sin(angle),
-  };
-}
+export function GraphPanel({ layout }) {
+  // Coordinates come from GET /graph/layout, so the browser only draws.
+  const placements = layout ? layout.nodes : [];
+  const positions = useMemo(() => new Map(placements.map((node) => [node.name, node])), [placements]);
+  const [center, setCenter] = useState(null);
+  const [neighborhood, setNeighborhood] = useState(null);
+
+  // Start from a foundational concept, and move on if the current one is removed.
+  const focus = center && positions.has(center) ? center : placements[0]?.name ?? null;
 
-export function GraphPanel({ nodes, relationships }) {
-  const positioned = useMemo(() => {
-    return nodes.map((node, index) => {
-      const radius = BASE_RADIUS + (index % 3) * RING_STEP;
-      const { x, y } = polarToCartesian(index, nodes.length, radius);
-      return {
-        name: node.name,
-        x,
-        y,
-      };
+  useEffect(() => {
+    if (!focus) {
+      setNeighborhood(null);
+      return undefined;
+    }
+    let cancelled = false;
+    const params = new URLSearchParams({
+      center: focus,
+      depth: String(NEIGHBORHOOD_DEPTH),
+      direction: 'both',
+      max_nodes: String(NEIGHBORHOOD_MAX_NODES),
     });
-  }, [nodes]);
+    // Only the concepts within a few hops are fetched and drawn, however large the graph.
+    fetchJson(`/graph/neighborhood?${params}`)
+      .then((response) => {
+        if (!cancelled) {
+          setNeighborhood(response);
+        }
+      })
+      .catch((error) => console.warn('Unable to load the concept neighborhood', error));
+    return () => {
+      cancelled = true;
+    };
+  }, [focus, layout?.version]);
+
+  const nodes = neighborhood ? neighborhood.nodes.filter((node) => positions.has(node.name)) : [];
+  const edges = neighborhood ? neighborhood.edges : [];
+  const truncated = neighborhood && (neighborhood.node_limit_reached || neighborhood.depth_limit_reached);
 
-  const findPosition = (name) => positioned.find((entry) => entry.name === name);
+  const findPosition = (name) => positions.get(name);
 
   return (
     <section className="panel graph-panel">
       <header className="panel-header">
         <p className="eyebrow">Concept graph</p>
         <h2>Your connected knowledge</h2>
-        <p className="helper">Explore how your concepts relate to one another at a glance.</p>
+        <p className="helper">
+          {focus
+            ? `Concepts within ${NEIGHBORHOOD_DEPTH} steps of ${neighborhood?.center ?? focus}. Select a concept to explore around it.`
+            : 'Explore how your concepts relate to one another at a glance.'}
+          {truncated ? ' More concepts lie beyond this view.' : null}
+        </p>
       </header>
       <div className="graph-canvas">
-        {relationships.map((edge) => {
+        {edges.map((edge) => {
           const source = findPosition(edge.source);
           const target = findPosition(edge.target);
           if (!source || !target) {
@@ -69,15 +90,26 @@ export function GraphPanel({ nodes, relationships }) {
             </span>
           );
         })}
-        {positioned.map((node) => (
-          <span
-            key={node.name}
-            className="graph-node"
-            style={{ transform: `translate(calc(50% + ${node.x}px), calc(50% + ${node.y}px))` }}
-          >
-            {node.name}
-          </span>
-        ))}
+        {nodes.map((node) => {
+          const placement = findPosition(node.name);
+          return (
+            <span
+              key={node.name}
+              className="graph-node"
+              role="button"
+              tabIndex={0}
+              onClick={() => setCenter(node.name)}
+              onKeyDown={(event) => {
+                if (event.key === 'Enter') {
+                  setCenter(node.name);
+                }
+              }}
+              style={{ transform: `translate(calc(50% + ${placement.x}px), calc(50% + ${placement.y}px))` }}
+            >
+              {node.name}
+            </span>
+          );
+        })}
       </div>
     </section>
   );
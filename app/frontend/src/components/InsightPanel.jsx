@@ -1,4 +1,14 @@
-export function InsightPanel({ nodes, sessions, curricula, shares, matches, quizItems }) {
+const HEALTH_METRICS = [
+  ['nodes', 'Concepts'],
+  ['edges', 'Relationships'],
+  ['roots', 'Foundations'],
+  ['leaves', 'Frontier'],
+  ['isolated', 'Unlinked'],
+];
+
+export function InsightPanel({ stats, nodes, tags, sessions, curricula, shares, matches, quizItems }) {
+  // Counts come from GET /graph/stats, which the server keeps up to date on every write.
+  const hidden = stats ? stats.nodes - nodes.length : 0;
   return (
     <aside className="panel sidebar">
       <header className="panel-header">
@@ -7,8 +17,21 @@ export function InsightPanel({ nodes, sessions, curricula, shares, matches, quiz
         <p className="helper">Review active sessions, curated resources, and suggested collaborators.</p>
       </header>
       <div className="panel-body insights">
+        {stats ? (
+          <section className="insight-block">
+            <h3>Knowledge health</h3>
+            <ul className="tag-cloud">
+              {HEALTH_METRICS.map(([key, label]) => (
+                <li key={key}>
+                  {label} · {stats[key]}
+                </li>
+              ))}
+            </ul>
+          </section>
+        ) : null}
         <section className="insight-block">
           <h3>Concepts</h3>
+          {hidden > 0 ? <p className="helper">Showing {nodes.length} of {stats.nodes}.</p> : null}
           <ul className="list">
             {nodes.map((node) => (
               <li key={node.name}>
@@ -19,6 +42,18 @@ export function InsightPanel({ nodes, sessions, curricula, shares, matches, quiz
             ))}
           </ul>
         </section>
+        {tags.length ? (
+          <section className="insight-block">
+            <h3>Tags</h3>
+            <ul className="tag-cloud">
+              {tags.map((item) => (
+                <li key={item.tag}>
+                  {item.tag} · {item.count}
+                </li>
+              ))}
+            </ul>
+          </section>
+        ) : null}
         <section className="insight-block">
           <h3>Learning sessions</h3>
           <ul className="list">
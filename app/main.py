@@ -1,39 +1,117 @@
+from contextlib import asynccontextmanager
+import os
 from pathlib import Path
+import tempfile
 
-from typing import Optional
+from typing import AsyncIterator, Dict, Optional
 
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import HTMLResponse, JSONResponse
+from typing_extensions import Literal
+
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Query, Request
+from fastapi import Path as PathParam
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 
 from app.api.schemas import (
+    BulkItemError,
+    BulkResultResponse,
+    ConceptImportanceResponse,
+    ConceptCompletionResponse,
     CurriculumResponse,
     CurriculumUpload,
+    CycleReportResponse,
+    CyclicComponentResponse,
+    GraphLayoutResponse,
+    GraphStatsResponse,
     HandleComparisonResponse,
+    ImportLineError,
+    ImportProgressResponse,
     IdeaMatchResponse,
     IdeaShareAuthorize,
     IdeaShareCreate,
     IdeaShareResponse,
+    KnowledgeNodeBulkCreate,
     KnowledgeNodeCreate,
     KnowledgeNodeDetailResponse,
     KnowledgeNodeResponse,
+    LearningPathEntry,
     LearningPathResponse,
+    LearningPathsRequest,
+    LearningPathsResponse,
     LearningSessionCreate,
     LearningSessionResponse,
     LearningSessionUpdate,
+    NeighborhoodNodeResponse,
+    NeighborhoodResponse,
+    NodePlacementResponse,
     QuizAttemptRequest,
     QuizAttemptResponse,
     QuizGenerationRequest,
     QuizGenerationResponse,
     QuizQuestionResponse,
+    ReachabilityResponse,
+    RelationshipBulkCreate,
     RelationshipCreate,
     RelationshipResponse,
+    SearchResultResponse,
+    StudyPlanResponse,
+    TagCountResponse,
+    WorkspaceCreate,
+    WorkspaceResponse,
+    WorkspaceStatsResponse,
+)
+from app.core.graph import BulkResult, CycleError, KnowledgeGraph, KnowledgeNode, UnknownConceptError, timestamp_to_datetime
+from app.core.export import EXPORT_SECTIONS, ExportCursor, csv_chunks, ndjson_chunks
+from app.core.importance import ImportanceScheduler
+from app.core.importer import ImportStats, NDJSONImporter
+from app.core.workspaces import (
+    DEFAULT_MEMORY_BUDGET,
+    DEFAULT_WORKSPACE,
+    WORKSPACE_NAME,
+    WorkspaceRegistry,
+    WorkspaceSettings,
+    WorkspaceStore,
+    validate_workspace,
 )
-from app.core.graph import KnowledgeGraph, KnowledgeNode
 
-app = FastAPI(title="Wonder Knowledge", description="Prototype knowledge mapping assistant")
 
-graph = KnowledgeGraph()
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    yield
+    importance.cancel_all()
+    # Resident workspaces that changed are written out like evicted ones.
+    workspaces.flush()
+
+
+app = FastAPI(title="Wonder Knowledge", description="Prototype knowledge mapping assistant", lifespan=lifespan)
+# Every graph route is served for the default workspace at the root and for
+# any other workspace under /w/{workspace}.
+router = APIRouter()
+
+# Evicted workspaces are saved here; without WONDER_WORKSPACE_DIR they only
+# outlive eviction, not the process.
+WORKSPACE_DIR = Path(os.environ.get("WONDER_WORKSPACE_DIR") or tempfile.mkdtemp(prefix="wonder-workspaces-"))
+MEMORY_BUDGET_MB = int(os.environ.get("WONDER_MEMORY_BUDGET_MB", DEFAULT_MEMORY_BUDGET // (1024 * 1024)))
+
+
+def _seed_new_workspace(name: str, graph: KnowledgeGraph) -> None:
+    # Only a default workspace that was never saved gets the starter concepts.
+    if name == DEFAULT_WORKSPACE:
+        seed_graph(graph)
+
+
+workspaces = WorkspaceRegistry(
+    WorkspaceStore(WORKSPACE_DIR),
+    memory_budget=MEMORY_BUDGET_MB * 1024 * 1024,
+    on_create=_seed_new_workspace,
+)
+# Recomputes a workspace's importance scores once its writes have settled.
+importance = ImportanceScheduler()
+# Counters of the running (or most recent) NDJSON import, per workspace.
+import_progress: Dict[str, ImportStats] = {}
+ExportSection = Literal["nodes", "edges", "sessions", "curricula", "shares"]
+# "fuzzy" lets lookups fall back to a single strong "did you mean" match.
+Resolve = Literal["exact", "fuzzy"]
 FRONTEND_DIR = Path(__file__).resolve().parent / "frontend" / "dist"
 FRONTEND_INDEX = FRONTEND_DIR / "index.html"
 
@@ -41,7 +119,7 @@ if (FRONTEND_DIR / "assets").exists():
     app.mount("/assets", StaticFiles(directory=FRONTEND_DIR / "assets"), name="assets")
 
 
-def seed_graph() -> None:
+def seed_graph(graph: KnowledgeGraph) -> None:
     """Populate the in-memory graph with a few starter concepts."""
 
     initial_nodes = [
@@ -119,7 +197,8 @@ def seed_graph() -> None:
         pass
 
 
-seed_graph()
+# Load the default workspace up front, seeding it if it was never saved.
+workspaces.get(DEFAULT_WORKSPACE)
 
 
 @app.get("/", include_in_schema=False, response_class=HTMLResponse)
@@ -151,6 +230,26 @@ async def mcp_manifest() -> JSONResponse:
                 "method": "POST",
                 "path": "/knowledge",
             },
+            {
+                "name": "search_concepts",
+                "description": "Find concepts by relevance to a free-text query.",
+                "args": {
+                    "q": "str",
+                    "limit": "int",
+                },
+                "method": "GET",
+                "path": "/knowledge/search",
+            },
+            {
+                "name": "check_prerequisite",
+                "description": "Check whether one concept transitively depends on another.",
+                "args": {
+                    "source": "str",
+                    "target": "str",
+                },
+                "method": "GET",
+                "path": "/reachability",
+            },
             {
                 "name": "publish_share",
                 "description": "Publish a new collaborative knowledge share.",
@@ -179,6 +278,123 @@ async def mcp_manifest() -> JSONResponse:
     return JSONResponse(content=manifest)
 
 
+class ConceptLookupError(HTTPException):
+    """HTTP error whose body also lists "did you mean" candidates per unknown name."""
+
+    def __init__(self, status_code: int, error: UnknownConceptError) -> None:
+        super().__init__(status_code=status_code, detail=str(error))
+        self.suggestions = error.suggestions
+
+
+@app.exception_handler(ConceptLookupError)
+async def concept_lookup_error_handler(request: Request, error: ConceptLookupError) -> JSONResponse:
+    return JSONResponse(
+        status_code=error.status_code,
+        content={"detail": error.detail, "suggestions": error.suggestions},
+    )
+
+
+def workspace_name(request: Request) -> str:
+    """Name of the workspace a request addresses; the root routes use the default one."""
+
+    name = request.path_params.get("workspace", DEFAULT_WORKSPACE)
+    try:
+        return validate_workspace(name)
+    except ValueError as error:
+        raise HTTPException(status_code=422, detail=str(error)) from error
+
+
+async def workspace_graph(name: str = Depends(workspace_name)) -> AsyncIterator[KnowledgeGraph]:
+    # Only POST /workspaces creates a workspace, so a mistyped name is an error
+    # rather than a new, empty tenant.
+    if name != DEFAULT_WORKSPACE and not workspaces.exists(name):
+        raise HTTPException(status_code=404, detail=f"Unknown workspace: {name}")
+    # Leased for the whole request, so a handler that awaits between writes
+    # cannot have its workspace evicted underneath it.
+    with workspaces.lease(name) as graph:
+        revision = graph.revision()
+        yield graph
+        if graph.revision() != revision and graph.importance_stale():
+            importance.schedule(name, graph)
+
+
+def _workspace_path(
+    workspace: str = PathParam(..., pattern=WORKSPACE_NAME.pattern, description="Workspace to operate on."),
+) -> None:
+    """Document and validate the workspace segment of the /w/{workspace} routes."""
+
+
+def _http_error(status_code: int, error: ValueError) -> HTTPException:
+    if isinstance(error, UnknownConceptError):
+        return ConceptLookupError(status_code, error)
+    return HTTPException(status_code=status_code, detail=str(error))
+
+
+def _bulk_to_response(result: BulkResult, atomic: bool) -> BulkResultResponse:
+    response = BulkResultResponse(
+        created=result.created,
+        updated=result.updated,
+        errors=[BulkItemError(index=index, detail=detail) for index, detail in result.errors],
+    )
+    if atomic and result.errors:
+        # Nothing was applied, so the batch as a whole is rejected.
+        errors = [error.model_dump() for error in response.errors]
+        return JSONResponse(status_code=422, content={"detail": "Batch rejected; nothing was applied", "errors": errors})
+    return response
+
+
+def _import_to_response(stats: ImportStats) -> ImportProgressResponse:
+    return ImportProgressResponse(
+        lines=stats.lines,
+        nodes_created=stats.nodes_created,
+        nodes_updated=stats.nodes_updated,
+        edges_created=stats.edges_created,
+        edges_updated=stats.edges_updated,
+        edges_deferred=stats.edges_deferred,
+        records_restored=stats.records_restored,
+        error_count=stats.error_count,
+        errors=[ImportLineError(line=line, detail=detail) for line, detail in stats.errors],
+        done=stats.done,
+    )
+
+
+def _normalize_node(payload: KnowledgeNodeCreate) -> KnowledgeNode:
+    return KnowledgeNode(
+        name=payload.name.strip(),
+        description=(payload.description or "").strip(),
+        tags=sorted(set(tag.strip().lower() for tag in payload.tags if tag.strip())),
+    )
+
+
+def _node_to_response(node: KnowledgeNode) -> KnowledgeNodeResponse:
+    return KnowledgeNodeResponse(name=node.name, description=node.description, tags=list(node.tags))
+
+
+def _session_to_response(session) -> LearningSessionResponse:
+    return LearningSessionResponse(
+        id=session.id,
+        name=session.name,
+        description=session.description,
+        focus_tags=list(session.focus_tags),
+        linked_concepts=list(session.linked_concepts),
+        status=session.status,
+        current_focus=session.current_focus,
+        created_at=timestamp_to_datetime(session.created_at),
+    )
+
+
+def _curriculum_to_response(curriculum) -> CurriculumResponse:
+    return CurriculumResponse(
+        id=curriculum.id,
+        title=curriculum.title,
+        description=curriculum.description,
+        tags=list(curriculum.tags),
+        source_url=curriculum.source_url,
+        linked_concepts=list(curriculum.linked_concepts),
+        uploaded_at=timestamp_to_datetime(curriculum.uploaded_at),
+    )
+
+
 def _share_to_response(share) -> IdeaShareResponse:
     return IdeaShareResponse(
         id=share.id,
@@ -189,136 +405,481 @@ def _share_to_response(share) -> IdeaShareResponse:
         linked_concepts=list(share.linked_concepts),
         visibility=share.visibility,
         authorized_handles=list(share.authorized_handles),
-        created_at=share.created_at,
+        created_at=timestamp_to_datetime(share.created_at),
     )
 
 
-@app.post("/knowledge", response_model=KnowledgeNodeResponse, summary="Create or update a knowledge node")
-async def create_knowledge_node(payload: KnowledgeNodeCreate) -> KnowledgeNodeResponse:
-    node = KnowledgeNode(
-        name=payload.name.strip(),
-        description=(payload.description or "").strip(),
-        tags=sorted(set(tag.strip().lower() for tag in payload.tags if tag.strip())),
-    )
+@router.post("/knowledge", response_model=KnowledgeNodeResponse, summary="Create or update a knowledge node")
+async def create_knowledge_node(
+    payload: KnowledgeNodeCreate,
+    graph: KnowledgeGraph = Depends(workspace_graph),
+) -> KnowledgeNodeResponse:
+    node = _normalize_node(payload)
     if not node.name:
         raise HTTPException(status_code=422, detail="Name cannot be empty")
     graph.add_node(node)
     stored = graph.get_node(node.name)
     if stored is None:
         raise HTTPException(status_code=500, detail="Failed to persist node")
-    return KnowledgeNodeResponse(**stored.__dict__)
+    return _node_to_response(stored)
+
 
+@router.post(
+    "/knowledge/bulk",
+    response_model=BulkResultResponse,
+    summary="Create or update many knowledge nodes in one request",
+)
+async def create_knowledge_nodes_bulk(
+    payload: KnowledgeNodeBulkCreate,
+    graph: KnowledgeGraph = Depends(workspace_graph),
+) -> BulkResultResponse:
+    result = graph.add_nodes_bulk([_normalize_node(node) for node in payload.nodes], atomic=payload.atomic)
+    return _bulk_to_response(result, payload.atomic)
+
+
+@router.get("/knowledge", response_model=list[KnowledgeNodeResponse], summary="List knowledge nodes, optionally by tag")
+async def list_knowledge_nodes(
+    tag: Optional[list[str]] = Query(None, description="Only return concepts carrying these tags."),
+    match: Literal["all", "any"] = "all",
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    sort: Literal["name", "importance"] = Query(
+        "name", description="'importance' puts the most foundational concepts (highest PageRank) first."
+    ),
+    name: str = Depends(workspace_name),
+    graph: KnowledgeGraph = Depends(workspace_graph),
+) -> list[KnowledgeNodeResponse]:
+    nodes = graph.nodes_with_tags(tag, match) if tag else graph.snapshot().list_nodes()
+    if sort == "importance":
+        # Scores lag writes by the scheduler's delay; never-scored graphs get queued here.
+        if graph.importance_stale() and not importance.pending(name):
+            importance.schedule(name, graph)
+        nodes = graph.sort_by_importance(nodes)
+    end = None if limit is None else offset + limit
+    return [_node_to_response(node) for node in nodes[offset:end]]
+
+
+@router.get(
+    "/knowledge/search",
+    response_model=list[SearchResultResponse],
+    summary="Full-text search over concept names, tags and descriptions",
+)
+async def search_knowledge_nodes(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=100),
+    graph: KnowledgeGraph = Depends(workspace_graph),
+) -> list[SearchResultResponse]:
+    return [
+        SearchResultResponse(name=node.name, description=node.description, tags=list(node.tags), score=score)
+        for node, score in graph.search(q, limit)
+    ]
 
-@app.get("/knowledge", response_model=list[KnowledgeNodeResponse], summary="List all knowledge nodes")
-async def list_knowledge_nodes() -> list[KnowledgeNodeResponse]:
-    nodes = graph.list_nodes()
-    return [KnowledgeNodeResponse(**node.__dict__) for node in nodes]
 
+@router.get(
+    "/knowledge/complete",
+    response_model=list[ConceptCompletionResponse],
+    summary="Autocomplete concept names by prefix",
+)
+async def complete_knowledge_nodes(
+    prefix: str = "",
+    limit: int = Query(10, ge=1, le=50),
+    graph: KnowledgeGraph = Depends(workspace_graph),
+) -> list[ConceptCompletionResponse]:
+    return [
+        ConceptCompletionResponse(name=node.name, in_degree=graph.in_degree(node.name))
+        for node in graph.complete(prefix.strip(), limit)
+    ]
 
-@app.get(
+
+@router.get("/knowledge/tags", response_model=list[TagCountResponse], summary="Count concepts per tag")
+async def list_knowledge_tags(graph: KnowledgeGraph = Depends(workspace_graph)) -> list[TagCountResponse]:
+    return [TagCountResponse(tag=tag, count=count) for tag, count in graph.tag_counts()]
+
+
+@router.get(
     "/knowledge/{name}",
     response_model=KnowledgeNodeDetailResponse,
     summary="Retrieve a single knowledge node with prerequisites",
 )
-async def get_knowledge_node(name: str) -> KnowledgeNodeDetailResponse:
-    node = graph.get_node(name)
+async def get_knowledge_node(
+    name: str,
+    graph: KnowledgeGraph = Depends(workspace_graph),
+) -> KnowledgeNodeDetailResponse:
+    # One pinned version serves both lookups, so a write landing between them
+    # cannot pair this node with another version's prerequisites.
+    view = graph.snapshot()
+    node = view.get_node(name)
     if node is None:
         raise HTTPException(status_code=404, detail=f"Unknown concept: {name}")
-    prerequisites = graph.prerequisites(name)
+    prerequisites = view.prerequisites(name)
+    scores = graph.importance(name)
     return KnowledgeNodeDetailResponse(
-        **node.__dict__,
-        prerequisites=[KnowledgeNodeResponse(**item.__dict__) for item in prerequisites],
+        name=node.name,
+        description=node.description,
+        tags=list(node.tags),
+        prerequisites=[_node_to_response(item) for item in prerequisites],
+        importance=None
+        if scores is None
+        else ConceptImportanceResponse(
+            pagerank=scores.pagerank,
+            in_centrality=scores.in_centrality,
+            out_centrality=scores.out_centrality,
+        ),
     )
 
 
-@app.delete(
+@router.delete(
     "/knowledge/{name}",
     status_code=204,
     summary="Remove a concept and all of its relationships",
 )
-async def delete_knowledge_node(name: str) -> None:
+async def delete_knowledge_node(name: str, graph: KnowledgeGraph = Depends(workspace_graph)) -> None:
     try:
         graph.remove_node(name)
     except ValueError as error:
-        raise HTTPException(status_code=404, detail=str(error)) from error
+        raise _http_error(404, error) from error
 
 
-@app.post(
+@router.post(
     "/relationships",
     status_code=201,
     summary="Connect two nodes to express that one concept depends on another",
 )
-async def create_relationship(payload: RelationshipCreate) -> None:
+async def create_relationship(payload: RelationshipCreate, graph: KnowledgeGraph = Depends(workspace_graph)) -> None:
     try:
-        graph.add_relationship(payload.source, payload.target)
+        graph.add_relationship(payload.source, payload.target, effort=payload.effort)
+    except CycleError as error:
+        raise _http_error(409, error) from error
     except ValueError as error:
-        raise HTTPException(status_code=404, detail=str(error)) from error
+        raise _http_error(404, error) from error
 
 
-@app.get(
+@router.post(
+    "/relationships/bulk",
+    response_model=BulkResultResponse,
+    summary="Add many concept dependencies in one request",
+)
+async def create_relationships_bulk(
+    payload: RelationshipBulkCreate,
+    graph: KnowledgeGraph = Depends(workspace_graph),
+) -> BulkResultResponse:
+    items = [(item.source, item.target, item.effort) for item in payload.relationships]
+    result = graph.add_relationships_bulk(items, atomic=payload.atomic)
+    return _bulk_to_response(result, payload.atomic)
+
+
+@router.post(
+    "/import",
+    response_model=ImportProgressResponse,
+    summary="Stream NDJSON node and edge records into the graph",
+)
+async def import_ndjson(
+    request: Request,
+    name: str = Depends(workspace_name),
+    graph: KnowledgeGraph = Depends(workspace_graph),
+) -> ImportProgressResponse:
+    importer = NDJSONImporter(graph)
+    import_progress[name] = importer.stats
+    async for piece in request.stream():
+        importer.feed(piece)
+    return _import_to_response(importer.finish())
+
+
+@router.get(
+    "/import",
+    response_model=ImportProgressResponse,
+    summary="Report progress of the running or most recent import",
+)
+async def get_import_progress(name: str = Depends(workspace_name)) -> ImportProgressResponse:
+    stats = import_progress.get(name)
+    if stats is None:
+        raise HTTPException(status_code=404, detail="No import has been started")
+    return _import_to_response(stats)
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="Stream a consistent snapshot of the graph as NDJSON or CSV",
+)
+async def export_graph(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    include: Optional[list[ExportSection]] = Query(None, description="Sections to export (default: all)."),
+    graph: KnowledgeGraph = Depends(workspace_graph),
+) -> StreamingResponse:
+    cursor = ExportCursor(graph, include or EXPORT_SECTIONS)
+    if format == "csv":
+        chunks, media_type = csv_chunks(cursor, cursor.sections), "text/csv"
+    else:
+        chunks, media_type = ndjson_chunks(cursor), "application/x-ndjson"
+
+    async def stream():
+        # The cursor reads the snapshot pinned by its first chunk, so writes
+        # from other requests landing between chunks cannot change the output.
+        for chunk in chunks:
+            yield chunk
+
+    headers = {"Content-Disposition": f'attachment; filename="knowledge-graph.{format}"'}
+    return StreamingResponse(stream(), media_type=media_type, headers=headers)
+
+
+@router.get(
     "/relationships",
     response_model=list[RelationshipResponse],
     summary="List all defined concept dependencies",
 )
-async def list_relationships() -> list[RelationshipResponse]:
-    relationships = graph.list_relationships()
+async def list_relationships(graph: KnowledgeGraph = Depends(workspace_graph)) -> list[RelationshipResponse]:
     return [
-        RelationshipResponse(source=source.name, target=target.name)
-        for source, target in relationships
+        RelationshipResponse(source=source.name, target=target.name, effort=effort)
+        for source, target, effort in graph.snapshot().relationships()
     ]
 
 
-@app.delete(
+@router.get("/graph/stats", response_model=GraphStatsResponse, summary="Report graph size, degree and tag statistics")
+async def get_graph_stats(graph: KnowledgeGraph = Depends(workspace_graph)) -> GraphStatsResponse:
+    stats = graph.stats()
+    return GraphStatsResponse(
+        nodes=stats.nodes,
+        edges=stats.edges,
+        roots=stats.roots,
+        leaves=stats.leaves,
+        isolated=stats.isolated,
+        in_degrees=stats.in_degrees,
+        out_degrees=stats.out_degrees,
+        tags=stats.tags,
+    )
+
+
+@router.get(
+    "/graph/cycles",
+    response_model=CycleReportResponse,
+    summary="List groups of concepts that require each other in a loop",
+)
+async def get_graph_cycles(
+    limit: int = Query(20, ge=1, le=200),
+    max_members: int = Query(100, ge=1, le=1000),
+    graph: KnowledgeGraph = Depends(workspace_graph),
+) -> CycleReportResponse:
+    report = graph.cycles(limit, max_members)
+    return CycleReportResponse(
+        total_components=report.total_components,
+        total_concepts=report.total_concepts,
+        components=[
+            CyclicComponentResponse(
+                size=component.size,
+                edges=component.edges,
+                nodes=[_node_to_response(node) for node in component.nodes],
+                cycle=component.cycle,
+            )
+            for component in report.components
+        ],
+    )
+
+
+@router.get("/graph/layout", response_model=GraphLayoutResponse, summary="Return radial coordinates for every concept")
+async def get_graph_layout(graph: KnowledgeGraph = Depends(workspace_graph)) -> GraphLayoutResponse:
+    layout = graph.layout()
+    return GraphLayoutResponse(
+        version=layout.version,
+        rings=layout.rings,
+        base_radius=layout.base_radius,
+        ring_step=layout.ring_step,
+        nodes=[
+            NodePlacementResponse(
+                name=node.name,
+                level=node.level,
+                radius=node.radius,
+                angle=node.angle,
+                x=node.x,
+                y=node.y,
+            )
+            for node in layout.nodes
+        ],
+    )
+
+
+@router.get(
+    "/graph/neighborhood",
+    response_model=NeighborhoodResponse,
+    summary="Return the subgraph within a few hops of one concept",
+)
+async def get_neighborhood(
+    center: str,
+    depth: int = Query(2, ge=0, le=6),
+    direction: Literal["up", "down", "both"] = "both",
+    max_nodes: int = Query(200, ge=1, le=5000),
+    resolve: Resolve = "exact",
+    graph: KnowledgeGraph = Depends(workspace_graph),
+) -> NeighborhoodResponse:
+    try:
+        result = graph.neighborhood(center, depth, direction, max_nodes, fuzzy=resolve == "fuzzy")
+    except ValueError as error:
+        raise _http_error(404, error) from error
+    return NeighborhoodResponse(
+        center=result.nodes[0].name,
+        depth=depth,
+        direction=direction,
+        nodes=[
+            NeighborhoodNodeResponse(name=node.name, description=node.description, tags=list(node.tags), distance=hops)
+            for node, hops in zip(result.nodes, result.distances)
+        ],
+        edges=[
+            RelationshipResponse(source=source, target=target, effort=effort)
+            for source, target, effort in result.edges
+        ],
+        node_limit_reached=result.node_limit_reached,
+        depth_limit_reached=result.depth_limit_reached,
+    )
+
+
+@router.delete(
     "/relationships",
     status_code=204,
     summary="Remove a dependency between two concepts",
 )
-async def delete_relationship(payload: RelationshipCreate) -> None:
+async def delete_relationship(payload: RelationshipCreate, graph: KnowledgeGraph = Depends(workspace_graph)) -> None:
     try:
         graph.remove_relationship(payload.source, payload.target)
     except ValueError as error:
-        raise HTTPException(status_code=404, detail=str(error)) from error
+        raise _http_error(404, error) from error
 
 
-@app.get(
+@router.get(
     "/learning-path",
     response_model=LearningPathResponse,
     summary="Compute the optimal learning path between two concepts",
 )
-async def get_learning_path(start: str, goal: str) -> LearningPathResponse:
+async def get_learning_path(
+    start: str,
+    goal: str,
+    mode: Literal["hops", "weighted"] = "hops",
+    resolve: Resolve = "exact",
+    graph: KnowledgeGraph = Depends(workspace_graph),
+) -> LearningPathResponse:
+    fuzzy = resolve == "fuzzy"
+    try:
+        if mode == "weighted":
+            result = graph.find_weighted_path(start, goal, fuzzy=fuzzy)
+        else:
+            result = graph.find_path(start, goal, fuzzy=fuzzy)
+    except ValueError as error:
+        raise _http_error(404, error) from error
+    return LearningPathResponse(
+        path=[_node_to_response(node) for node in result.path],
+        mode=mode,
+        total_cost=result.cost,
+        explored=result.explored,
+    )
+
+
+@router.post(
+    "/learning-paths",
+    response_model=LearningPathsResponse,
+    summary="Compute learning paths from one concept to many goals in a single pass",
+)
+async def get_learning_paths(
+    payload: LearningPathsRequest,
+    resolve: Resolve = "exact",
+    graph: KnowledgeGraph = Depends(workspace_graph),
+) -> LearningPathsResponse:
+    try:
+        results = graph.shortest_paths_from(
+            payload.start,
+            payload.goals,
+            weighted=payload.mode == "weighted",
+            fuzzy=resolve == "fuzzy",
+        )
+    except ValueError as error:
+        raise _http_error(404, error) from error
+    entries: list[LearningPathEntry] = []
+    for goal, result in results.items():
+        if result is None:
+            entries.append(LearningPathEntry(goal=goal, reachable=False))
+            continue
+        entries.append(
+            LearningPathEntry(
+                goal=goal,
+                reachable=True,
+                path=[_node_to_response(node) for node in result.path],
+                total_cost=result.cost,
+            )
+        )
+    return LearningPathsResponse(start=payload.start, mode=payload.mode, paths=entries)
+
+
+@router.get(
+    "/study-plan",
+    response_model=StudyPlanResponse,
+    summary="Order target concepts and all of their prerequisites for study",
+)
+async def get_study_plan(
+    targets: list[str] = Query(..., min_length=1),
+    graph: KnowledgeGraph = Depends(workspace_graph),
+) -> StudyPlanResponse:
+    try:
+        plan = graph.study_plan(targets)
+    except ValueError as error:
+        detail = str(error)
+        status = 404 if "Unknown concept" in detail else 422
+        raise _http_error(status, error) from error
+    return StudyPlanResponse(
+        targets=targets,
+        plan=[_node_to_response(node) for node in plan],
+    )
+
+
+@router.get(
+    "/reachability",
+    response_model=ReachabilityResponse,
+    summary="Check whether one concept is a (transitive) prerequisite of another",
+)
+async def get_reachability(
+    source: str,
+    target: str,
+    graph: KnowledgeGraph = Depends(workspace_graph),
+) -> ReachabilityResponse:
     try:
-        path = graph.shortest_path(start, goal)
+        reachable = graph.is_prerequisite(source, target)
     except ValueError as error:
-        raise HTTPException(status_code=404, detail=str(error)) from error
-    return LearningPathResponse(path=[KnowledgeNodeResponse(**node.__dict__) for node in path])
+        raise _http_error(404, error) from error
+    return ReachabilityResponse(source=source, target=target, reachable=reachable)
 
 
-@app.post("/sessions", response_model=LearningSessionResponse, summary="Create a new learning session")
-async def create_session(payload: LearningSessionCreate) -> LearningSessionResponse:
+@router.post("/sessions", response_model=LearningSessionResponse, summary="Create a new learning session")
+async def create_session(
+    payload: LearningSessionCreate,
+    resolve: Resolve = "exact",
+    graph: KnowledgeGraph = Depends(workspace_graph),
+) -> LearningSessionResponse:
     try:
         session = graph.create_session(
             name=payload.name,
             description=payload.description or "",
             focus_tags=payload.focus_tags,
             linked_concepts=payload.linked_concepts,
+            fuzzy=resolve == "fuzzy",
         )
     except ValueError as error:
-        raise HTTPException(status_code=422, detail=str(error)) from error
-    return LearningSessionResponse(**session.__dict__)
+        raise _http_error(422, error) from error
+    return _session_to_response(session)
 
 
-@app.get("/sessions", response_model=list[LearningSessionResponse], summary="List all learning sessions")
-async def list_sessions() -> list[LearningSessionResponse]:
-    sessions = graph.list_sessions()
-    return [LearningSessionResponse(**session.__dict__) for session in sessions]
+@router.get("/sessions", response_model=list[LearningSessionResponse], summary="List all learning sessions")
+async def list_sessions(graph: KnowledgeGraph = Depends(workspace_graph)) -> list[LearningSessionResponse]:
+    sessions = graph.snapshot().list_sessions()
+    return [_session_to_response(session) for session in sessions]
 
 
-@app.patch(
+@router.patch(
     "/sessions/{session_id}",
     response_model=LearningSessionResponse,
     summary="Update session status or focus",
 )
-async def update_session(session_id: str, payload: LearningSessionUpdate) -> LearningSessionResponse:
+async def update_session(
+    session_id: str,
+    payload: LearningSessionUpdate,
+    graph: KnowledgeGraph = Depends(workspace_graph),
+) -> LearningSessionResponse:
     try:
         session = graph.update_session(
             session_id,
@@ -326,16 +887,20 @@ async def update_session(session_id: str, payload: LearningSessionUpdate) -> Lea
             current_focus=payload.current_focus,
         )
     except ValueError as error:
-        raise HTTPException(status_code=404, detail=str(error)) from error
-    return LearningSessionResponse(**session.__dict__)
+        raise _http_error(404, error) from error
+    return _session_to_response(session)
 
 
-@app.post(
+@router.post(
     "/curricula",
     response_model=CurriculumResponse,
     summary="Upload a curriculum outline to align with the knowledge graph",
 )
-async def upload_curriculum(payload: CurriculumUpload) -> CurriculumResponse:
+async def upload_curriculum(
+    payload: CurriculumUpload,
+    resolve: Resolve = "exact",
+    graph: KnowledgeGraph = Depends(workspace_graph),
+) -> CurriculumResponse:
     try:
         curriculum = graph.create_curriculum(
             title=payload.title,
@@ -343,47 +908,55 @@ async def upload_curriculum(payload: CurriculumUpload) -> CurriculumResponse:
             tags=payload.tags,
             source_url=payload.source_url,
             linked_concepts=payload.linked_concepts,
+            fuzzy=resolve == "fuzzy",
         )
     except ValueError as error:
-        raise HTTPException(status_code=422, detail=str(error)) from error
-    return CurriculumResponse(**curriculum.__dict__)
+        raise _http_error(422, error) from error
+    return _curriculum_to_response(curriculum)
 
 
-@app.get("/curricula", response_model=list[CurriculumResponse], summary="List uploaded curricula")
-async def list_curricula() -> list[CurriculumResponse]:
-    curricula = graph.list_curricula()
-    return [CurriculumResponse(**item.__dict__) for item in curricula]
+@router.get("/curricula", response_model=list[CurriculumResponse], summary="List uploaded curricula")
+async def list_curricula(graph: KnowledgeGraph = Depends(workspace_graph)) -> list[CurriculumResponse]:
+    curricula = graph.snapshot().list_curricula()
+    return [_curriculum_to_response(item) for item in curricula]
 
 
-@app.post(
+@router.post(
     "/quizzes/generate",
     response_model=QuizGenerationResponse,
     summary="Generate quick quiz questions for a concept",
 )
-async def generate_quiz(payload: QuizGenerationRequest) -> QuizGenerationResponse:
+async def generate_quiz(
+    payload: QuizGenerationRequest,
+    resolve: Resolve = "exact",
+    graph: KnowledgeGraph = Depends(workspace_graph),
+) -> QuizGenerationResponse:
     try:
-        questions = graph.generate_quiz(payload.concept, payload.count)
+        questions = graph.generate_quiz(payload.concept, payload.count, fuzzy=resolve == "fuzzy")
     except ValueError as error:
         detail = str(error)
         status = 404 if "Unknown concept" in detail else 422
-        raise HTTPException(status_code=status, detail=detail) from error
+        raise _http_error(status, error) from error
     return QuizGenerationResponse(
         questions=[QuizQuestionResponse(id=item.id, concept=item.concept, prompt=item.prompt, choices=item.choices) for item in questions]
     )
 
 
-@app.post(
+@router.post(
     "/quizzes/attempt",
     response_model=QuizAttemptResponse,
     summary="Check an answer for a generated quiz question",
 )
-async def attempt_quiz(payload: QuizAttemptRequest) -> QuizAttemptResponse:
+async def attempt_quiz(
+    payload: QuizAttemptRequest,
+    graph: KnowledgeGraph = Depends(workspace_graph),
+) -> QuizAttemptResponse:
     try:
         correct, question = graph.grade_quiz(payload.question_id, payload.selected_index)
     except ValueError as error:
         detail = str(error)
         status = 404 if "Unknown quiz question" in detail else 422
-        raise HTTPException(status_code=status, detail=detail) from error
+        raise _http_error(status, error) from error
     explanation = (
         "Great job! Keep exploring related concepts to reinforce the link."
         if correct
@@ -398,12 +971,16 @@ async def attempt_quiz(payload: QuizAttemptRequest) -> QuizAttemptResponse:
     )
 
 
-@app.post(
+@router.post(
     "/shares",
     response_model=IdeaShareResponse,
     summary="Publish a knowledge share for collaborators",
 )
-async def publish_share(payload: IdeaShareCreate) -> IdeaShareResponse:
+async def publish_share(
+    payload: IdeaShareCreate,
+    resolve: Resolve = "exact",
+    graph: KnowledgeGraph = Depends(workspace_graph),
+) -> IdeaShareResponse:
     try:
         share = graph.publish_share(
             author=payload.author,
@@ -413,68 +990,124 @@ async def publish_share(payload: IdeaShareCreate) -> IdeaShareResponse:
             linked_concepts=payload.linked_concepts,
             visibility=payload.visibility,
             authorized_handles=payload.authorized_handles,
+            fuzzy=resolve == "fuzzy",
         )
     except ValueError as error:
-        raise HTTPException(status_code=422, detail=str(error)) from error
+        raise _http_error(422, error) from error
     return _share_to_response(share)
 
 
-@app.get(
+@router.get(
     "/shares",
     response_model=list[IdeaShareResponse],
     summary="List knowledge shares visible to the viewer",
 )
-async def list_shares(viewer: Optional[str] = None) -> list[IdeaShareResponse]:
-    shares = graph.list_shares(viewer=viewer)
+async def list_shares(
+    viewer: Optional[str] = None,
+    graph: KnowledgeGraph = Depends(workspace_graph),
+) -> list[IdeaShareResponse]:
+    shares = graph.snapshot().list_shares(viewer=viewer)
     return [_share_to_response(item) for item in shares]
 
 
-@app.post(
+@router.post(
     "/shares/{share_id}/authorize",
     response_model=IdeaShareResponse,
     summary="Add collaborators to an existing share",
 )
-async def authorize_share(share_id: str, payload: IdeaShareAuthorize) -> IdeaShareResponse:
+async def authorize_share(
+    share_id: str,
+    payload: IdeaShareAuthorize,
+    graph: KnowledgeGraph = Depends(workspace_graph),
+) -> IdeaShareResponse:
     try:
         share = graph.authorize_share(share_id, payload.handles)
     except ValueError as error:
-        raise HTTPException(status_code=404, detail=str(error)) from error
+        raise _http_error(404, error) from error
     return _share_to_response(share)
 
 
-@app.get(
+@router.get(
     "/shares/matchups",
     response_model=list[IdeaMatchResponse],
     summary="Recommend relevant collaborator shares",
 )
-async def share_matchups(viewer: str, limit: int = 5) -> list[IdeaMatchResponse]:
+async def share_matchups(
+    viewer: str,
+    limit: int = 5,
+    graph: KnowledgeGraph = Depends(workspace_graph),
+) -> list[IdeaMatchResponse]:
     try:
-        matches = graph.affinity_for_viewer(viewer, limit=limit)
+        matches = graph.snapshot().affinity_for_viewer(viewer, limit=limit)
     except ValueError as error:
-        raise HTTPException(status_code=422, detail=str(error)) from error
+        raise _http_error(422, error) from error
     responses: list[IdeaMatchResponse] = []
     for match in matches:
         responses.append(
             IdeaMatchResponse(
                 share=_share_to_response(match.share),
                 affinity=match.affinity,
-                shared_tags=match.shared_tags,
-                complementary_tags=match.complementary_tags,
+                shared_tags=list(match.shared_tags),
+                complementary_tags=list(match.complementary_tags),
             )
         )
     return responses
 
 
-@app.get(
+@router.get(
     "/shares/compare",
     response_model=HandleComparisonResponse,
     summary="Compare overlaps between two handles",
 )
-async def compare_handles(handle_a: str, handle_b: str) -> HandleComparisonResponse:
-    shared, divergent = graph.compare_handles(handle_a, handle_b)
+async def compare_handles(
+    handle_a: str,
+    handle_b: str,
+    graph: KnowledgeGraph = Depends(workspace_graph),
+) -> HandleComparisonResponse:
+    shared, divergent = graph.snapshot().compare_handles(handle_a, handle_b)
     return HandleComparisonResponse(
         handle_a=handle_a,
         handle_b=handle_b,
         shared_tags=shared,
         divergent_tags=divergent,
     )
+
+
+@app.post(
+    "/workspaces",
+    response_model=WorkspaceResponse,
+    status_code=201,
+    summary="Create a workspace, optionally one that accepts prerequisite cycles",
+)
+async def create_workspace(payload: WorkspaceCreate) -> WorkspaceResponse:
+    try:
+        name = validate_workspace(payload.name)
+    except ValueError as error:
+        raise HTTPException(status_code=422, detail=str(error)) from error
+    try:
+        graph = workspaces.create(name, WorkspaceSettings(allow_cycles=payload.allow_cycles))
+    except ValueError as error:
+        raise HTTPException(status_code=409, detail=str(error)) from error
+    return WorkspaceResponse(name=name, allow_cycles=graph.allow_cycles)
+
+
+@app.get(
+    "/workspaces",
+    response_model=WorkspaceStatsResponse,
+    summary="Report resident workspaces, their estimated memory and cache counters",
+)
+async def workspace_stats() -> WorkspaceStatsResponse:
+    stats = workspaces.stats()
+    return WorkspaceStatsResponse(
+        hits=stats.hits,
+        misses=stats.misses,
+        evictions=stats.evictions,
+        saves=stats.saves,
+        resident=stats.resident,
+        resident_bytes=stats.resident_bytes,
+        memory_budget=stats.memory_budget,
+    )
+
+
+app.include_router(router)
+app.include_router(router, prefix="/w/{workspace}", dependencies=[Depends(_workspace_path)])
@@ -0,0 +1,127 @@
+"""Report the retained bytes per graph entity.
+
+Each record type is compared against an equivalent ``__dict__``-backed
+dataclass that stores lists and ``datetime`` objects, which is how the
+entities were laid out before they were slotted.
+
+Run with ``python -m benchmarks.entity_memory [count]``.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+import gc
+import sys
+import tracemalloc
+from typing import Callable, List, Optional
+from uuid import uuid4
+
+from app.core.graph import Curriculum, IdeaShare, KnowledgeNode, LearningSession, QuizQuestion
+
+TAG_POOL = ["python", "web", "api", "basics", "async", "testing", "data", "backend"]
+
+
+@dataclass
+class LegacyNode:
+    name: str
+    description: str = ""
+    tags: List[str] = field(default_factory=list)
+
+
+@dataclass
+class LegacySession:
+    id: str
+    name: str
+    description: str
+    focus_tags: List[str]
+    linked_concepts: List[str]
+    status: str = "active"
+    current_focus: Optional[str] = None
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+@dataclass
+class LegacyCurriculum:
+    id: str
+    title: str
+    description: str
+    tags: List[str]
+    source_url: Optional[str]
+    linked_concepts: List[str]
+    uploaded_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+@dataclass
+class LegacyQuizQuestion:
+    id: str
+    concept: str
+    prompt: str
+    choices: List[str]
+    correct_index: int
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+@dataclass
+class LegacyShare:
+    id: str
+    author: str
+    title: str
+    summary: str
+    tags: List[str]
+    linked_concepts: List[str]
+    visibility: str = "public"
+    authorized_handles: List[str] = field(default_factory=list)
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+def _tags(index: int) -> List[str]:
+    # Fresh string objects, as they would arrive from decoded JSON payloads.
+    return sorted({TAG_POOL[(index + offset) % len(TAG_POOL)].encode().decode() for offset in range(3)})
+
+
+def _measure(factory: Callable[[int], object], count: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    retained = [factory(index) for index in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del retained
+    return (after - before) / count
+
+
+def _factories():
+    return {
+        "KnowledgeNode": (
+            lambda i: KnowledgeNode(name=f"concept-{i}", tags=_tags(i)),
+            lambda i: LegacyNode(name=f"concept-{i}", tags=_tags(i)),
+        ),
+        "LearningSession": (
+            lambda i: LearningSession(str(uuid4()), f"s{i}", "", _tags(i), ["A", "B"]),
+            lambda i: LegacySession(str(uuid4()), f"s{i}", "", _tags(i), ["A", "B"]),
+        ),
+        "Curriculum": (
+            lambda i: Curriculum(str(uuid4()), f"c{i}", "", _tags(i), None, ["A"]),
+            lambda i: LegacyCurriculum(str(uuid4()), f"c{i}", "", _tags(i), None, ["A"]),
+        ),
+        "QuizQuestion": (
+            lambda i: QuizQuestion(str(uuid4()), "A", f"q{i}", ["A", "B", "C", "D"], 0),
+            lambda i: LegacyQuizQuestion(str(uuid4()), "A", f"q{i}", ["A", "B", "C", "D"], 0),
+        ),
+        "IdeaShare": (
+            lambda i: IdeaShare(str(uuid4()), "ada", f"t{i}", "summary", _tags(i), ["A"]),
+            lambda i: LegacyShare(str(uuid4()), "ada", f"t{i}", "summary", _tags(i), ["A"]),
+        ),
+    }
+
+
+def main(count: int = 50_000) -> None:
+    print(f"{'entity':<16} {'slotted':>10} {'dict-based':>11} {'saved':>7}")
+    for name, (compact, legacy) in _factories().items():
+        compact_bytes = _measure(compact, count)
+        legacy_bytes = _measure(legacy, count)
+        saved = 1 - compact_bytes / legacy_bytes
+        print(f"{name:<16} {compact_bytes:>8.0f} B {legacy_bytes:>9.0f} B {saved:>6.0%}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
@@ -1,6 +1,8 @@
+import json
+
 from fastapi.testclient import TestClient
 
-from app.main import app
+from app.main import app, workspaces
 
 
 client = TestClient(app)
@@ -32,6 +34,7 @@ def test_add_relationship_and_learning_path() -> None:
     path = [node["name"] for node in path_response.json()["path"]]
     assert path[0] == "Programming Fundamentals"
     assert path[-1] == "AsyncIO"
+    assert path_response.json()["explored"] >= len(path)
 
 
 def test_session_management() -> None:
@@ -119,3 +122,284 @@ def test_share_matchups_and_manifest() -> None:
     data = manifest.json()
     assert data["name"] == "wonder-knowledge"
     assert any(action["name"] == "publish_share" for action in data["actions"])
+
+
+def test_weighted_learning_path_reports_cost() -> None:
+    for name in ("Effort Start", "Effort Middle", "Effort Goal"):
+        client.post("/knowledge", json={"name": name})
+    client.post("/relationships", json={"source": "Effort Start", "target": "Effort Goal", "effort": 10})
+    client.post("/relationships", json={"source": "Effort Start", "target": "Effort Middle", "effort": 2})
+    client.post("/relationships", json={"source": "Effort Middle", "target": "Effort Goal", "effort": 3})
+    params = {"start": "Effort Start", "goal": "Effort Goal"}
+    hops = client.get("/learning-path", params=params).json()
+    assert [node["name"] for node in hops["path"]] == ["Effort Start", "Effort Goal"]
+    assert hops["total_cost"] == 10
+    weighted = client.get("/learning-path", params={**params, "mode": "weighted"}).json()
+    assert weighted["mode"] == "weighted"
+    assert [node["name"] for node in weighted["path"]] == ["Effort Start", "Effort Middle", "Effort Goal"]
+    assert weighted["total_cost"] == 5
+    rejected = client.post("/relationships", json={"source": "Effort Start", "target": "Effort Goal", "effort": 0})
+    assert rejected.status_code == 422
+    edges = client.get("/relationships").json()
+    assert {"source": "Effort Start", "target": "Effort Goal", "effort": 10.0} in edges
+
+
+def test_learning_paths_to_many_goals() -> None:
+    response = client.post(
+        "/learning-paths",
+        json={"start": "Programming Fundamentals", "goals": ["FastAPI", "Python", "Programming Fundamentals"]},
+    )
+    assert response.status_code == 200
+    body = response.json()
+    by_goal = {entry["goal"]: entry for entry in body["paths"]}
+    assert by_goal["FastAPI"]["reachable"] is True
+    assert by_goal["FastAPI"]["path"][0]["name"] == "Programming Fundamentals"
+    assert [node["name"] for node in by_goal["Python"]["path"]] == ["Programming Fundamentals", "Python"]
+    missing = client.post("/learning-paths", json={"start": "Python", "goals": ["Nope"]})
+    assert missing.status_code == 404
+
+
+def test_study_plan_endpoint() -> None:
+    response = client.get("/study-plan", params={"targets": ["FastAPI"]})
+    assert response.status_code == 200
+    plan = [node["name"] for node in response.json()["plan"]]
+    assert plan[0] == "Programming Fundamentals"
+    assert plan[-1] == "FastAPI"
+    assert plan.index("Python") < plan.index("FastAPI")
+    missing = client.get("/study-plan", params={"targets": ["Nope"]})
+    assert missing.status_code == 404
+
+
+def test_cyclic_relationship_rejected() -> None:
+    response = client.post("/relationships", json={"source": "FastAPI", "target": "Programming Fundamentals"})
+    assert response.status_code == 409
+    assert "would create a cycle" in response.json()["detail"]
+
+
+def test_reachability_endpoint() -> None:
+    response = client.get("/reachability", params={"source": "Programming Fundamentals", "target": "FastAPI"})
+    assert response.status_code == 200
+    assert response.json()["reachable"] is True
+    reverse = client.get("/reachability", params={"source": "FastAPI", "target": "Programming Fundamentals"})
+    assert reverse.json()["reachable"] is False
+    missing = client.get("/reachability", params={"source": "FastAPI", "target": "Nope"})
+    assert missing.status_code == 404
+
+
+def test_list_knowledge_by_tag() -> None:
+    response = client.get("/knowledge", params=[("tag", "python"), ("tag", "web"), ("match", "all")])
+    assert response.status_code == 200
+    assert [item["name"] for item in response.json()] == ["FastAPI"]
+
+    any_match = client.get("/knowledge", params=[("tag", "api"), ("tag", "basics"), ("match", "any")]).json()
+    names = [item["name"] for item in any_match]
+    assert names == sorted(names, key=str.lower)
+    assert {"Programming Fundamentals", "REST APIs"} <= set(names)
+
+    page = client.get("/knowledge", params={"offset": 1, "limit": 2}).json()
+    assert [item["name"] for item in page] == [item["name"] for item in client.get("/knowledge").json()[1:3]]
+
+    tags = client.get("/knowledge/tags").json()
+    assert {"tag": "python", "count": 2} in tags
+
+
+def test_search_knowledge() -> None:
+    response = client.get("/knowledge/search", params={"q": "python web"})
+    assert response.status_code == 200
+    results = response.json()
+    assert results[0]["name"] == "FastAPI"
+    assert results[0]["score"] >= results[-1]["score"]
+    assert client.get("/knowledge/search", params={"q": ""}).status_code == 422
+
+
+def test_complete_knowledge() -> None:
+    response = client.get("/knowledge/complete", params={"prefix": "p", "limit": 5})
+    assert response.status_code == 200
+    names = [item["name"] for item in response.json()]
+    assert {"Python", "Programming Fundamentals"} <= set(names)
+    assert names[0] == "Python"
+
+
+def test_unknown_concepts_include_suggestions() -> None:
+    response = client.get("/learning-path", params={"start": "Pyhton", "goal": "FastAPI"})
+    assert response.status_code == 404
+    body = response.json()
+    assert body["detail"] == "Unknown start node: Pyhton"
+    assert body["suggestions"]["Pyhton"][0] == "Python"
+
+    resolved = client.get("/learning-path", params={"start": "Pythn", "goal": "FastAPI", "resolve": "fuzzy"})
+    assert resolved.status_code == 200
+    assert resolved.json()["path"][0]["name"] == "Python"
+
+    session = client.post(
+        "/sessions",
+        params={"resolve": "fuzzy"},
+        json={"name": "Typos", "focus_tags": [], "linked_concepts": ["FastAPl", "Python"]},
+    )
+    assert session.status_code == 200
+    assert session.json()["linked_concepts"] == ["FastAPI", "Python"]
+
+
+def test_bulk_ingestion_endpoints() -> None:
+    nodes = [{"name": f"Bulk Topic {index}", "tags": ["Bulk "]} for index in range(3)]
+    response = client.post("/knowledge/bulk", json={"nodes": nodes})
+    assert response.status_code == 200
+    assert response.json() == {"created": 3, "updated": 0, "errors": []}
+    assert client.get("/knowledge/Bulk Topic 0").json()["tags"] == ["bulk"]
+
+    relationships = [
+        {"source": "Bulk Topic 0", "target": "Bulk Topic 1"},
+        {"source": "Bulk Topic 1", "target": "Bulk Topic 2", "effort": 3},
+        {"source": "Bulk Topic 2", "target": "Missing Topic"},
+    ]
+    rejected = client.post("/relationships/bulk", json={"relationships": relationships})
+    assert rejected.status_code == 422
+    assert [error["index"] for error in rejected.json()["errors"]] == [2]
+
+    partial = client.post("/relationships/bulk", json={"relationships": relationships, "atomic": False})
+    assert partial.status_code == 200
+    assert partial.json()["created"] == 2
+    assert partial.json()["errors"][0]["detail"] == "Unknown target node: Missing Topic"
+    path = client.get("/learning-path", params={"start": "Bulk Topic 0", "goal": "Bulk Topic 2"}).json()
+    assert [node["name"] for node in path["path"]] == ["Bulk Topic 0", "Bulk Topic 1", "Bulk Topic 2"]
+
+
+def test_ndjson_import_endpoint() -> None:
+    body = (
+        b'{"type": "edge", "source": "Imported Basics", "target": "Imported Advanced"}\n'
+        b'{"type": "node", "name": "Imported Basics", "tags": ["imported"]}\n'
+        b"oops\n"
+        b'{"type": "node", "name": "Imported Advanced"}\n'
+    )
+    response = client.post("/import", content=body, headers={"Content-Type": "application/x-ndjson"})
+    assert response.status_code == 200
+    stats = response.json()
+    assert (stats["nodes_created"], stats["edges_created"], stats["error_count"]) == (2, 1, 1)
+    assert stats["errors"][0]["line"] == 3 and stats["done"] is True
+    assert client.get("/import").json() == stats
+    assert client.get("/knowledge/Imported Advanced").json()["prerequisites"][0]["name"] == "Imported Basics"
+
+
+def test_export_streams_ndjson_and_csv() -> None:
+    response = client.get("/export", params={"include": ["nodes", "edges"]})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in response.text.splitlines()]
+    names = {record["name"] for record in records if record["type"] == "node"}
+    assert {"Python", "FastAPI"} <= names
+    assert {"type": "edge", "source": "Python", "target": "FastAPI", "effort": 1.0} in records
+
+    table = client.get("/export", params={"format": "csv", "include": "sessions"})
+    assert table.headers["content-type"].startswith("text/csv")
+    assert table.text.splitlines()[0].startswith("type,id,name,description,focus_tags")
+
+
+def test_workspaces_are_isolated() -> None:
+    for name in ["team-red", "team-blue"]:
+        assert client.post("/workspaces", json={"name": name}).status_code == 201
+    created = client.post("/w/team-red/knowledge", json={"name": "Red Only", "tags": ["red"]})
+    assert created.status_code == 200
+    assert [node["name"] for node in client.get("/w/team-red/knowledge").json()] == ["Red Only"]
+    assert client.get("/knowledge/Red Only").status_code == 404
+    assert client.get("/w/team-blue/knowledge").json() == []
+    assert client.get("/w/bad.name/knowledge").status_code == 422
+
+    stats = client.get("/workspaces").json()
+    assert stats["resident"] >= 3 and stats["misses"] >= 2
+    assert 0 < stats["resident_bytes"] <= stats["memory_budget"]
+
+
+def test_unknown_workspaces_are_not_created_by_requests() -> None:
+    assert client.get("/w/team-typo/knowledge").status_code == 404
+    assert client.post("/w/team-typo/knowledge", json={"name": "Lost"}).status_code == 404
+    assert "team-typo" not in workspaces
+    created = client.post("/workspaces", json={"name": "team-typo", "allow_cycles": True})
+    assert created.status_code == 201 and created.json()["allow_cycles"] is True
+
+
+def test_neighborhood_endpoint() -> None:
+    client.post("/workspaces", json={"name": "hood"})
+    for name in ["Basics", "Python", "FastAPI"]:
+        client.post("/w/hood/knowledge", json={"name": name})
+    client.post("/w/hood/relationships", json={"source": "Basics", "target": "Python"})
+    client.post("/w/hood/relationships", json={"source": "Python", "target": "FastAPI", "effort": 2})
+
+    response = client.get("/w/hood/graph/neighborhood", params={"center": "python", "depth": 1, "direction": "down"})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["center"] == "Python"
+    assert [(node["name"], node["distance"]) for node in body["nodes"]] == [("Python", 0), ("FastAPI", 1)]
+    assert body["edges"] == [{"source": "Python", "target": "FastAPI", "effort": 2.0}]
+    assert not body["node_limit_reached"] and not body["depth_limit_reached"]
+
+    missing = client.get("/w/hood/graph/neighborhood", params={"center": "Pythn"})
+    assert missing.status_code == 404 and "Python" in missing.json()["suggestions"]["Pythn"]
+
+
+def test_graph_stats_endpoint() -> None:
+    client.post("/workspaces", json={"name": "stats"})
+    for name, tags in [("Root", ["core"]), ("Leaf", ["core", "extra"]), ("Alone", [])]:
+        client.post("/w/stats/knowledge", json={"name": name, "tags": tags})
+    client.post("/w/stats/relationships", json={"source": "Root", "target": "Leaf"})
+
+    body = client.get("/w/stats/graph/stats").json()
+    assert (body["nodes"], body["edges"], body["roots"], body["leaves"], body["isolated"]) == (3, 1, 2, 2, 1)
+    assert body["in_degrees"] == {"0": 2, "1": 1} and body["out_degrees"] == {"0": 2, "1": 1}
+    assert body["tags"] == {"core": 2, "extra": 1}
+
+
+def test_graph_layout_endpoint() -> None:
+    client.post("/workspaces", json={"name": "layout"})
+    for name in ["Basics", "Middle", "Advanced"]:
+        client.post("/w/layout/knowledge", json={"name": name})
+    client.post("/w/layout/relationships", json={"source": "Basics", "target": "Middle"})
+    client.post("/w/layout/relationships", json={"source": "Middle", "target": "Advanced"})
+
+    body = client.get("/w/layout/graph/layout").json()
+    assert body["rings"] == 3
+    assert [(node["name"], node["level"]) for node in body["nodes"]] == [("Basics", 0), ("Middle", 1), ("Advanced", 2)]
+    assert [node["radius"] for node in body["nodes"]] == [
+        body["base_radius"] + level * body["ring_step"] for level in range(3)
+    ]
+
+    client.post("/w/layout/relationships", json={"source": "Basics", "target": "Advanced"})
+    client.request("DELETE", "/w/layout/relationships", json={"source": "Middle", "target": "Advanced"})
+    updated = client.get("/w/layout/graph/layout").json()
+    assert updated["version"] > body["version"]
+    assert {node["name"]: node["level"] for node in updated["nodes"]} == {"Basics": 0, "Middle": 1, "Advanced": 1}
+
+
+def test_list_knowledge_sorted_by_importance() -> None:
+    client.post("/workspaces", json={"name": "ranked"})
+    for name in ["Advanced", "Basics", "Middle"]:
+        client.post("/w/ranked/knowledge", json={"name": name})
+    client.post("/w/ranked/relationships", json={"source": "Basics", "target": "Middle"})
+    client.post("/w/ranked/relationships", json={"source": "Middle", "target": "Advanced"})
+    assert client.get("/w/ranked/knowledge/Basics").json()["importance"] is None
+
+    workspaces.get("ranked").refresh_importance()
+    ranked = client.get("/w/ranked/knowledge", params={"sort": "importance"}).json()
+    assert [node["name"] for node in ranked] == ["Basics", "Middle", "Advanced"]
+    assert client.get("/w/ranked/knowledge/Basics").json()["importance"]["out_centrality"] == 0.5
+
+
+def test_graph_cycles_endpoint() -> None:
+    assert client.get("/graph/cycles").json() == {"total_components": 0, "total_concepts": 0, "components": []}
+    assert client.get("/graph/cycles", params={"limit": 0}).status_code == 422
+
+    # Only workspaces created to allow cycles can hold loops.
+    created = client.post("/workspaces", json={"name": "loops", "allow_cycles": True})
+    assert created.status_code == 201 and created.json() == {"name": "loops", "allow_cycles": True}
+    assert client.post("/workspaces", json={"name": "loops"}).status_code == 409
+    assert client.post("/workspaces", json={"name": "../x"}).status_code == 422
+    for name in ["Sets", "Logic", "Proofs"]:
+        client.post("/w/loops/knowledge", json={"name": name})
+    for source, target in [("Sets", "Logic"), ("Logic", "Proofs"), ("Proofs", "Sets")]:
+        client.post("/w/loops/relationships", json={"source": source, "target": target})
+
+    body = client.get("/w/loops/graph/cycles", params={"max_members": 2}).json()
+    assert (body["total_components"], body["total_concepts"]) == (1, 3)
+    component = body["components"][0]
+    assert (component["size"], component["edges"]) == (3, 3)
+    assert [node["name"] for node in component["nodes"]] == ["Logic", "Proofs"]
+    assert component["cycle"] == ["Logic", "Proofs", "Sets", "Logic"]
@@ -0,0 +1,33 @@
+import random
+
+from app.core import completion
+from app.core.completion import PrefixIndex
+
+
+def test_completions_rank_by_score_then_name() -> None:
+    ranks = {"python": 1, "pandas": 3, "pytest": 3, "rust": 5}
+    index = PrefixIndex(ranks.keys, lambda key: ranks[key])
+
+    assert index.complete("p") == ["pandas", "pytest", "python"]
+    assert index.complete("py", limit=1) == ["pytest"]
+    assert index.complete("x") == []
+
+    ranks["pygame"] = 9
+    index.add("pygame")
+    assert index.complete("py") == ["pygame", "pytest", "python"]
+    index.remove("pytest")
+    assert index.complete("py") == ["pygame", "python"]
+
+
+def test_cached_prefixes_follow_rank_changes(monkeypatch) -> None:
+    monkeypatch.setattr(completion, "SCAN_LIMIT", 2)
+    rng = random.Random(5)
+    ranks = {f"{letter}{index}": 0 for letter in "ab" for index in range(20)}
+    index = PrefixIndex(lambda: list(ranks), lambda key: ranks[key])
+    for _ in range(200):
+        key = rng.choice(sorted(ranks))
+        ranks[key] = rng.randrange(10)
+        index.touch(key)
+        prefix = rng.choice(["", "a", "b", "a1", key[:2]])
+        expected = sorted((key for key in ranks if key.startswith(prefix)), key=lambda key: (-ranks[key], key))
+        assert index.complete(prefix, 5) == expected[:5]
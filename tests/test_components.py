@@ -0,0 +1,48 @@
+import random
+from typing import Dict, List, Set
+
+from app.core.components import Condensation, shortest_cycle, strongly_connected_components
+
+
+def _reachable(edges: Dict[str, List[str]], start: str) -> Set[str]:
+    seen: Set[str] = set()
+    stack = [start]
+    while stack:
+        for child in edges[stack.pop()]:
+            if child not in seen:
+                seen.add(child)
+                stack.append(child)
+    return seen
+
+
+def test_components_match_mutual_reachability() -> None:
+    rng = random.Random(3)
+    keys = [f"k{index}" for index in range(60)]
+    edges: Dict[str, List[str]] = {key: [] for key in keys}
+    for _ in range(90):
+        edges[rng.choice(keys)].append(rng.choice(keys))
+
+    reach = {key: _reachable(edges, key) for key in keys}
+    condensation = Condensation(keys, edges.__getitem__)
+    for source in keys:
+        for target in keys:
+            same = source == target or (target in reach[source] and source in reach[target])
+            assert (condensation.component[source] == condensation.component[target]) == same
+        component = condensation.component[source]
+        assert condensation.cyclic[component] == (source in reach[source])
+        # Components are numbered in topological order.
+        assert all(child > component for child in condensation.successors(component))
+
+
+def test_deep_chains_do_not_recurse() -> None:
+    keys = [str(index) for index in range(50_000)]
+    edges = {key: [keys[index + 1]] if index + 1 < len(keys) else [keys[0]] for index, key in enumerate(keys)}
+    components = strongly_connected_components(keys, edges.__getitem__)
+    assert len(components) == 1 and len(components[0]) == len(keys)
+
+
+def test_shortest_cycle_stays_inside_members() -> None:
+    edges = {"a": ["b", "x"], "b": ["c", "a"], "c": ["a"], "x": ["a"]}
+    assert shortest_cycle("a", {"a", "b", "c"}, edges.__getitem__) == ["a", "b", "a"]
+    assert shortest_cycle("c", {"a", "b", "c"}, edges.__getitem__) == ["c", "a", "b", "c"]
+    assert shortest_cycle("x", {"x"}, edges.__getitem__) is None
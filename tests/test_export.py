@@ -0,0 +1,57 @@
+import csv
+import io
+import json
+
+from app.core.export import ExportCursor, csv_chunks, ndjson_chunks
+from app.core.graph import KnowledgeGraph, KnowledgeNode
+from app.core.importer import NDJSONImporter
+
+
+def _graph() -> KnowledgeGraph:
+    graph = KnowledgeGraph()
+    for name in ["A", "B", "C", "D"]:
+        graph.add_node(KnowledgeNode(name=name, description=f"About {name}", tags=["letters"]))
+    graph.add_relationship("A", "B", effort=2)
+    graph.add_relationship("B", "C")
+    graph.add_relationship("C", "D")
+    graph.create_session("Letters", "", ["letters"], ["A", "B"])
+    return graph
+
+
+def test_export_stays_consistent_while_the_graph_changes() -> None:
+    graph = _graph()
+    expected = list(ExportCursor(graph))
+    rows = iter(ExportCursor(graph))
+    seen = [next(rows), next(rows)]
+    # Writes between rows must not leak into (or break) the export in progress.
+    graph.add_node(KnowledgeNode(name="C", description="Rewritten"))
+    graph.remove_node("D")
+    graph.add_node(KnowledgeNode(name="E"))
+    graph.add_relationship("A", "E")
+    seen.extend(rows)
+    assert seen == expected
+    assert [row["type"] for row in seen].count("edge") == 3
+
+    fresh = [row["name"] for row in ExportCursor(graph, ["nodes"])]
+    assert sorted(fresh) == ["A", "B", "C", "E"]
+
+
+def test_ndjson_export_round_trips_through_import() -> None:
+    graph = _graph()
+    importer = NDJSONImporter(KnowledgeGraph())
+    for chunk in ndjson_chunks(ExportCursor(graph, ["nodes", "edges"])):
+        importer.feed(chunk.encode())
+    stats = importer.finish()
+    assert (stats.nodes_created, stats.edges_created, stats.error_count) == (4, 3, 0)
+    assert importer.graph.relationship_effort("A", "B") == 2.0
+
+    sessions = [json.loads(line) for line in "".join(ndjson_chunks(ExportCursor(graph, ["sessions"]))).splitlines()]
+    assert sessions[0]["linked_concepts"] == ["A", "B"]
+
+
+def test_csv_export_uses_one_header_for_all_sections() -> None:
+    cursor = ExportCursor(_graph(), ["edges", "nodes"])
+    table = list(csv.reader(io.StringIO("".join(csv_chunks(cursor, cursor.sections)))))
+    assert table[0] == ["type", "name", "description", "tags", "source", "target", "effort"]
+    assert ["node", "A", "About A", "letters", "", "", ""] in table
+    assert ["edge", "", "", "", "A", "B", "2.0"] in table
@@ -0,0 +1,31 @@
+import random
+
+from app.core import fuzzy
+from app.core.fuzzy import TrigramIndex, trigrams
+
+
+def test_suggestions_rank_closest_spellings_first() -> None:
+    index = TrigramIndex()
+    for key in ["python", "pytorch", "fastapi", "rest apis"]:
+        index.add(key)
+    assert [key for key, _ in index.suggest("pyton")][0] == "python"
+    assert index.suggest("zzzz") == []
+    index.remove("python")
+    assert all(key != "python" for key, _ in index.suggest("pyton"))
+
+
+def test_prefix_filter_finds_every_match_above_threshold() -> None:
+    rng = random.Random(2)
+    keys = {"".join(rng.choices("abcde", k=rng.randrange(3, 9))) for _ in range(300)}
+    index = TrigramIndex()
+    for key in keys:
+        index.add(key)
+    for _ in range(100):
+        query = "".join(rng.choices("abcde", k=rng.randrange(2, 9)))
+        grams = trigrams(query)
+        expected = {
+            key
+            for key in keys
+            if 2 * len(grams & trigrams(key)) / (len(grams) + len(trigrams(key))) >= fuzzy.MIN_SIMILARITY
+        }
+        assert {key for key, _ in index.suggest(query, limit=len(keys))} == expected
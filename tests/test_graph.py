@@ -1,11 +1,25 @@
+from datetime import datetime, timezone
+import math
+import random
+from typing import Dict, List
+
 import pytest
 
-from app.core.graph import KnowledgeGraph, KnowledgeNode
+from app.core.graph import (
+    REACHABILITY_REBUILD_AFTER,
+    CycleError,
+    KnowledgeGraph,
+    KnowledgeNode,
+    UnknownConceptError,
+    timestamp_to_datetime,
+)
+from app.core.layout import BASE_RADIUS, RING_STEP
+from app.core.reachability import reaches_by_search
 
 
-@pytest.fixture()
-def graph() -> KnowledgeGraph:
-    instance = KnowledgeGraph()
+@pytest.fixture(params=["sets", "csr"])
+def graph(request: pytest.FixtureRequest) -> KnowledgeGraph:
+    instance = KnowledgeGraph(storage=request.param)
     instance.add_node(KnowledgeNode(name="A", description="Alpha foundations", tags=["foundational"]))
     instance.add_node(KnowledgeNode(name="B", description="Beta concept", tags=["intermediate"]))
     instance.add_node(KnowledgeNode(name="C", description="Gamma advanced", tags=["advanced"]))
@@ -60,7 +74,7 @@ def test_create_curriculum(graph: KnowledgeGraph) -> None:
         linked_concepts=["B"],
     )
     assert curriculum.linked_concepts == ["B"]
-    assert curriculum.tags == ["intermediate"]
+    assert curriculum.tags == ("intermediate",)
 
 
 def test_generate_and_grade_quiz(graph: KnowledgeGraph) -> None:
@@ -101,3 +115,670 @@ def test_share_publication_and_matching(graph: KnowledgeGraph) -> None:
     assert matches
     shared, divergent = graph.compare_handles("alpha", "delta")
     assert "practice" in shared or "practice" in divergent
+
+
+def test_dependents_track_mutations(graph: KnowledgeGraph) -> None:
+    graph.add_node(KnowledgeNode(name="D"))
+    graph.add_node(KnowledgeNode(name="E"))
+    assert [node.name for node in graph.dependents("A")] == ["B"]
+    graph.add_relationship("A", "E")
+    graph.add_relationship("A", "D")
+    assert [node.name for node in graph.dependents("A")] == ["B", "D", "E"]
+    graph.remove_relationship("A", "D")
+    graph.remove_node("B")
+    assert [node.name for node in graph.dependents("A")] == ["E"]
+    assert graph.dependents("C") == []
+
+
+def test_prerequisite_cache_invalidates_descendants(graph: KnowledgeGraph) -> None:
+    graph.add_node(KnowledgeNode(name="Z"))
+    assert [node.name for node in graph.prerequisites("C")] == ["B", "A"]
+    assert graph.prerequisites("Z") == []
+    graph.prerequisites("C")
+    stats = graph.prerequisite_cache_stats()
+    assert (stats.hits, stats.misses, stats.size) == (1, 2, 2)
+
+    graph.add_relationship("Z", "B")
+    assert [node.name for node in graph.prerequisites("C")] == ["B", "A", "Z"]
+    # Z is not downstream of the new edge, so its entry survives.
+    graph.prerequisites("Z")
+    assert graph.prerequisite_cache_stats().hits == 2
+
+    graph.remove_relationship("A", "B")
+    assert [node.name for node in graph.prerequisites("C")] == ["B", "Z"]
+    graph.remove_node("Z")
+    assert [node.name for node in graph.prerequisites("C")] == ["B"]
+
+
+def _hop_distance(graph: KnowledgeGraph, start: str, goal: str):
+    distances = {start: 0}
+    frontier = [start]
+    while frontier:
+        next_frontier = []
+        for current in frontier:
+            for node in graph.dependents(current):
+                if node.name not in distances:
+                    distances[node.name] = distances[current] + 1
+                    next_frontier.append(node.name)
+        frontier = next_frontier
+    return distances.get(goal)
+
+
+def test_bidirectional_path_matches_bfs_length() -> None:
+    rng = random.Random(11)
+    instance = KnowledgeGraph(allow_cycles=True)
+    names = [f"n{index}" for index in range(40)]
+    for name in names:
+        instance.add_node(KnowledgeNode(name=name))
+    for _ in range(90):
+        instance.add_relationship(rng.choice(names), rng.choice(names))
+
+    for _ in range(200):
+        start, goal = rng.choice(names), rng.choice(names)
+        expected = _hop_distance(instance, start, goal)
+        if expected is None:
+            with pytest.raises(ValueError):
+                instance.shortest_path(start, goal)
+            continue
+        result = instance.find_path(start, goal)
+        keys = [node.name for node in result.path]
+        assert keys[0] == start and keys[-1] == goal
+        assert len(keys) - 1 == expected
+        for source, target in zip(keys, keys[1:]):
+            assert target in {node.name for node in instance.dependents(source)}
+        assert result.explored >= len(keys)
+
+
+def test_find_path_explores_less_than_graph_on_wide_fanout() -> None:
+    instance = KnowledgeGraph()
+    instance.add_node(KnowledgeNode(name="root"))
+    instance.add_node(KnowledgeNode(name="goal"))
+    for index in range(200):
+        instance.add_node(KnowledgeNode(name=f"leaf{index}"))
+        instance.add_relationship("root", f"leaf{index}")
+    instance.add_relationship("leaf7", "goal")
+    result = instance.find_path("root", "goal")
+    assert [node.name for node in result.path] == ["root", "leaf7", "goal"]
+    assert result.explored < 10
+
+
+def test_weighted_path_prefers_lower_effort(graph: KnowledgeGraph) -> None:
+    graph.add_relationship("A", "C", effort=5.0)
+    assert [node.name for node in graph.shortest_path("A", "C")] == ["A", "C"]
+    result = graph.find_weighted_path("A", "C")
+    assert [node.name for node in result.path] == ["A", "B", "C"]
+    assert result.cost == 2.0
+    graph.add_relationship("A", "C", effort=1.5)
+    assert graph.relationship_effort("A", "C") == 1.5
+    result = graph.find_weighted_path("A", "C")
+    assert [node.name for node in result.path] == ["A", "C"]
+    assert result.cost == 1.5
+    with pytest.raises(ValueError):
+        graph.add_relationship("A", "B", effort=0)
+    graph.remove_relationship("A", "C")
+    graph.remove_relationship("B", "C")
+    with pytest.raises(ValueError):
+        graph.find_weighted_path("A", "C")
+
+
+@pytest.mark.parametrize("storage", ["sets", "csr"])
+def test_weighted_path_matches_exhaustive_costs(storage: str) -> None:
+    rng = random.Random(5)
+    instance = KnowledgeGraph(storage=storage)
+    names = [f"n{index}" for index in range(30)]
+    for name in names:
+        instance.add_node(KnowledgeNode(name=name))
+    edges = {}
+    for _ in range(80):
+        source, target = sorted(rng.sample(range(30), 2))
+        effort = rng.choice([0.5, 1.0, 2.0, 3.5])
+        instance.add_relationship(names[source], names[target], effort=effort)
+        edges[(names[source], names[target])] = effort
+
+    best = {}
+    for start in names:
+        # Bellman-Ford style relaxation is plenty for 30 nodes.
+        costs = {start: 0.0}
+        for _ in names:
+            for (source, target), effort in edges.items():
+                if source in costs and costs[source] + effort < costs.get(target, float("inf")):
+                    costs[target] = costs[source] + effort
+        best[start] = costs
+
+    for start in names:
+        for goal in names:
+            if goal not in best[start]:
+                with pytest.raises(ValueError):
+                    instance.find_weighted_path(start, goal)
+                continue
+            result = instance.find_weighted_path(start, goal)
+            assert result.cost == pytest.approx(best[start][goal])
+            keys = [node.name for node in result.path]
+            assert sum(edges[pair] for pair in zip(keys, keys[1:])) == pytest.approx(result.cost)
+
+
+def test_shortest_paths_from_many_goals(graph: KnowledgeGraph) -> None:
+    graph.add_node(KnowledgeNode(name="D"))
+    graph.add_relationship("A", "C", effort=4.0)
+    hops = graph.shortest_paths_from("A", ["C", "b", "D", "A"])
+    assert [node.name for node in hops["C"].path] == ["A", "C"]
+    assert [node.name for node in hops["b"].path] == ["A", "B"]
+    assert hops["D"] is None
+    assert [node.name for node in hops["A"].path] == ["A"]
+    weighted = graph.shortest_paths_from("A", ["C"], weighted=True)
+    assert [node.name for node in weighted["C"].path] == ["A", "B", "C"]
+    assert weighted["C"].cost == 2.0
+    with pytest.raises(ValueError):
+        graph.shortest_paths_from("A", ["C", "missing"])
+
+
+def test_study_plan_orders_prerequisites_and_reports_cycles(graph: KnowledgeGraph) -> None:
+    graph.add_node(KnowledgeNode(name="D"))
+    graph.add_node(KnowledgeNode(name="E"))
+    graph.add_relationship("D", "C")
+    graph.add_relationship("D", "E")
+    plan = [node.name for node in graph.study_plan(["C", "e"])]
+    assert plan == ["A", "B", "D", "C", "E"]
+    assert graph.study_plan(["E", "C"]) == graph.study_plan(["C", "E"])
+    assert graph.study_plan([]) == []
+    with pytest.raises(ValueError, match="Unknown concept"):
+        graph.study_plan(["missing"])
+
+
+def test_study_plan_reports_cycles_when_allowed() -> None:
+    instance = KnowledgeGraph(allow_cycles=True)
+    for name in ("A", "B", "C"):
+        instance.add_node(KnowledgeNode(name=name))
+    instance.add_relationship("A", "B")
+    instance.add_relationship("B", "C")
+    instance.add_relationship("C", "A")
+    with pytest.raises(ValueError, match="A -> B -> C -> A"):
+        instance.study_plan(["C"])
+
+
+def test_add_relationship_rejects_cycles(graph: KnowledgeGraph) -> None:
+    with pytest.raises(CycleError) as excinfo:
+        graph.add_relationship("C", "A")
+    assert excinfo.value.cycle == ["C", "A", "B", "C"]
+    with pytest.raises(CycleError):
+        graph.add_relationship("B", "B")
+    assert [node.name for node in graph.dependents("C")] == []
+    graph.remove_relationship("B", "C")
+    graph.add_relationship("C", "A")
+    assert [node.name for node in graph.study_plan(["B"])] == ["C", "A", "B"]
+
+
+def test_incremental_order_matches_reachability() -> None:
+    rng = random.Random(3)
+    instance = KnowledgeGraph()
+    names = [f"n{index}" for index in range(25)]
+    for name in names:
+        instance.add_node(KnowledgeNode(name=name))
+    for _ in range(300):
+        source, target = rng.choice(names), rng.choice(names)
+        reachable = source == target or any(
+            node.name == target for node in instance.prerequisites(source)
+        )
+        if reachable:
+            with pytest.raises(CycleError):
+                instance.add_relationship(source, target)
+        else:
+            instance.add_relationship(source, target)
+        edges = [(edge[0].name, edge[1].name) for edge in instance.list_relationships()]
+        if edges and rng.random() < 0.1:
+            instance.remove_relationship(*rng.choice(edges))
+    order = instance._topological_order
+    for source, target in instance.list_relationships():
+        assert order.position(source.name) < order.position(target.name)
+
+
+@pytest.mark.parametrize("storage", ["sets", "csr"])
+def test_is_prerequisite_matches_closures(storage: str) -> None:
+    rng = random.Random(21)
+    instance = KnowledgeGraph(storage=storage)
+    names = [f"n{index}" for index in range(60)]
+    for name in names:
+        instance.add_node(KnowledgeNode(name=name))
+    for _ in range(150):
+        source, target = sorted(rng.sample(range(60), 2))
+        instance.add_relationship(names[source], names[target])
+
+    closures = {name: {node.name for node in instance.prerequisites(name)} for name in names}
+    # Enough queries to move past the stale-index search fallback and use the index.
+    for _ in range(3):
+        for source in names:
+            for target in names:
+                assert instance.is_prerequisite(source, target) == (source in closures[target])
+    assert instance._reachability is not None
+
+    instance.remove_relationship(*[(s.name, t.name) for s, t in instance.list_relationships()][0])
+    closures = {name: {node.name for node in instance.prerequisites(name)} for name in names}
+    for source in names:
+        for target in names:
+            assert instance.is_prerequisite(source, target) == (source in closures[target])
+    with pytest.raises(ValueError):
+        instance.is_prerequisite("n1", "missing")
+
+
+def test_reachability_index_waits_for_writes_to_settle(graph: KnowledgeGraph) -> None:
+    # Interleaved writes restart the stale-query count, so the index is never rebuilt.
+    for index in range(3 * REACHABILITY_REBUILD_AFTER):
+        graph.add_node(KnowledgeNode(name=f"Extra {index}"))
+        assert graph.is_prerequisite("A", "C")
+    assert graph._reachability is None
+
+    for _ in range(REACHABILITY_REBUILD_AFTER):
+        assert not graph.is_prerequisite("C", "A")
+    assert graph._reachability is not None
+
+
+def test_is_prerequisite_with_cycles_allowed() -> None:
+    instance = KnowledgeGraph(allow_cycles=True)
+    for name in ("A", "B", "C"):
+        instance.add_node(KnowledgeNode(name=name))
+    instance.add_relationship("A", "B")
+    instance.add_relationship("B", "A")
+    for _ in range(20):
+        assert instance.is_prerequisite("A", "B")
+        assert instance.is_prerequisite("A", "A")
+        assert not instance.is_prerequisite("A", "C")
+
+
+@pytest.mark.parametrize("storage", ["sets", "csr"])
+def test_cyclic_reachability_goes_through_condensation(storage: str) -> None:
+    rng = random.Random(9)
+    instance = KnowledgeGraph(storage=storage, allow_cycles=True)
+    names = [f"n{index}" for index in range(40)]
+    instance.add_nodes_bulk([KnowledgeNode(name=name) for name in names])
+    instance.add_relationships_bulk([(rng.choice(names), rng.choice(names), None) for _ in range(70)])
+    pairs = [(rng.choice(names), rng.choice(names)) for _ in range(300)]
+    expected = [reaches_by_search(instance._adjacency, source, target) for source, target in pairs]
+    # Early queries are answered by search until the index is built over the components.
+    assert [instance.is_prerequisite(source, target) for source, target in pairs] == expected
+    assert instance._reachability_components is not None
+
+
+def test_cycles_report_loops_to_break() -> None:
+    instance = KnowledgeGraph(allow_cycles=True)
+    instance.add_nodes_bulk([KnowledgeNode(name=name) for name in ["A", "B", "C", "D", "E", "Solo"]])
+    instance.add_relationships_bulk(
+        [
+            ("A", "B", None),
+            ("B", "C", None),
+            ("C", "A", None),
+            ("C", "B", None),
+            ("D", "E", None),
+            ("Solo", "Solo", None),
+        ]
+    )
+
+    report = instance.cycles(max_members=2)
+    assert (report.total_components, report.total_concepts) == (2, 4)
+    loop, self_loop = report.components
+    assert (loop.size, loop.edges, [node.name for node in loop.nodes]) == (3, 4, ["A", "B"])
+    assert loop.cycle == ["A", "B", "C", "A"]
+    assert (self_loop.size, self_loop.cycle) == (1, ["Solo", "Solo"])
+    assert instance.condensation() is instance.condensation()
+
+    instance.remove_relationship("C", "A")
+    assert [component.cycle for component in instance.cycles().components] == [["B", "C", "B"], ["Solo", "Solo"]]
+    assert KnowledgeGraph().cycles().total_components == 0
+
+
+def test_records_are_slotted_with_shared_tags(graph: KnowledgeGraph) -> None:
+    first = KnowledgeNode(name="X", tags=["python", "web"])
+    second = KnowledgeNode(name="Y", tags=["".join(["pyth", "on"])])
+    assert not hasattr(first, "__dict__")
+    assert first.tags == ("python", "web")
+    assert first.tags[0] is second.tags[0]
+
+    graph.add_node(first)
+    graph.add_node(KnowledgeNode(name="x", tags=["api"]))
+    assert graph.get_node("X").tags == ("api", "python", "web")
+
+    share = graph.publish_share(author="ada", title="Notes", summary="Recap", tags=["web"], linked_concepts=[])
+    created = timestamp_to_datetime(share.created_at)
+    assert isinstance(share.created_at, int)
+    assert abs((datetime.now(timezone.utc) - created).total_seconds()) < 60
+
+
+def test_tag_index_tracks_merges_and_removals(graph: KnowledgeGraph) -> None:
+    graph.add_node(KnowledgeNode(name="D", tags=["intermediate", "practice"]))
+    graph.add_node(KnowledgeNode(name="a", tags=["practice"]))
+
+    assert [node.name for node in graph.nodes_with_tags(["practice"])] == ["A", "D"]
+    assert [node.name for node in graph.nodes_with_tags(["practice", "intermediate"])] == ["D"]
+    assert [node.name for node in graph.nodes_with_tags(["advanced", "practice"], match="any")] == ["A", "C", "D"]
+    assert graph.nodes_with_tags(["missing", "practice"]) == []
+    assert graph.tag_counts()[0] == ("intermediate", 2)
+
+    graph.remove_node("D")
+    assert [node.name for node in graph.nodes_with_tags(["practice"])] == ["A"]
+    assert dict(graph.tag_counts()) == {"foundational": 1, "practice": 1, "intermediate": 1, "advanced": 1}
+    with pytest.raises(ValueError):
+        graph.nodes_with_tags(["practice"], match="some")
+
+
+def test_tag_lookup_ignores_case(graph: KnowledgeGraph) -> None:
+    graph.add_node(KnowledgeNode(name="Web", tags=["Web", "web"]))
+    assert [node.name for node in graph.nodes_with_tags(["Web"])] == ["Web"]
+    assert [node.name for node in graph.nodes_with_tags(["WEB"])] == ["Web"]
+    graph.remove_node("Web")
+    assert graph.nodes_with_tags(["web"]) == []
+
+
+def test_search_follows_merges_and_removals(graph: KnowledgeGraph) -> None:
+    assert [node.name for node, _ in graph.search("beta")] == ["B"]
+    graph.add_node(KnowledgeNode(name="c", description="Builds on beta ideas"))
+    assert [node.name for node, _ in graph.search("beta")] == ["B", "C"]
+    graph.remove_node("B")
+    assert [node.name for node, _ in graph.search("beta")] == ["C"]
+
+
+def test_complete_ranks_by_in_degree(graph: KnowledgeGraph) -> None:
+    graph.add_node(KnowledgeNode(name="Beta Testing"))
+    assert [node.name for node in graph.complete("b")] == ["B", "Beta Testing"]
+    graph.add_relationship("A", "Beta Testing")
+    graph.add_relationship("C", "Beta Testing")
+    assert [node.name for node in graph.complete("B")] == ["Beta Testing", "B"]
+    graph.remove_node("C")
+    graph.remove_relationship("A", "Beta Testing")
+    assert [node.name for node in graph.complete("b")] == ["B", "Beta Testing"]
+
+
+def test_unknown_names_carry_suggestions_and_fuzzy_resolution(graph: KnowledgeGraph) -> None:
+    graph.add_node(KnowledgeNode(name="Gradient Descent"))
+    with pytest.raises(UnknownConceptError) as raised:
+        graph.generate_quiz("Gradient Decsent")
+    assert raised.value.suggestions == {"Gradient Decsent": ["Gradient Descent"]}
+
+    questions = graph.generate_quiz("gradient descnt", fuzzy=True)
+    assert questions[0].concept == "Gradient Descent"
+    # Short, ambiguous names are never auto-resolved.
+    with pytest.raises(UnknownConceptError):
+        graph.find_path("D", "C", fuzzy=True)
+
+
+@pytest.mark.parametrize("storage", ["sets", "csr"])
+def test_bulk_ingestion_matches_single_adds(storage: str) -> None:
+    rng = random.Random(15)
+    names = [f"Topic {index}" for index in range(40)]
+    edges = []
+    for _ in range(120):
+        first, second = sorted(rng.sample(range(40), 2))
+        edges.append((names[first], names[second], float(rng.randint(1, 5))))
+
+    single = KnowledgeGraph(storage=storage)
+    for name in names:
+        single.add_node(KnowledgeNode(name=name, description=f"About {name}"))
+    for source, target, effort in edges:
+        single.add_relationship(source, target, effort=effort)
+
+    bulk = KnowledgeGraph(storage=storage)
+    result = bulk.add_nodes_bulk(KnowledgeNode(name=name, description=f"About {name}") for name in names)
+    assert (result.created, result.updated, result.errors) == (40, 0, [])
+    assert bulk.add_relationships_bulk(edges).errors == []
+
+    def snapshot(instance: KnowledgeGraph):
+        return sorted(
+            (source.name, target.name, instance.relationship_effort(source.name, target.name))
+            for source, target in instance.list_relationships()
+        )
+
+    assert snapshot(bulk) == snapshot(single)
+    assert [node.name for node, _ in bulk.search("topic 7")] == [node.name for node, _ in single.search("topic 7")]
+    order = bulk._topological_order
+    for source, target in bulk.list_relationships():
+        assert order.position(source.name.lower()) < order.position(target.name.lower())
+
+
+def test_bulk_errors_are_atomic_or_per_item(graph: KnowledgeGraph) -> None:
+    rejected = graph.add_nodes_bulk([KnowledgeNode(name="D"), KnowledgeNode(name=" ")])
+    assert rejected.errors == [(1, "Name cannot be empty")]
+    assert graph.get_node("D") is None
+
+    partial = graph.add_nodes_bulk([KnowledgeNode(name="D"), KnowledgeNode(name=""), KnowledgeNode(name="a")], atomic=False)
+    assert (partial.created, partial.updated, partial.errors) == (1, 1, [(1, "Name cannot be empty")])
+
+    batch = [("C", "D", 2.0), ("D", "A", None), ("A", "Nope", None)]
+    rejected = graph.add_relationships_bulk(batch)
+    assert [index for index, _ in rejected.errors] == [2]
+    assert not graph.is_prerequisite("C", "D")
+
+    cyclic = graph.add_relationships_bulk(batch[:2])
+    assert cyclic.created == 0
+    assert "would create a cycle" in cyclic.errors[0][1]
+    assert not graph.is_prerequisite("C", "D")
+
+    partial = graph.add_relationships_bulk(batch, atomic=False)
+    assert partial.created == 1
+    assert [index for index, _ in partial.errors] == [1, 2]
+    assert graph.relationship_effort("C", "D") == 2.0
+    assert not graph.is_prerequisite("D", "A")
+
+
+def test_snapshots_are_isolated_from_later_writes(graph: KnowledgeGraph) -> None:
+    session = graph.create_session("Study", "", [], ["A"])
+    before = graph.snapshot()
+    assert graph.snapshot() is before
+
+    graph.add_node(KnowledgeNode(name="B", description="Rewritten"))
+    graph.add_node(KnowledgeNode(name="D"))
+    graph.add_relationship("C", "D", effort=3)
+    graph.remove_relationship("A", "B")
+    graph.update_session(session.id, status="paused")
+
+    assert before.get_node("B").description == "Beta concept"
+    assert before.get_node("D") is None
+    assert [node.name for node in before.prerequisites("C")] == ["B", "A"]
+    assert before.list_sessions()[0].status == "active"
+
+    after = graph.snapshot()
+    assert after.version > before.version
+    assert after.get_node("B").description == "Rewritten"
+    assert [(s.name, t.name, effort) for s, t, effort in after.relationships()] == [("B", "C", 1.0), ("C", "D", 3)]
+    assert [node.name for node in after.prerequisites("D")] == ["C", "B"]
+    assert after.list_sessions()[0].status == "paused"
+    # Untouched shards are shared between versions rather than copied.
+    shared = sum(old is new for old, new in zip(before._shards, after._shards))
+    assert shared >= len(before._shards) - 4
+
+
+def test_old_snapshots_are_reclaimed_once_released() -> None:
+    import gc
+    import weakref
+
+    graph = KnowledgeGraph()
+    graph.add_node(KnowledgeNode(name="A"))
+    pinned = graph.snapshot()
+    reference = weakref.ref(pinned)
+    graph.add_node(KnowledgeNode(name="B"))
+    assert graph.snapshot().get_node("B") is not None
+    assert reference() is not None
+    del pinned
+    gc.collect()
+    assert reference() is None
+
+
+def test_snapshot_publishes_writes_between_reads_once(graph: KnowledgeGraph) -> None:
+    before = graph.snapshot()
+    graph.add_nodes_bulk(KnowledgeNode(name=f"Leaf {index}") for index in range(50))
+    for index in range(50):
+        graph.add_relationship("A", f"Leaf {index}")
+        graph.create_session(f"Study {index}", "", [], ["A"])
+
+    after = graph.snapshot()
+    assert after.version == before.version + 1
+    assert graph.snapshot() is after
+    assert len(after.list_sessions()) == 50 and before.list_sessions() == []
+    assert len(after._entry("a").successors) == 51 and len(before._entry("a").successors) == 1
+
+
+def test_snapshot_closures_survive_unrelated_writes(graph: KnowledgeGraph) -> None:
+    graph.add_node(KnowledgeNode(name="D"))
+    graph.add_relationship("A", "D")
+    view = graph.snapshot()
+    assert [node.name for node in view.prerequisites("C")] == ["B", "A"]
+    assert [node.name for node in view.prerequisites("D")] == ["A"]
+
+    graph.create_session("Study", "", [], ["A"])
+    assert set(graph.snapshot()._closures) == {"c", "d"}
+
+    # Only the target of a changed edge and what builds on it are dropped.
+    graph.add_node(KnowledgeNode(name="E"))
+    graph.add_relationship("E", "B")
+    after = graph.snapshot()
+    assert set(after._closures) == {"d"} and set(view._closures) == {"c", "d"}
+    assert [node.name for node in after.prerequisites("C")] == [node.name for node in graph.prerequisites("C")]
+    assert [node.name for node in view.prerequisites("C")] == ["B", "A"]
+
+
+@pytest.mark.parametrize("storage", ["sets", "csr"])
+def test_snapshot_tracks_random_writes(storage: str) -> None:
+    rng = random.Random(18)
+    instance = KnowledgeGraph(storage=storage)
+    names = [f"n{index}" for index in range(30)]
+    instance.add_nodes_bulk(KnowledgeNode(name=name) for name in names[:20])
+    instance.snapshot()
+    for step in range(200):
+        nodes = instance.list_nodes()
+        choice = rng.random()
+        if choice < 0.1:
+            instance.add_node(KnowledgeNode(name=rng.choice(names), description=f"step {step}"))
+        elif choice < 0.15 and len(nodes) > 5:
+            instance.remove_node(rng.choice(nodes).name)
+        elif choice < 0.3 and instance.list_relationships():
+            source, target = rng.choice(instance.list_relationships())
+            instance.remove_relationship(source.name, target.name)
+        else:
+            source, target = rng.sample(nodes, 2)
+            try:
+                instance.add_relationship(source.name, target.name, effort=rng.choice([None, 2.0]))
+            except CycleError:
+                pass
+        if step % 40 == 0:
+            instance.snapshot()
+    view = instance.snapshot()
+    assert [node.name for node in view.list_nodes()] == [node.name for node in instance.list_nodes()]
+    live = [(s.name, t.name, instance.relationship_effort(s.name, t.name)) for s, t in instance.list_relationships()]
+    assert [(s.name, t.name, effort) for s, t, effort in view.relationships()] == live
+    for node in instance.list_nodes():
+        assert view.prerequisites(node.name) == instance.prerequisites(node.name)
+
+
+def test_neighborhood_returns_induced_subgraph(graph: KnowledgeGraph) -> None:
+    graph.add_node(KnowledgeNode(name="D"))
+    graph.add_node(KnowledgeNode(name="E"))
+    graph.add_relationship("A", "C", effort=3)
+    graph.add_relationship("C", "D")
+    graph.add_relationship("E", "A")
+
+    around = graph.neighborhood("b", depth=1)
+    assert [node.name for node in around.nodes] == ["B", "A", "C"]
+    assert around.distances == [0, 1, 1]
+    assert around.edges == [("A", "B", 1.0), ("A", "C", 3.0), ("B", "C", 1.0)]
+    assert around.depth_limit_reached and not around.node_limit_reached
+
+    upstream = graph.neighborhood("C", depth=5, direction="up")
+    assert [node.name for node in upstream.nodes] == ["C", "A", "B", "E"]
+    assert not upstream.depth_limit_reached
+
+    capped = graph.neighborhood("A", depth=3, direction="down", max_nodes=2)
+    assert [node.name for node in capped.nodes] == ["A", "B"] and capped.node_limit_reached
+    with pytest.raises(ValueError):
+        graph.neighborhood("A", direction="sideways")
+
+
+@pytest.mark.parametrize("storage", ["sets", "csr"])
+@pytest.mark.parametrize("allow_cycles", [False, True])
+def test_stats_track_random_edits(storage: str, allow_cycles: bool) -> None:
+    rng = random.Random(7)
+    graph = KnowledgeGraph(storage=storage, allow_cycles=allow_cycles)
+    names = [f"N{index}" for index in range(30)]
+    for _ in range(400):
+        roll = rng.random()
+        try:
+            if roll < 0.15:
+                graph.add_node(KnowledgeNode(name=rng.choice(names), tags=(rng.choice("xyz"),)))
+            elif roll < 0.25:
+                graph.remove_node(rng.choice(names))
+            elif roll < 0.35:
+                graph.remove_relationship(rng.choice(names), rng.choice(names))
+            elif roll < 0.45:
+                edges = [(rng.choice(names), rng.choice(names), None) for _ in range(6)]
+                graph.add_relationships_bulk(edges, atomic=rng.random() < 0.5)
+            else:
+                graph.add_relationship(rng.choice(names), rng.choice(names))
+        except ValueError:
+            pass
+
+        stats = graph.stats()
+        nodes = graph.list_nodes()
+        in_degrees = [graph.in_degree(node.name) for node in nodes]
+        out_degrees = [len(graph._adjacency.successors(node.name.lower())) for node in nodes]
+        assert stats.nodes == len(nodes) and stats.edges == len(graph.list_relationships())
+        assert stats.in_degrees == {degree: in_degrees.count(degree) for degree in sorted(set(in_degrees))}
+        assert stats.out_degrees == {degree: out_degrees.count(degree) for degree in sorted(set(out_degrees))}
+        assert stats.roots == in_degrees.count(0) and stats.leaves == out_degrees.count(0)
+        assert stats.isolated == sum(1 for i, o in zip(in_degrees, out_degrees) if i == 0 and o == 0)
+        assert stats.tags == dict(graph.tag_counts())
+
+
+@pytest.mark.parametrize("storage", ["sets", "csr"])
+def test_layout_levels_follow_random_edits(storage: str) -> None:
+    rng = random.Random(11)
+    graph = KnowledgeGraph(storage=storage)
+    names = [f"N{index}" for index in range(40)]
+    graph.layout()
+    for _ in range(300):
+        roll = rng.random()
+        try:
+            if roll < 0.15:
+                graph.add_node(KnowledgeNode(name=rng.choice(names)))
+            elif roll < 0.25:
+                graph.remove_node(rng.choice(names))
+            elif roll < 0.4:
+                graph.remove_relationship(rng.choice(names), rng.choice(names))
+            elif roll < 0.5:
+                edges = [(rng.choice(names), rng.choice(names), None) for _ in range(6)]
+                graph.add_relationships_bulk(edges, atomic=False)
+            else:
+                graph.add_relationship(rng.choice(names), rng.choice(names))
+        except ValueError:
+            pass
+
+        layout = graph.layout()
+        placed = {placement.name: placement for placement in layout.nodes}
+        assert sorted(placed) == sorted(node.name for node in graph.list_nodes())
+        parents: Dict[str, List[str]] = {name: [] for name in placed}
+        for source, target in graph.list_relationships():
+            parents[target.name].append(source.name)
+        for name, placement in placed.items():
+            assert placement.level == max((placed[parent].level + 1 for parent in parents[name]), default=0)
+            assert placement.radius == BASE_RADIUS + placement.level * RING_STEP
+            assert math.isclose(math.hypot(placement.x, placement.y), placement.radius)
+        assert layout.rings == len({placement.level for placement in layout.nodes})
+
+
+def test_layout_spreads_each_ring_and_handles_cycles() -> None:
+    graph = KnowledgeGraph(allow_cycles=True)
+    graph.add_nodes_bulk([KnowledgeNode(name=name) for name in ["Root", "A", "B", "Loop 1", "Loop 2"]])
+    graph.add_relationships_bulk(
+        [("Root", "A", None), ("Root", "B", None), ("Loop 1", "Loop 2", None), ("Loop 2", "Loop 1", None)]
+    )
+
+    layout = graph.layout()
+    assert [(placement.name, placement.level) for placement in layout.nodes] == [
+        ("Root", 0),
+        ("A", 1),
+        ("B", 1),
+        ("Loop 1", 2),
+        ("Loop 2", 2),
+    ]
+    a, b = layout.nodes[1], layout.nodes[2]
+    assert math.isclose(abs(b.angle - a.angle), math.pi)
+    version = layout.version
+    assert graph.layout().version == version
+    graph.add_relationship("B", "Loop 1")
+    assert graph.layout().version > version
+    assert {placement.name: placement.level for placement in graph.layout().nodes}["Loop 2"] == 3
@@ -0,0 +1,117 @@
+import asyncio
+import math
+from typing import Iterator, Optional
+
+import pytest
+
+from app.core import importance
+from app.core.graph import KnowledgeGraph, KnowledgeNode
+from app.core.importance import ImportanceScheduler, PageRank
+
+
+def _curriculum() -> KnowledgeGraph:
+    graph = KnowledgeGraph()
+    graph.add_nodes_bulk([KnowledgeNode(name=name) for name in ["Math", "Algebra", "Stats", "Calculus", "ML", "Art"]])
+    graph.add_relationships_bulk(
+        [
+            ("Math", "Algebra", None),
+            ("Math", "Stats", None),
+            ("Algebra", "Calculus", None),
+            ("Calculus", "ML", None),
+            ("Stats", "ML", None),
+        ]
+    )
+    return graph
+
+
+def test_pagerank_ranks_foundations_first() -> None:
+    graph = _curriculum()
+    assert graph.importance_stale() and graph.importance("Math") is None
+    graph.refresh_importance()
+
+    ranked = [node.name for node in graph.sort_by_importance(graph.list_nodes())]
+    # Nothing builds on Art or ML, so both keep only the base score and tie by name.
+    assert ranked[:2] == ["Math", "Algebra"] and ranked[-2:] == ["Art", "ML"]
+    scores = {name: graph.importance(name) for name in ranked}
+    assert math.isclose(sum(score.pagerank for score in scores.values()), 1.0)
+    assert scores["Calculus"].pagerank == pytest.approx(scores["Stats"].pagerank)
+    assert (scores["ML"].in_centrality, scores["Math"].out_centrality) == (0.4, 0.4)
+
+    # A job started before a write is discarded rather than stored.
+    job = graph.importance_job()
+    graph.remove_node("Art")
+    assert graph.importance_stale() and not graph.apply_importance(job.run())
+    graph.refresh_importance()
+    assert not graph.importance_stale() and graph.importance("Art") is None
+
+
+def test_pure_python_iteration_matches_vectorised(monkeypatch: pytest.MonkeyPatch) -> None:
+    if importance.numpy is None:
+        pytest.skip("NumPy is not installed")
+    graph = _curriculum()
+    vectorised = graph.importance_job().run().scores()
+    monkeypatch.setattr(importance, "numpy", None)
+    plain = graph.importance_job().run().scores()
+    for key, score in plain.items():
+        assert score.pagerank == pytest.approx(vectorised[key].pagerank)
+
+
+def test_scheduler_recomputes_once_writes_settle(monkeypatch: pytest.MonkeyPatch) -> None:
+    graph = _curriculum()
+    jobs = []
+    original = KnowledgeGraph.importance_job_steps
+
+    def counting_steps(self: KnowledgeGraph) -> Iterator[Optional[PageRank]]:
+        jobs.append(self)
+        return original(self)
+
+    monkeypatch.setattr(KnowledgeGraph, "importance_job_steps", counting_steps)
+
+    async def burst() -> None:
+        scheduler = ImportanceScheduler(delay=0.05)
+        for index in range(5):
+            graph.add_node(KnowledgeNode(name=f"Extra {index}"))
+            scheduler.schedule("default", graph)
+            await asyncio.sleep(0.01)
+        assert scheduler.pending("default") and not jobs
+        await asyncio.sleep(0.2)
+        assert not scheduler.pending("default")
+
+    asyncio.run(burst())
+    assert len(jobs) == 1 and not graph.importance_stale()
+    assert graph.importance("Extra 4") is not None
+
+
+def test_copy_is_chunked_and_abandoned_after_a_write(monkeypatch: pytest.MonkeyPatch) -> None:
+    graph = _curriculum()
+    steps = graph.importance_job_steps(chunk=2)
+    assert [next(steps) for _ in range(3)] == [None, None, None]
+    assert next(steps).run().scores() == graph.importance_job().run().scores()
+
+    steps = graph.importance_job_steps(chunk=2)
+    next(steps)
+    graph.add_relationship("Art", "ML")
+    assert list(steps) == []
+
+    runs = []
+    original = KnowledgeGraph.importance_job_steps
+
+    def interrupted_steps(self: KnowledgeGraph) -> Iterator[Optional[PageRank]]:
+        runs.append(self)
+        steps = original(self)
+        yield next(steps)
+        if len(runs) == 1:
+            self.add_node(KnowledgeNode(name="Late"))
+        yield from steps
+
+    monkeypatch.setattr(KnowledgeGraph, "importance_job_steps", interrupted_steps)
+
+    async def refresh() -> None:
+        scheduler = ImportanceScheduler(delay=0.01)
+        scheduler.schedule("default", graph)
+        await asyncio.sleep(0.2)
+        assert not scheduler.pending("default")
+
+    asyncio.run(refresh())
+    # The write mid-copy made the scheduler wait out another delay and copy again.
+    assert len(runs) == 2 and graph.importance("Late") is not None
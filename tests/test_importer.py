@@ -0,0 +1,73 @@
+import json
+
+from app.core.export import ExportCursor, ndjson_chunks
+from app.core.graph import KnowledgeGraph, KnowledgeNode
+from app.core.importer import MAX_LINE_BYTES, NDJSONImporter
+
+
+def _ndjson(*records) -> bytes:
+    return b"".join(json.dumps(record).encode() + b"\n" for record in records)
+
+
+def test_import_defers_forward_references_across_chunks() -> None:
+    graph = KnowledgeGraph()
+    progress = []
+    importer = NDJSONImporter(graph, chunk_records=2, on_progress=lambda stats: progress.append(stats.lines))
+    data = _ndjson(
+        {"type": "edge", "source": "Algebra", "target": "Calculus", "effort": 2},
+        {"type": "node", "name": "Algebra", "tags": ["Math "]},
+        {"type": "node", "name": "Calculus"},
+        {"type": "edge", "source": "Calculus", "target": "Physics"},
+        {"type": "node", "name": "Physics", "description": "Motion"},
+    )
+    # Feed in pieces that split records mid-line.
+    for start in range(0, len(data), 7):
+        importer.feed(data[start:start + 7])
+    stats = importer.finish()
+
+    assert (stats.lines, stats.nodes_created, stats.edges_created) == (5, 3, 2)
+    assert stats.edges_deferred == 2
+    assert stats.errors == [] and stats.done
+    assert progress and progress == sorted(progress)
+    assert graph.relationship_effort("Algebra", "Calculus") == 2.0
+    assert graph.get_node("algebra").tags == ("math",)
+    assert [node.name for node in graph.shortest_path("Algebra", "Physics")] == ["Algebra", "Calculus", "Physics"]
+
+
+def test_import_reports_bad_lines_and_keeps_going() -> None:
+    graph = KnowledgeGraph()
+    importer = NDJSONImporter(graph)
+    importer.feed(b'{"type": "node", "name": "A"}\n')
+    importer.feed(b"not json\n\n[1, 2]\n")
+    importer.feed(b'{"type": "node", "name": ""}\n{"type": "edge", "source": "A", "target": "Z"}\n')
+    importer.feed(b'{"type": "node", "name": "' + b"x" * (MAX_LINE_BYTES + 1))
+    importer.feed(b'"}\n{"type": "node", "name": "B"}\n{"type": "edge", "source": "B", "target": "A"}\n')
+    importer.feed(b'{"type": "edge", "source": "A", "target": "B"}')
+    stats = importer.finish()
+
+    assert stats.nodes_created == 2
+    assert stats.edges_created == 1
+    assert [line for line, _ in stats.errors] == [2, 4, 5, 6, 7, 10]
+    assert stats.errors[4] == (7, "Line exceeds 1048576 bytes")
+    assert stats.errors[3] == (6, "Unknown target node: Z")
+    assert "would create a cycle" in stats.errors[5][1]
+
+
+def test_import_restores_exported_records() -> None:
+    source = KnowledgeGraph()
+    source.add_node(KnowledgeNode(name="Python"))
+    source.create_session("Sprint", "Go fast", ["Web"], ["Python"])
+    source.create_curriculum("Course", "", ["web"], "https://example.com", ["Python"])
+    share = source.publish_share(author="ana", title="Idea", summary="Notes", tags=["web"], linked_concepts=[])
+    source.authorize_share(share.id, ["bo"])
+
+    graph = KnowledgeGraph()
+    importer = NDJSONImporter(graph)
+    for chunk in ndjson_chunks(ExportCursor(source)):
+        importer.feed(chunk.encode())
+    stats = importer.finish()
+
+    assert stats.records_restored == 3 and stats.errors == []
+    assert graph.list_sessions() == source.list_sessions()
+    assert graph.list_curricula() == source.list_curricula()
+    assert graph.list_shares("bo") == source.list_shares("bo")
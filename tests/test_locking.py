@@ -0,0 +1,190 @@
+import random
+import sys
+import threading
+import time
+from typing import List
+
+import pytest
+
+from app.core.graph import KnowledgeGraph, KnowledgeNode
+from app.core.locking import ReadWriteLock
+
+
+def test_waiting_writer_blocks_new_readers() -> None:
+    lock = ReadWriteLock()
+    events: List[str] = []
+    writer_waiting = threading.Event()
+
+    def writer() -> None:
+        writer_waiting.set()
+        with lock.write():
+            events.append("write")
+
+    def late_reader() -> None:
+        with lock.read():
+            events.append("late read")
+
+    lock.acquire_read()
+    threads = [threading.Thread(target=writer)]
+    threads[0].start()
+    writer_waiting.wait()
+    while not lock._waiting_writers:
+        time.sleep(0.001)
+    threads.append(threading.Thread(target=late_reader))
+    threads[1].start()
+    time.sleep(0.05)
+    assert events == []
+    lock.release_read()
+    for thread in threads:
+        thread.join(timeout=5)
+    assert events == ["write", "late read"]
+    stats = lock.stats()
+    assert stats.reads == 2 and stats.writes == 1
+    assert stats.max_write_wait >= 0.05 and stats.write_wait >= stats.max_write_wait
+
+
+def test_lock_is_reentrant_but_refuses_upgrades() -> None:
+    lock = ReadWriteLock()
+    with lock.write():
+        with lock.read():
+            with lock.write():
+                pass
+    with lock.read():
+        with lock.read():
+            pass
+        with pytest.raises(RuntimeError):
+            lock.acquire_write()
+    assert lock.stats().reads == 1 and lock.stats().writes == 1
+    # Fully released: another thread can write straight away.
+    thread = threading.Thread(target=lambda: lock.write().__enter__())
+    thread.start()
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+
+
+@pytest.mark.parametrize("storage", ["sets", "csr"])
+def test_concurrent_writes_and_reads_keep_graph_consistent(storage: str) -> None:
+    graph = KnowledgeGraph(storage=storage, thread_safe=True)
+    names = [f"Concept {index}" for index in range(40)]
+    for name in names:
+        graph.add_node(KnowledgeNode(name=name, tags=("stress",)))
+    graph.snapshot()
+    failures: List[BaseException] = []
+    writers_done = threading.Event()
+
+    def writer(seed: int) -> None:
+        rng = random.Random(seed)
+        try:
+            for _ in range(600):
+                if rng.random() < 0.1:
+                    name = rng.choice(names)
+                    try:
+                        graph.remove_node(name)
+                    except ValueError:
+                        pass
+                    graph.add_node(KnowledgeNode(name=name, tags=("stress",)))
+                else:
+                    try:
+                        graph.add_relationship(rng.choice(names), rng.choice(names))
+                    except ValueError:
+                        pass
+        except BaseException as error:  # pragma: no cover - reported below
+            failures.append(error)
+
+    def reader(seed: int) -> None:
+        rng = random.Random(seed)
+        try:
+            while not writers_done.is_set():
+                start, goal = rng.choice(names), rng.choice(names)
+                with graph.reading():
+                    try:
+                        path = graph.shortest_path(start, goal)
+                    except ValueError:
+                        path = []
+                    # The whole path must exist in the state the read saw.
+                    for source, target in zip(path, path[1:]):
+                        graph.relationship_effort(source.name, target.name)
+                try:
+                    closure = graph.prerequisites(goal)
+                except ValueError:
+                    continue
+                assert goal not in {node.name for node in closure}
+        except BaseException as error:  # pragma: no cover - reported below
+            failures.append(error)
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-5)
+    try:
+        readers = [threading.Thread(target=reader, args=(seed,)) for seed in range(4)]
+        writers = [threading.Thread(target=writer, args=(seed,)) for seed in range(100, 103)]
+        for thread in readers + writers:
+            thread.start()
+        for thread in writers:
+            thread.join(timeout=60)
+        writers_done.set()
+        for thread in readers:
+            thread.join(timeout=60)
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert failures == []
+    adjacency = graph._adjacency
+    edges = list(adjacency.edges())
+    assert len(edges) == adjacency.edge_count()
+    keys = {name.lower() for name in names}
+    order = graph._topological_order
+    for source, target in edges:
+        assert source in keys and target in keys
+        assert source in adjacency.predecessors(target)
+        assert order.position(source) < order.position(target)
+    for key in keys:
+        assert sorted(adjacency.successors(key)) == graph._successors_in_order(key)
+    for key, closure in graph._prerequisite_cache.items():
+        assert closure == graph._prerequisite_closure(key)
+    assert [(source.name, target.name) for source, target, _ in graph.snapshot().relationships()] == [
+        (source.name, target.name) for source, target in graph.list_relationships()
+    ]
+    stats = graph.lock_stats()
+    assert stats.writes >= 1800 and stats.reads > 0
+
+
+def test_snapshot_can_be_taken_under_the_read_lock() -> None:
+    graph = KnowledgeGraph(thread_safe=True)
+    graph.add_node(KnowledgeNode(name="A"))
+    with graph.reading():
+        first = graph.snapshot()
+    graph.add_node(KnowledgeNode(name="B"))
+    with graph.reading():
+        second = graph.snapshot()
+    assert first.get_node("B") is None and second.get_node("B") is not None
+
+
+def test_readers_are_not_starved_by_looping_writers() -> None:
+    lock = ReadWriteLock()
+    stop = threading.Event()
+    reads: List[float] = []
+
+    def writer() -> None:
+        while not stop.is_set():
+            with lock.write():
+                time.sleep(0.001)
+
+    def reader() -> None:
+        for _ in range(20):
+            with lock.read():
+                reads.append(time.perf_counter())
+
+    writers = [threading.Thread(target=writer) for _ in range(3)]
+    for thread in writers:
+        thread.start()
+    time.sleep(0.01)
+    started = time.perf_counter()
+    thread = threading.Thread(target=reader)
+    thread.start()
+    thread.join(timeout=1.0)
+    stop.set()
+    for other in writers:
+        other.join(timeout=5)
+    # Each read waits for at most the writer holding the lock in its phase.
+    assert len(reads) == 20 and reads[-1] - started < 0.5
+    assert lock.stats().max_read_wait < 0.1
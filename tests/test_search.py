@@ -0,0 +1,78 @@
+from collections import Counter
+import math
+import random
+
+from app.core.search import TextIndex
+import app.core.search as search
+
+
+def test_name_matches_outrank_description_matches() -> None:
+    index = TextIndex()
+    index.add("python", "Python", "General purpose language", ["programming"])
+    index.add("fastapi", "FastAPI", "Python web framework", ["web"])
+    index.add("rest", "REST APIs", "Architectural style for web services", ["api"])
+
+    assert [key for key, _ in index.search("python")] == ["python", "fastapi"]
+    assert [key for key, _ in index.search("web")][0] == "fastapi"
+    assert index.search("the") == []
+    assert index.search("unknown") == []
+
+
+def test_reindex_and_remove_update_postings() -> None:
+    index = TextIndex()
+    index.add("a", "Alpha", "first letter")
+    index.add("b", "Beta", "second letter")
+    index.add("a", "Alpha", "renamed entry")
+    assert [key for key, _ in index.search("letter")] == ["b"]
+    index.remove("b")
+    assert index.search("letter") == []
+    assert len(index) == 1
+    assert index.posting_count() == 3
+
+
+def _brute_force(documents, query, limit):
+    frequencies = {}
+    for key, (name, description) in documents.items():
+        counts = Counter()
+        for token in search.tokenize(name):
+            counts[token] += 3
+        for token in search.tokenize(description):
+            counts[token] += 1
+        frequencies[key] = counts
+    average = sum(sum(counts.values()) for counts in frequencies.values()) / len(frequencies)
+    scores = {}
+    for key, counts in frequencies.items():
+        length = sum(counts.values())
+        score = 0.0
+        for term in set(search.tokenize(query)):
+            if term in counts:
+                df = sum(1 for other in frequencies.values() if term in other)
+                idf = math.log(1 + (len(frequencies) - df + 0.5) / (df + 0.5))
+                score += idf * counts[term] * 2.2 / (counts[term] + 1.2 * (0.25 + 0.75 * length / average))
+        if score:
+            scores[key] = score
+    return sorted(scores.values(), reverse=True)[:limit]
+
+
+def test_top_k_matches_exhaustive_bm25(monkeypatch) -> None:
+    rng = random.Random(11)
+    vocabulary = [f"t{index}" for index in range(40)]
+    # A tiny threshold forces the impact-ordered path for most terms.
+    for threshold in (search.EXHAUSTIVE_POSTINGS, 3):
+        monkeypatch.setattr(search, "EXHAUSTIVE_POSTINGS", threshold)
+        index = TextIndex()
+        documents = {}
+        for _ in range(300):
+            key = f"d{rng.randrange(100)}"
+            if rng.random() < 0.2:
+                index.remove(key)
+                documents.pop(key, None)
+                continue
+            name = " ".join(rng.choices(vocabulary, k=2))
+            description = " ".join(rng.choices(vocabulary[:15], k=rng.randrange(1, 8)))
+            index.add(key, name, description)
+            documents[key] = (name, description)
+        for _ in range(100):
+            query = " ".join(rng.sample(vocabulary, rng.randrange(1, 4)))
+            expected = _brute_force(documents, query, 5)
+            assert [round(score, 9) for _, score in index.search(query, 5)] == [round(score, 9) for score in expected]
@@ -0,0 +1,115 @@
+import random
+
+import pytest
+
+from app.core.graph import KnowledgeGraph
+from app.core.storage import CSRAdjacency, SetAdjacency, create_adjacency
+
+
+def _populate(adjacency, keys, edges) -> None:
+    for key in keys:
+        adjacency.add_node(key)
+    for source, target in edges:
+        adjacency.add_edge(source, target)
+
+
+def test_engines_agree_under_random_mutations() -> None:
+    rng = random.Random(7)
+    keys = [f"n{index}" for index in range(60)]
+    sets, csr = SetAdjacency(), CSRAdjacency(min_compact=16)
+    for adjacency in (sets, csr):
+        for key in keys:
+            adjacency.add_node(key)
+
+    for _ in range(2000):
+        source, target = rng.choice(keys), rng.choice(keys)
+        if rng.random() < 0.7:
+            assert sets.add_edge(source, target) == csr.add_edge(source, target)
+        else:
+            assert sets.remove_edge(source, target) == csr.remove_edge(source, target)
+
+    assert sorted(sets.edges()) == sorted(csr.edges())
+    assert sets.edge_count() == csr.edge_count()
+    for key in keys:
+        assert sorted(sets.successors(key)) == sorted(csr.successors(key))
+        assert sorted(sets.predecessors(key)) == sorted(csr.predecessors(key))
+        assert sets.out_degree(key) == csr.out_degree(key)
+        assert sets.in_degree(key) == csr.in_degree(key)
+
+
+def test_engines_agree_on_random_edge_batches() -> None:
+    rng = random.Random(15)
+    keys = [f"n{index}" for index in range(40)]
+    sets, csr = SetAdjacency(), CSRAdjacency(min_compact=16)
+    for adjacency in (sets, csr):
+        for key in keys:
+            adjacency.add_node(key)
+
+    for _ in range(60):
+        # Sorting groups edges by source, as exports do, while keeping repeats.
+        batch = sorted(
+            ((rng.choice(keys[:10]), rng.choice(keys), rng.choice([None, None, 2.0, 3.0])) for _ in range(30)),
+            key=lambda edge: edge[0],
+        )
+        assert sets.add_edges(batch) == csr.add_edges(batch)
+        for _ in range(8):
+            source, target = rng.choice(keys[:10]), rng.choice(keys)
+            assert sets.remove_edge(source, target) == csr.remove_edge(source, target)
+
+    assert sets.edge_count() == csr.edge_count()
+    for key in keys:
+        assert sorted(sets.weighted_successors(key)) == sorted(csr.weighted_successors(key))
+        assert sorted(sets.predecessors(key)) == sorted(csr.predecessors(key))
+        for source in keys[:10]:
+            assert sets.weight(source, key) == csr.weight(source, key)
+        assert sets.in_degree(key) == csr.in_degree(key)
+
+
+def test_csr_remove_node_detaches_edges_and_compacts() -> None:
+    csr = CSRAdjacency(min_compact=1)
+    _populate(csr, ["a", "b", "c"], [("a", "b"), ("b", "c"), ("a", "c"), ("c", "c")])
+    csr.compact()
+    predecessors, successors = csr.remove_node("c")
+    assert sorted(predecessors) == ["a", "b", "c"]
+    assert successors == ["c"]
+    assert sorted(csr.edges()) == [("a", "b")]
+    assert csr.edge_count() == 1
+    csr.compact()
+    assert csr.successors("a") == ["b"]
+    assert csr.predecessors("b") == ["a"]
+    assert not csr.has_edge("a", "c")
+
+
+def test_csr_revives_tombstoned_edges() -> None:
+    csr = CSRAdjacency()
+    _populate(csr, ["a", "b"], [("a", "b")])
+    csr.compact()
+    assert csr.remove_edge("a", "b")
+    assert not csr.has_edge("a", "b")
+    assert csr.add_edge("a", "b")
+    assert csr.has_edge("a", "b")
+    assert csr.out_degree("a") == 1
+
+
+def test_unknown_storage_engine_rejected() -> None:
+    with pytest.raises(ValueError):
+        create_adjacency("btree")
+    with pytest.raises(ValueError):
+        KnowledgeGraph(storage="btree")
+
+
+def test_engines_track_edge_weights() -> None:
+    for adjacency in (SetAdjacency(), CSRAdjacency(min_compact=1)):
+        _populate(adjacency, ["a", "b", "c"], [("a", "b"), ("b", "c")])
+        adjacency.add_edge("a", "c", 2.5)
+        assert adjacency.weight("a", "b") == 1.0
+        assert adjacency.weight("a", "c") == 2.5
+        assert not adjacency.add_edge("a", "b", 4.0)
+        assert sorted(adjacency.weighted_successors("a")) == [("b", 4.0), ("c", 2.5)]
+        if isinstance(adjacency, CSRAdjacency):
+            adjacency.compact()
+            assert sorted(adjacency.weighted_successors("a")) == [("b", 4.0), ("c", 2.5)]
+        adjacency.remove_edge("a", "c")
+        assert adjacency.weight("a", "c") is None
+        adjacency.add_edge("a", "c")
+        assert adjacency.weight("a", "c") == 1.0
@@ -0,0 +1,97 @@
+from pathlib import Path
+
+import pytest
+
+from app.core.graph import NODE_BYTES, KnowledgeGraph, KnowledgeNode
+from app.core.workspaces import WorkspaceRegistry, WorkspaceSettings, WorkspaceStore
+
+
+def _fill(graph: KnowledgeGraph, prefix: str, count: int) -> None:
+    graph.add_nodes_bulk([KnowledgeNode(name=f"{prefix} {index}") for index in range(count)])
+
+
+def test_cold_workspaces_are_saved_evicted_and_reloaded(tmp_path: Path) -> None:
+    store = WorkspaceStore(tmp_path)
+    budget = 2 * KnowledgeGraph().estimated_bytes() + 60 * NODE_BYTES
+    registry = WorkspaceRegistry(store, memory_budget=budget)
+
+    # Sizes are re-estimated as each lease ends, like after an API request.
+    with registry.lease("alpha") as alpha:
+        _fill(alpha, "Alpha", 20)
+        alpha.add_relationship("Alpha 0", "Alpha 1", effort=2.5)
+        alpha.create_session("Sprint", "", ["x"], ["Alpha 1"])
+    with registry.lease("beta") as beta:
+        _fill(beta, "Beta", 20)
+    # Touching alpha makes beta the least recently used workspace.
+    registry.get("alpha")
+    with registry.lease("gamma") as gamma:
+        _fill(gamma, "Gamma", 20)
+
+    assert "beta" not in registry and "alpha" in registry and "gamma" in registry
+    stats = registry.stats()
+    assert (stats.evictions, stats.saves, stats.resident) == (1, 1, 2)
+    assert stats.resident_bytes <= budget
+    assert (tmp_path / "beta.ndjson").exists()
+
+    registry.evict("alpha")
+    reloaded = registry.get("alpha")
+    assert reloaded is not alpha
+    assert [node.name for node in reloaded.list_nodes()] == [node.name for node in alpha.list_nodes()]
+    assert reloaded.relationship_effort("Alpha 0", "Alpha 1") == 2.5
+    assert reloaded.list_sessions() == alpha.list_sessions()
+    # Unchanged since it was loaded, so evicting it again writes nothing.
+    saves = registry.stats().saves
+    assert registry.evict("alpha") and registry.stats().saves == saves
+    assert registry.stats().misses == 4
+
+
+def test_leased_workspaces_are_never_evicted(tmp_path: Path) -> None:
+    registry = WorkspaceRegistry(WorkspaceStore(tmp_path), memory_budget=1)
+    with registry.lease("alpha") as alpha:
+        _fill(alpha, "Alpha", 3)
+        registry.get("beta")
+        assert "alpha" in registry and "beta" in registry
+        assert not registry.evict("alpha")
+    # Released and over budget: only the graph just handed out may stay.
+    registry.get("beta")
+    assert "alpha" not in registry
+    assert [node.name for node in registry.get("alpha").list_nodes()] == ["Alpha 0", "Alpha 1", "Alpha 2"]
+
+
+def test_workspace_names_are_validated(tmp_path: Path) -> None:
+    registry = WorkspaceRegistry(WorkspaceStore(tmp_path))
+    for name in ["", "../etc", "a/b", "-lead", "x" * 65]:
+        with pytest.raises(ValueError):
+            registry.get(name)
+    assert registry.stats().misses == 0
+
+
+def test_only_never_saved_workspaces_are_seeded(tmp_path: Path) -> None:
+    def seed(name: str, graph: KnowledgeGraph) -> None:
+        graph.create_session("Starter", "", [], [])
+
+    # Each registry stands for one process run over the same directory.
+    for _ in range(3):
+        registry = WorkspaceRegistry(WorkspaceStore(tmp_path), on_create=seed)
+        with registry.lease("alpha") as alpha:
+            _fill(alpha, "Alpha", 1)
+        registry.flush()
+    assert [session.name for session in registry.get("alpha").list_sessions()] == ["Starter"]
+
+
+def test_allow_cycles_setting_survives_eviction(tmp_path: Path) -> None:
+    registry = WorkspaceRegistry(WorkspaceStore(tmp_path))
+    graph = registry.create("loops", WorkspaceSettings(allow_cycles=True))
+    _fill(graph, "Loop", 2)
+    graph.add_relationship("Loop 0", "Loop 1")
+    graph.add_relationship("Loop 1", "Loop 0")
+    with pytest.raises(ValueError):
+        registry.create("loops", WorkspaceSettings())
+
+    assert registry.evict("loops")
+    reloaded = registry.get("loops")
+    assert reloaded.allow_cycles and reloaded.relationship_effort("Loop 1", "Loop 0")
+    # Created but never written to: the setting alone is kept.
+    registry.create("empty", WorkspaceSettings(allow_cycles=True))
+    assert registry.evict("empty") and registry.get("empty").allow_cycles
+    assert not registry.get("plain").allow_cycles